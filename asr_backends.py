@@ -0,0 +1,94 @@
+import numpy as np
+
+from audio_decoder import SAMPLE_RATE
+
+# faster-whisper decoding settings; part of the transcript cache key
+TRANSCRIBE_OPTIONS = dict(
+    beam_size=1,
+    best_of=1,
+    temperature=0.0,
+    vad_filter=True,
+    vad_parameters=dict(min_silence_duration_ms=700, speech_pad_ms=200),
+    initial_prompt="This is a YouTube video transcription.",
+    condition_on_previous_text=False
+)
+
+
+class FasterWhisperBackend:
+    """faster-whisper's WhisperModel, one transcribe() call per window.
+
+    model_server.RemoteTranscriber has the same transcribe() API, so a
+    shared server model works here too.
+    """
+
+    def load(self, config):
+        from faster_whisper import WhisperModel
+        # One model replica per parallel worker so concurrent
+        # transcribe() calls do not queue behind each other
+        return WhisperModel(
+            config['whisper_model'],
+            device="cpu",
+            compute_type=config['compute_type'],
+            cpu_threads=config['asr_threads_per_worker'],
+            num_workers=max(config['num_workers'], config['asr_workers'])
+        )
+
+    def transcribe(self, model, audio, config, **options):
+        """options override TRANSCRIBE_OPTIONS, e.g. vad_filter=False for calibration"""
+        segments, _ = model.transcribe(audio, **dict(TRANSCRIBE_OPTIONS, **options))
+        return " ".join(segment.text for segment in segments)
+
+    def serve(self, model, audio, options):
+        """Run a model server /transcribe request; returns the segments as dicts"""
+        segments, _ = model.transcribe(audio, **dict(TRANSCRIBE_OPTIONS, **options))
+        return [{'text': segment.text, 'start': segment.start, 'end': segment.end} for segment in segments]
+
+    def cache_key(self, config):
+        return TRANSCRIBE_OPTIONS
+
+
+class TransformersBackend:
+    """The transformers automatic-speech-recognition pipeline in long-form mode.
+
+    Whisper only sees 30 seconds at a time, so the pipeline cuts each window
+    into asr_chunk_length_s pieces that overlap by asr_stride_length_s on
+    each side, runs asr_batch_size pieces per forward pass and merges the
+    overlaps. Memory use follows the window size, not the video length.
+    model_server.RemoteTranscriber can also be called like the pipeline.
+    """
+
+    def load(self, config):
+        from transformers import pipeline
+        return pipeline("automatic-speech-recognition", model=config['whisper_model'])
+
+    def transcribe(self, model, audio, config, **options):
+        # No VAD or other decoding options to override
+        result = model(
+            {'raw': np.ascontiguousarray(audio, dtype=np.float32), 'sampling_rate': SAMPLE_RATE},
+            chunk_length_s=config['asr_chunk_length_s'],
+            stride_length_s=config['asr_stride_length_s'],
+            batch_size=config['asr_batch_size'],
+        )
+        return result['text']
+
+    def serve(self, model, audio, options):
+        """Run a model server /transcribe request; the text comes back as one segment"""
+        result = model({'raw': audio, 'sampling_rate': SAMPLE_RATE}, **options)
+        return [{'text': result['text'], 'start': 0.0, 'end': len(audio) / SAMPLE_RATE}]
+
+    def cache_key(self, config):
+        # The batch size does not change the text
+        return [config['asr_chunk_length_s'], config['asr_stride_length_s']]
+
+
+# Backends by config name ('asr_backend'); add an entry to plug in another one
+ASR_BACKENDS = {
+    'faster-whisper': FasterWhisperBackend,
+    'transformers': TransformersBackend,
+}
+
+
+def create_backend(name):
+    if name not in ASR_BACKENDS:
+        raise Exception(f"Unknown ASR backend: {name}")
+    return ASR_BACKENDS[name]()
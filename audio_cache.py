@@ -0,0 +1,83 @@
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+
+
+class AudioCache:
+    """Directory of downloaded audio files keyed by video ID and yt-dlp format.
+
+    Files are kept in their downloaded (compressed) container, never as WAV.
+    Writes go to a unique .part file that is renamed into place, so a job
+    never sees a partially written entry. The modification time doubles as
+    the last-used time: get() refreshes it and put() evicts the oldest files
+    until the directory fits in max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _prefix(self, video_id, audio_format):
+        format_hash = hashlib.sha1(audio_format.encode('utf-8')).hexdigest()[:10]
+        return f"{video_id}-{format_hash}"
+
+    def _entries(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.part'):
+                continue
+            path = os.path.join(self.directory, name)
+            if os.path.isfile(path):
+                yield path
+
+    def get(self, video_id, audio_format):
+        """Return the cached file for this video and format, or None"""
+        prefix = self._prefix(video_id, audio_format) + '.'
+        with self.lock:
+            for path in self._entries():
+                if os.path.basename(path).startswith(prefix):
+                    try:
+                        os.utime(path)
+                    except OSError:
+                        continue  # Evicted by another process in the meantime
+                    return path
+        return None
+
+    def put(self, video_id, audio_format, source_path):
+        """Move a finished download into the cache and return its cached path"""
+        extension = os.path.splitext(source_path)[1]
+        path = os.path.join(self.directory, self._prefix(video_id, audio_format) + extension)
+        temp_path = f"{path}.{uuid.uuid4().hex}.part"
+
+        shutil.move(source_path, temp_path)
+        os.replace(temp_path, path)
+        # yt-dlp sets the mtime from the server's Last-Modified; mark the entry as just used
+        os.utime(path)
+
+        with self.lock:
+            self._evict(keep=path)
+        return path
+
+    def _evict(self, keep):
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,38 @@
+import os
+import subprocess
+
+import numpy as np
+
+# Whisper models expect 16 kHz mono float32 samples
+SAMPLE_RATE = 16000
+
+
+def decode_audio(file_path, output_path):
+    """Decode any ffmpeg-readable file once into a memory-mapped PCM buffer.
+
+    The samples are written as raw float32 to output_path and mapped back
+    copy-on-write, so slicing a chunk out of the returned array does not copy
+    or re-read the source file. The duration in seconds is len(samples) / SAMPLE_RATE.
+    """
+    cmd = [
+        'ffmpeg', '-y', '-i', file_path,
+        '-f', 'f32le', '-acodec', 'pcm_f32le', '-ar', str(SAMPLE_RATE), '-ac', '1',
+        output_path, '-loglevel', 'error'
+    ]
+    subprocess.run(cmd, check=True)
+
+    if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+        raise Exception(f"No audio could be decoded from {file_path}")
+
+    return np.memmap(output_path, dtype=np.float32, mode='c')
+
+
+def slice_audio(samples, start_time, duration):
+    """Return the [start_time, start_time + duration) window as a view of samples"""
+    start = int(start_time * SAMPLE_RATE)
+    end = int((start_time + duration) * SAMPLE_RATE)
+    return samples[start:end]
+
+
+def audio_duration(samples):
+    return len(samples) / SAMPLE_RATE
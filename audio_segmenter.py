@@ -0,0 +1,192 @@
+import re
+
+import numpy as np
+
+from audio_decoder import SAMPLE_RATE
+
+# Length of one VAD frame in seconds
+FRAME_SECONDS = 0.03
+
+
+def frame_levels(samples, frame_seconds=FRAME_SECONDS, block_seconds=60):
+    """Loudness in dB of every frame of 16 kHz samples.
+
+    The samples are read a block at a time, so a memory-mapped buffer of
+    an hour of audio is scanned once without being loaded whole.
+    """
+    frame = int(SAMPLE_RATE * frame_seconds)
+    frame_count = len(samples) // frame
+    levels = np.empty(frame_count, dtype=np.float32)
+    block_frames = max(1, int(block_seconds / frame_seconds))
+
+    for first in range(0, frame_count, block_frames):
+        last = min(first + block_frames, frame_count)
+        block = np.asarray(samples[first * frame:last * frame], dtype=np.float32).reshape(-1, frame)
+        levels[first:last] = 10 * np.log10(np.mean(block * block, axis=1) + 1e-10)
+    return levels
+
+
+def speech_mask(levels, margin_db=10, range_db=35):
+    """Mark the frames that are loud enough to be speech.
+
+    The threshold sits margin_db above the noise floor (the 10th percentile
+    level), but never more than range_db below the loud parts (the 95th
+    percentile) and never above the midpoint between the two, so both very
+    clean and continuously noisy recordings get a usable split.
+    """
+    if not len(levels):
+        return np.zeros(0, dtype=bool)
+    floor = np.percentile(levels, 10)
+    peak = np.percentile(levels, 95)
+    threshold = min(max(floor + margin_db, peak - range_db), (floor + peak) / 2)
+    return levels > threshold
+
+
+def silent_runs(speech, min_frames):
+    """(first, end) frame ranges of at least min_frames consecutive non-speech frames"""
+    padded = np.concatenate(([True], speech, [True])).astype(np.int8)
+    edges = np.diff(padded)
+    starts = np.flatnonzero(edges == -1)
+    ends = np.flatnonzero(edges == 1)
+    keep = ends - starts >= min_frames
+    return starts[keep], ends[keep]
+
+
+def plan_windows(samples, target, overlap=1.0, tolerance=0.25, min_silence=0.3,
+                 frame_seconds=FRAME_SECONDS):
+    """Split audio into (start, duration) windows that end in silences.
+
+    Each cut is placed in the middle of the silence closest to `target`
+    seconds after the previous cut, looking up to tolerance * target either
+    side of it. When there is no silence of at least min_silence seconds in
+    that range, the quietest frame is used instead. Every window after the
+    first starts `overlap` seconds before its cut, so a word that straddles
+    a cut is heard whole by one of the two windows (see dedupe_overlap).
+    """
+    total = len(samples) / SAMPLE_RATE
+    if not total:
+        return []
+    levels = frame_levels(samples, frame_seconds)
+    starts, ends = silent_runs(speech_mask(levels), max(1, int(min_silence / frame_seconds)))
+    centers = (starts + ends) / 2 * frame_seconds
+
+    search = tolerance * target
+    cuts = [0.0]
+    while total - cuts[-1] > target + search:
+        ideal = cuts[-1] + target
+        low, high = ideal - search, ideal + search
+        candidates = centers[np.searchsorted(centers, low):np.searchsorted(centers, high, side='right')]
+        if len(candidates):
+            cut = float(candidates[np.argmin(np.abs(candidates - ideal))])
+        else:
+            first = int(low / frame_seconds)
+            cut = (first + int(np.argmin(levels[first:int(high / frame_seconds)])) + 0.5) * frame_seconds
+        cuts.append(cut)
+    cuts.append(total)
+
+    windows = []
+    for i in range(len(cuts) - 1):
+        start = cuts[i] if i == 0 else max(0.0, cuts[i] - overlap)
+        windows.append((start, cuts[i + 1] - start))
+    return windows
+
+
+def normalize_word(word):
+    return re.sub(r'[^\w]', '', word.lower())
+
+
+def dedupe_overlap(previous, text, max_words=20):
+    """Drop the words at the start of text that repeat the end of previous.
+
+    Neighbouring windows share a little audio, so the same words can show
+    up at the end of one transcript and the start of the next. The longest
+    run (up to max_words) that matches, ignoring case and punctuation, is
+    removed from text.
+    """
+    tail = [normalize_word(word) for word in previous.split()[-max_words:]]
+    words = text.split()
+    head = [normalize_word(word) for word in words[:max_words]]
+    for count in range(min(len(tail), len(head)), 0, -1):
+        if tail[-count:] == head[:count]:
+            return ' '.join(words[count:])
+    return text
+
+
+def energy_speech_regions(samples, pad=0.2, min_gap=1.0, frame_seconds=FRAME_SECONDS):
+    """Speech (start, end) sample ranges from the frame energy detector"""
+    speech = speech_mask(frame_levels(samples, frame_seconds))
+    padded = np.concatenate(([False], speech, [False])).astype(np.int8)
+    edges = np.diff(padded)
+    frame = int(SAMPLE_RATE * frame_seconds)
+    regions = []
+    for first, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+        start = max(0, int(first * frame - pad * SAMPLE_RATE))
+        stop = min(len(samples), int(end * frame + pad * SAMPLE_RATE))
+        if regions and start - regions[-1][1] < min_gap * SAMPLE_RATE:
+            regions[-1] = (regions[-1][0], stop)
+        else:
+            regions.append((start, stop))
+    return regions
+
+
+def silero_speech_regions(samples, pad=0.2, min_gap=1.0):
+    """Speech (start, end) sample ranges from faster-whisper's Silero VAD model"""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+    options = VadOptions(min_silence_duration_ms=int(min_gap * 1000), speech_pad_ms=int(pad * 1000))
+    return [(region['start'], region['end']) for region in get_speech_timestamps(samples, options)]
+
+
+def speech_regions(samples, method='energy', pad=0.2, min_gap=1.0):
+    """Find the speech in 16 kHz samples with one VAD pass over the whole file.
+
+    method is 'silero' (needs faster-whisper) or 'energy'. Returns a
+    SpeechIndex; pauses shorter than min_gap seconds stay inside a region.
+    """
+    if method == 'silero':
+        regions = silero_speech_regions(samples, pad, min_gap)
+    else:
+        regions = energy_speech_regions(samples, pad, min_gap)
+    return SpeechIndex(regions)
+
+
+class SpeechIndex:
+    """Where the speech is in a recording.
+
+    regions are (start, end) sample ranges of the original audio. compact()
+    writes them back to back into a new buffer; to_original() maps a time
+    in that buffer back to the original recording.
+    """
+
+    def __init__(self, regions):
+        self.regions = regions
+        lengths = [end - start for start, end in regions]
+        # Start of each region in the compacted audio, in samples
+        self.offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+
+    @property
+    def speech_seconds(self):
+        return int(self.offsets[-1]) / SAMPLE_RATE
+
+    def to_original(self, seconds):
+        """Original time of a point `seconds` into the compacted audio"""
+        if not self.regions:
+            return seconds
+        position = int(seconds * SAMPLE_RATE)
+        i = int(np.searchsorted(self.offsets, position, side='right')) - 1
+        i = min(max(i, 0), len(self.regions) - 1)
+        return (self.regions[i][0] + position - int(self.offsets[i])) / SAMPLE_RATE
+
+    def compact(self, samples, output_path, block_seconds=60):
+        """Copy the speech regions of samples into a memory-mapped buffer of their own"""
+        count = int(self.offsets[-1])
+        if not count:
+            return np.zeros(0, dtype=np.float32)
+        compacted = np.memmap(output_path, dtype=np.float32, mode='w+', shape=(count,))
+        block = int(block_seconds * SAMPLE_RATE)
+        for (start, end), offset in zip(self.regions, self.offsets):
+            for position in range(start, end, block):
+                stop = min(position + block, end)
+                compacted[offset + position - start:offset + stop - start] = samples[position:stop]
+        compacted.flush()
+        del compacted
+        return np.memmap(output_path, dtype=np.float32, mode='c')
@@ -0,0 +1,311 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+
+from audio_decoder import SAMPLE_RATE, decode_audio, audio_duration
+from converter_engine import ConverterEngine, DEFAULT_CONFIG, FONT_PATH
+from job_metrics import current_rss
+from synthetic_speech import speech_like_phrases
+
+# Spoken English runs at roughly this many words per minute
+WORDS_PER_MINUTE = 150
+
+WORDS = (
+    "the model listens to each part of the video and writes down what the speaker says "
+    "so that the notes can be read later without watching the whole recording again "
+    "today we look at how the signal moves through every stage of the system and where "
+    "the time goes when the input gets longer than an hour"
+).split()
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------------------------
+
+def write_speech_wav(path, minutes, seed=0):
+    """Write minutes of speech-like 16 kHz mono audio as 16-bit WAV"""
+    rng = np.random.default_rng(seed)
+    remaining = int(minutes * 60 * SAMPLE_RATE)
+    temp_path = path + '.part'
+    with wave.open(temp_path, 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        for phrase in speech_like_phrases(rng):
+            phrase = phrase[:remaining]
+            out.writeframes((np.clip(phrase, -1, 1) * 32767).astype('<i2').tobytes())
+            remaining -= len(phrase)
+            if remaining <= 0:
+                break
+    os.replace(temp_path, path)
+
+
+def speech_wav(work_dir, minutes):
+    path = os.path.join(work_dir, f"speech-{minutes:g}m.wav")
+    if not os.path.exists(path):
+        log(f"Generating {minutes:g} minutes of synthetic speech...")
+        write_speech_wav(path, minutes)
+    return path
+
+
+def load_samples(path, work_dir):
+    """Decode a WAV the way the converter does; returns (samples, seconds, decoder)"""
+    start = time.perf_counter()
+    if shutil.which('ffmpeg'):
+        samples = decode_audio(path, os.path.join(work_dir, 'decoded.pcm'))
+        decoder = 'ffmpeg'
+    else:
+        with wave.open(path, 'rb') as f:
+            data = f.readframes(f.getnframes())
+        samples = np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768
+        decoder = 'wave'
+    return samples, time.perf_counter() - start, decoder
+
+
+def transcript_text(minutes, seed=0):
+    """A transcript as long as minutes of speech, split into sentences"""
+    rng = np.random.default_rng(seed)
+    words = rng.choice(WORDS, int(minutes * WORDS_PER_MINUTE))
+    sentences = []
+    start = 0
+    while start < len(words):
+        length = int(rng.integers(8, 25))
+        sentence = ' '.join(words[start:start + length])
+        sentences.append(sentence[0].upper() + sentence[1:] + '.')
+        start += length
+    return ' '.join(sentences)
+
+
+# ---------------------------------------------------------------------------
+# Stub models
+# ---------------------------------------------------------------------------
+
+class StubTranscriber:
+    """Stands in for WhisperModel: reads the audio, returns plausible text"""
+
+    def transcribe(self, audio, **options):
+        seconds = audio_duration(audio)
+        np.abs(audio).mean()  # read every sample like a real model would
+        words = max(1, int(seconds * WORDS_PER_MINUTE / 60))
+        text = ' '.join(WORDS[i % len(WORDS)] for i in range(words))
+        return [SimpleNamespace(text=text, start=0.0, end=seconds)], None
+
+
+class StubTokenizer:
+    model_max_length = 1024
+
+    def __call__(self, text, add_special_tokens=True):
+        def encode(value):
+            ids = [hash(word) % 50000 for word in value.split()]
+            return [0] + ids + [2] if add_special_tokens else ids
+        if isinstance(text, str):
+            return {'input_ids': encode(text)}
+        return {'input_ids': [encode(value) for value in text]}
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+
+class StubSummarizer:
+    """Stands in for the summarization pipeline: keeps the first max_length words"""
+
+    def __init__(self):
+        self.tokenizer = StubTokenizer()
+
+    def __call__(self, inputs, batch_size=None, max_length=130, **params):
+        inputs = [inputs] if isinstance(inputs, str) else inputs
+        return [{'summary_text': ' '.join(text.split()[:max_length])} for text in inputs]
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def make_engine(config, stub_models, work_dir):
+    engine = ConverterEngine(config, status_callback=lambda message: None)
+    if stub_models:
+        engine.transcriber = StubTranscriber()
+        engine.summarizer = StubSummarizer()
+    job = engine.create_job("benchmark", output_file=os.path.join(work_dir, 'benchmark.pdf'),
+                            work_dir=work_dir)
+    return engine, job
+
+
+def run_stage(results, stage, minutes, func, **fields):
+    """Time func(); record its extra fields or the error it raised"""
+    log(f"{stage} ({minutes:g} min)...")
+    result = dict(stage=stage, audio_minutes=minutes, **fields)
+    try:
+        start = time.perf_counter()
+        extra = func() or {}
+        result['seconds'] = round(time.perf_counter() - start, 4)
+        result.update(extra)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    results.append(result)
+    return result
+
+
+def bench_chunks(engine, job, samples, chunk_size):
+    """process_audio_chunk over the whole input; engine has the stub transcriber"""
+    total = audio_duration(samples)
+    chunks = 0
+    for start in np.arange(0, total, chunk_size):
+        engine.process_audio_chunk(samples, float(start), min(chunk_size, total - start), job)
+        chunks += 1
+    return {'chunks': chunks, 'chunk_seconds': chunk_size}
+
+
+def bench_asr(results, args, config, samples, minutes):
+    """Real-time factor of each model size and compute type on the first asr_seconds"""
+    audio = samples[:int(min(args.asr_seconds, audio_duration(samples)) * SAMPLE_RATE)]
+    audio_seconds = audio_duration(audio)
+    combinations = [('stub', 'stub')] if args.stub_models else [
+        (model, compute_type) for model in args.models for compute_type in args.compute_types
+    ]
+    for model, compute_type in combinations:
+        def run():
+            engine = ConverterEngine(dict(config, whisper_model=model, compute_type=compute_type),
+                                     status_callback=lambda message: None)
+            load_start = time.perf_counter()
+            transcriber = StubTranscriber() if args.stub_models else engine.load_local_transcriber()
+            load_seconds = time.perf_counter() - load_start
+
+            start = time.perf_counter()
+            engine.asr.transcribe(transcriber, audio, engine.config)
+            elapsed = time.perf_counter() - start
+            return {
+                'load_seconds': round(load_seconds, 4),
+                'audio_seconds': round(audio_seconds, 2),
+                'rtf': round(elapsed / audio_seconds, 4),
+            }
+        run_stage(results, 'asr', minutes, run, model=model, compute_type=compute_type)
+
+
+def bench_summarize(engine, job, text):
+    summary = engine.summarize_text(text, job)
+    # Includes the model, which the first summarize stage loads
+    return {'chars': len(text), 'summary_chars': len(summary), 'rss_bytes': current_rss()}
+
+
+def bench_pdf(engine, job, text, path):
+    engine.save_to_pdf(text, path, job)
+    return {'chars': len(text), 'bytes': os.path.getsize(path)}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time each conversion stage on synthetic input and print the results as JSON."
+    )
+    parser.add_argument('--minutes', type=float, nargs='+', default=[1, 10, 60],
+                        help="lengths of the synthetic inputs in minutes (default: 1 10 60)")
+    parser.add_argument('--stages', nargs='+', default=['decode', 'chunks', 'asr', 'summarize', 'pdf'],
+                        choices=['decode', 'chunks', 'asr', 'summarize', 'pdf'],
+                        help="stages to run (default: all)")
+    parser.add_argument('--models', nargs='+', default=['tiny', 'base', 'small'],
+                        help="Whisper model sizes for the ASR stage (default: tiny base small)")
+    parser.add_argument('--compute-types', nargs='+', default=['int8', 'float32'],
+                        help="CTranslate2 compute types for the ASR stage (default: int8 float32)")
+    parser.add_argument('--summary-model', default=DEFAULT_CONFIG['summary_model'],
+                        help="summarization model for the summarize stage (default: facebook/bart-large-cnn)")
+    parser.add_argument('--summary-runtime', choices=['torch', 'int8', 'ctranslate2'], default='torch',
+                        help="summarizer runtime for the summarize stage (default: torch)")
+    parser.add_argument('--asr-seconds', type=float, default=60,
+                        help="seconds of audio transcribed per ASR measurement (default: 60)")
+    parser.add_argument('--chunk-size', type=float, default=DEFAULT_CONFIG['stream_window'],
+                        help="seconds per window for the chunk extraction stage (default: 30)")
+    parser.add_argument('--stub-models', action='store_true',
+                        help="replace the transcriber and summarizer with stubs to time everything else")
+    parser.add_argument('--work-dir', default='benchmark_data',
+                        help="where synthetic inputs are generated and kept (default: benchmark_data)")
+    parser.add_argument('-o', '--output', help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.minutes = sorted(args.minutes)
+
+    # Only models already in the local cache; the benchmark never downloads
+    os.environ.setdefault('HF_HUB_OFFLINE', '1')
+    os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+    os.makedirs(args.work_dir, exist_ok=True)
+
+    config = dict(
+        DEFAULT_CONFIG,
+        cache_dir=None,
+        model_server=None,
+        model_idle_timeout=None,
+        metrics_log=None,
+        summary_model=args.summary_model,
+        summary_runtime=args.summary_runtime,
+        pdf_font=DEFAULT_CONFIG['pdf_font'] if os.path.exists(FONT_PATH) else None,
+    )
+    engine, job = make_engine(config, args.stub_models, args.work_dir)
+    # Chunk extraction is timed without ASR, so it always uses the stubs
+    stub_engine, stub_job = make_engine(config, True, args.work_dir)
+
+    results = []
+    for index, minutes in enumerate(args.minutes):
+        samples = None
+        if {'decode', 'chunks', 'asr'} & set(args.stages):
+            path = speech_wav(args.work_dir, minutes)
+            samples, decode_seconds, decoder = load_samples(path, args.work_dir)
+            if 'decode' in args.stages:
+                results.append({'stage': 'decode', 'audio_minutes': minutes, 'decoder': decoder,
+                                'seconds': round(decode_seconds, 4)})
+
+        if 'chunks' in args.stages:
+            run_stage(results, 'chunks', minutes,
+                      lambda: bench_chunks(stub_engine, stub_job, samples, args.chunk_size))
+        # Model speed does not depend on the input length; measure it once
+        if 'asr' in args.stages and index == 0:
+            bench_asr(results, args, config, samples, minutes)
+
+        text = transcript_text(minutes)
+        if 'summarize' in args.stages:
+            result = run_stage(results, 'summarize', minutes, lambda: bench_summarize(engine, job, text),
+                               model='stub' if args.stub_models else config['summary_model'],
+                               runtime=config['summary_runtime'])
+            if 'seconds' in result:
+                result['chars_per_second'] = round(result['chars'] / max(result['seconds'], 1e-9))
+        if 'pdf' in args.stages:
+            pdf_path = os.path.join(args.work_dir, f"benchmark-{minutes:g}m.pdf")
+            result = run_stage(results, 'pdf', minutes, lambda: bench_pdf(engine, job, text, pdf_path))
+            if 'seconds' in result:
+                result['chars_per_second'] = round(result['chars'] / max(result['seconds'], 1e-9))
+        del samples
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'stub_models': args.stub_models,
+        },
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 1 if any('error' in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
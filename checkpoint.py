@@ -0,0 +1,70 @@
+import json
+import os
+import threading
+
+
+class JobCheckpoint:
+    """Partial results of a job, kept on disk until the job succeeds.
+
+    Each transcribed window and each chunk summary is appended to a
+    JSON-lines file as soon as it is finished. A later attempt at the same
+    job (same video and ASR settings, hence the same path) loads them back,
+    so only the missing windows and chunks are computed again. A line cut
+    short by a crash is skipped on load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.chunks = {}     # window start time -> transcript text
+        self.summaries = {}  # chunk summary key -> summary text
+        self.load()
+
+    @staticmethod
+    def window_key(start_time):
+        # Window starts are sums of floats; rounding makes them safe to compare
+        return round(float(start_time), 3)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('type') == 'chunk':
+                    self.chunks[self.window_key(record['start'])] = record['text']
+                elif record.get('type') == 'summary':
+                    self.summaries[record['key']] = record['text']
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self.lock:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def get_chunk(self, start_time):
+        return self.chunks.get(self.window_key(start_time))
+
+    def add_chunk(self, start_time, text):
+        self.chunks[self.window_key(start_time)] = text
+        self.append({'type': 'chunk', 'start': self.window_key(start_time), 'text': text})
+
+    def get_summary(self, key):
+        return self.summaries.get(key)
+
+    def add_summary(self, key, text):
+        self.summaries[key] = text
+        self.append({'type': 'summary', 'key': key, 'text': text})
+
+    def discard(self):
+        """Delete the checkpoint once the job no longer needs it"""
+        with self.lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,1373 @@
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from urllib.parse import urlparse, parse_qs
+
+from asr_backends import create_backend
+from audio_decoder import decode_audio, slice_audio, audio_duration
+from audio_cache import AudioCache
+from audio_segmenter import plan_windows, dedupe_overlap, speech_regions
+from checkpoint import JobCheckpoint
+from extractive_summary import extract_sentences
+from format_selection import ASR_FORMAT, asr_format_selector
+from hardware_profile import calibrate, load_profile, profile_settings, save_profile
+from job_metrics import JobMetrics, MetricsLog
+from model_manager import LazyModel
+from pdf_writer import StreamingPdf, load_font
+from resource_scheduler import ResourceScheduler
+from result_cache import ResultCache, make_cache_key
+from stream_ingest import AudioStream
+from streaming_pipeline import StreamingPipeline
+from summarizer_runtime import load_summarizer, runtime_label
+
+FONT_PATH = 'DejaVuSansCondensed.ttf'
+FONT_URL = 'https://github.com/dejavu-fonts/dejavu-fonts/raw/master/ttf/DejaVuSansCondensed.ttf'
+
+# Settings shared by the GUI converters and the batch CLI. Anything in here
+# can be overridden per engine (model settings) or per job (everything else).
+DEFAULT_CONFIG = {
+    # Models
+    'asr_backend': 'faster-whisper',      # 'faster-whisper' or 'transformers'
+    'whisper_model': 'tiny',
+    'compute_type': 'int8',
+    'num_workers': 4,
+    'summary_model': 'facebook/bart-large-cnn',  # or a distilled one: 'sshleifer/distilbart-cnn-12-6'
+    'summary_runtime': 'torch',           # 'torch' (float32), 'int8' (dynamic quantization) or 'ctranslate2'
+    'summary_compute_type': 'int8',       # ctranslate2: weight type of the exported summarizer
+    'summary_threads': 0,                 # summarizer threads (CTranslate2 or torch), 0 = library default
+    'model_idle_timeout': 900,            # seconds before an unused model is released, None = never
+    'model_server': 'http://127.0.0.1:8765',  # shared model host (model_server.py), None = always local
+
+    # Hardware tuning
+    'auto_tune': False,                   # calibrate ASR once per machine and use the setup it picks
+    'target_rtf': 0.5,                    # auto_tune: seconds of ASR per second of audio to stay under
+    'hardware_profile': os.path.join('cache', 'hardware_profile.json'),
+    'cpu_partition': False,               # give ASR and summarization separate core budgets
+    'cpu_cores': None,                    # cpu_partition: cores to split, None = all available
+    'asr_core_share': 0.75,               # cpu_partition: share of the cores given to ASR
+    'cpu_pinning': False,                 # cpu_partition: also keep each stage on its own CPU set (Linux)
+
+    # Download
+    'audio_format': ASR_FORMAT,           # smallest stream good enough for ASR, or a yt-dlp format string
+    'min_audio_sample_rate': 16000,       # Hz, for the ASR format choice
+    'min_audio_bitrate': 32,              # kbit/s, for the ASR format choice
+    'concurrent_fragments': 4,            # DASH/HLS fragments downloaded at the same time
+    'max_duration': 3600,                 # seconds
+
+    # Transcription
+    'chunk_size': 600,                    # seconds
+    'segmenter': 'fixed',                 # 'fixed' windows, or 'silence' to cut in pauses near chunk_size
+    'chunk_overlap': 1.0,                 # silence: seconds shared by neighbouring windows
+    'speech_prepass': None,               # 'silero' or 'energy': transcribe only the speech regions, None = all audio
+    'asr_workers': 1,                     # chunks transcribed at the same time
+    'asr_threads_per_worker': 0,          # CTranslate2 threads per worker, 0 = library default
+    'asr_chunk_length_s': 30,             # transformers: seconds per pipeline chunk within a window
+    'asr_stride_length_s': 5,             # transformers: overlap on each side of a pipeline chunk
+    'asr_batch_size': 8,                  # transformers: pipeline chunks per forward pass
+
+    # Summarization
+    'summary_engine': 'abstractive',      # 'abstractive' (summary_model), 'extractive' (TextRank, no model)
+                                          # or 'hybrid' (TextRank pre-filter, then summary_model)
+    'extractive_ratio': 0.2,              # extractive: share of the sentences kept as the summary
+    'prefilter_ratio': 0.5,               # hybrid: share of the sentences passed on to summary_model
+    'summary_chunk_chars': 800,
+    'min_chunk_chars': 200,
+    'summary_max_length': 130,
+    'summary_min_length': 30,
+    'summary_mode': 'tokens',             # 'tokens' (pack chunks to the model window) or 'chars'
+    'summary_max_tokens': None,           # token window per chunk, None = model limit
+    'summary_batch_size': 8,              # chunks passed to the summarizer per call
+    'summary_strategy': 'flat',           # 'flat' (one section per chunk) or 'hierarchical'
+    'summary_target_tokens': 600,         # hierarchical: reduce until the summary fits this
+    'summary_depth': None,                # hierarchical: maximum number of levels, None = no limit
+
+    # Pipeline
+    'streaming': False,                   # overlap transcription, summarization and PDF layout
+    'stream_queue_size': 4,               # items buffered between streaming stages
+    'stream_ingest': False,               # decode the download as it arrives, no audio file first
+    'stream_window': 30,                  # seconds per transcription window when stream_ingest is on
+
+    # Caches
+    'cache_dir': 'cache',                 # None disables the on-disk caches
+    'transcript_cache_bytes': 256 * 1024 * 1024,
+    'audio_cache_bytes': 2 * 1024 * 1024 * 1024,
+    'summary_cache_bytes': 64 * 1024 * 1024,
+    'checkpoints': True,                  # keep finished chunks of failed jobs in cache_dir for a retry
+
+    # PDF
+    'pdf_title': " Video transcripted Notes",
+    'pdf_font': 'DejaVu',                 # None to use the built-in Arial
+
+    # Telemetry
+    'metrics_log': os.path.join('logs', 'metrics.jsonl'),  # per-stage JSON lines, None = off
+    'metrics_prometheus': None,           # Prometheus text file rewritten after each job
+}
+
+# The online converter keeps its original model choices
+ONLINE_CONFIG = dict(
+    DEFAULT_CONFIG,
+    asr_backend='transformers',
+    whisper_model='openai/whisper-small',
+    summary_chunk_chars=1000,
+    min_chunk_chars=0,
+    pdf_title="YouTube Video Notes",
+    pdf_font=None,
+)
+
+YOUTUBE_URL_PATTERNS = [
+    r'^https?://(?:www\.)?youtube\.com/watch\?v=[\w-]+',
+    r'^https?://youtu\.be/[\w-]+',
+    r'^https?://(?:www\.)?youtube\.com/v/[\w-]+',
+    r'^https?://(?:www\.)?youtube\.com/embed/[\w-]+'
+]
+
+
+def validate_youtube_url(url):
+    """Basic YouTube URL validation"""
+    return any(re.match(pattern, url) for pattern in YOUTUBE_URL_PATTERNS)
+
+
+def extract_video_id(url):
+    """Return the YouTube video ID of a URL accepted by validate_youtube_url"""
+    if not url or not validate_youtube_url(url):
+        return None
+    parsed = urlparse(url)
+    if parsed.netloc.endswith('youtu.be'):
+        return parsed.path.strip('/').split('/')[0]
+    if parsed.path == '/watch':
+        return parse_qs(parsed.query).get('v', [None])[0]
+    # /v/<id> and /embed/<id>
+    return parsed.path.strip('/').split('/')[1]
+
+
+class ConversionJob:
+    """State of a single URL conversion: paths, options and progress callbacks"""
+
+    def __init__(self, url, config, output_file="notes.pdf", work_dir=".",
+                 status_callback=None, progress_callback=None):
+        self.url = url
+        self.video_id = extract_video_id(url)
+        self.config = config
+        self.output_file = output_file
+        self.work_dir = work_dir
+        self.status_callback = status_callback
+        self.progress_callback = progress_callback
+        self.metrics = JobMetrics(url, self.video_id)
+        self.checkpoint = None  # set by ConverterEngine.convert
+        self.speech_index = None  # set when speech_prepass cuts the audio down to its speech
+        self.streams_audio = None  # set by ConverterEngine.plan_ingest
+        self.failed_windows = []  # start times of the windows whose transcription raised
+
+    def original_time(self, seconds):
+        """Position in the source audio of a point in the audio being transcribed"""
+        if self.speech_index is None:
+            return seconds
+        return self.speech_index.to_original(seconds)
+
+    @property
+    def audio_dir(self):
+        return os.path.join(self.work_dir, 'audio')
+
+    def update_status(self, message):
+        if self.status_callback:
+            self.status_callback(message)
+
+    def update_progress(self, message, progress_value):
+        if self.progress_callback:
+            self.progress_callback(message, progress_value)
+
+
+class ConverterEngine:
+    """Headless download -> transcribe -> summarize -> PDF pipeline.
+
+    Models are loaded once per engine and shared by every job it runs, so a
+    single engine can serve a whole batch of URLs (see youtube_to_pdf_batch.py).
+    Each model is loaded when its stage first needs it (or by warm_up()) and
+    released again after model_idle_timeout seconds without use. The heavy
+    ML libraries are only imported at that point, so creating an engine is cheap.
+    Stage methods raise an Exception on failure; callers decide how to report it.
+    """
+
+    def __init__(self, config=None, status_callback=None, progress_callback=None):
+        self.config = dict(DEFAULT_CONFIG, **(config or {}))
+        self.status_callback = status_callback
+        self.progress_callback = progress_callback
+        self.asr = create_backend(self.config['asr_backend'])
+        self.transcriber_model = LazyModel(
+            'transcriber', self.create_transcriber, self.config['model_idle_timeout'], status_callback
+        )
+        self.summarizer_model = LazyModel(
+            'summarizer', self.create_summarizer, self.config['model_idle_timeout'], status_callback
+        )
+
+        self.resources = None
+        if self.config['cpu_partition']:
+            self.resources = ResourceScheduler.from_config(self.config)
+            self.update_status(self.resources.describe())
+
+        # A saved calibration applies right away; otherwise it runs before the first model load
+        self.tune_lock = threading.Lock()
+        self.tuned = False
+        self.calibrating = False
+        if self.config['auto_tune']:
+            self.apply_hardware_profile()
+        self.apply_core_budget()
+
+        self.transcript_cache = None
+        if self.config['cache_dir']:
+            self.transcript_cache = ResultCache(
+                os.path.join(self.config['cache_dir'], 'transcripts.sqlite'),
+                self.config['transcript_cache_bytes']
+            )
+
+        self.summary_cache = None
+        if self.config['cache_dir']:
+            self.summary_cache = ResultCache(
+                os.path.join(self.config['cache_dir'], 'summaries.sqlite'),
+                self.config['summary_cache_bytes']
+            )
+
+        self.metrics_log = None
+        if self.config['metrics_log'] or self.config['metrics_prometheus']:
+            self.metrics_log = MetricsLog(self.config['metrics_log'], self.config['metrics_prometheus'])
+
+        self.audio_cache = None
+        if self.config['cache_dir']:
+            self.audio_cache = AudioCache(
+                os.path.join(self.config['cache_dir'], 'audio'),
+                self.config['audio_cache_bytes']
+            )
+
+    def create_job(self, url, output_file="notes.pdf", work_dir=".", options=None,
+                   status_callback=None, progress_callback=None):
+        """Create a job whose options override the engine config"""
+        job = ConversionJob(
+            url,
+            dict(self.config, **(options or {})),
+            output_file=output_file,
+            work_dir=work_dir,
+            status_callback=status_callback or self.status_callback,
+            progress_callback=progress_callback or self.progress_callback,
+        )
+        if self.metrics_log is not None:
+            job.metrics.on_event = self.metrics_log.stage_event
+        return job
+
+    def _job(self, job):
+        # Stage methods may be called on their own, outside of convert()
+        return job or self.create_job(None)
+
+    def update_status(self, message):
+        if self.status_callback:
+            self.status_callback(message)
+
+    @property
+    def transcriber(self):
+        return self.transcriber_model.get()
+
+    @transcriber.setter
+    def transcriber(self, model):
+        self.transcriber_model.set(model)
+
+    @property
+    def summarizer(self):
+        return self.summarizer_model.get()
+
+    @summarizer.setter
+    def summarizer(self, model):
+        self.summarizer_model.set(model)
+
+    def connect_model_server(self, model):
+        """Return the model server's status if one is running with the same 'transcriber' or 'summarizer'"""
+        if not self.config['model_server']:
+            return None
+        from model_server import SUMMARIZER_KEYS, TRANSCRIBER_KEYS, fetch_server_status, server_matches
+        keys = TRANSCRIBER_KEYS if model == 'transcriber' else SUMMARIZER_KEYS
+        status = fetch_server_status(self.config['model_server'])
+        if not server_matches(status, self.config, keys):
+            return None
+        self.update_status(f"Using the shared {model} at {self.config['model_server']}")
+        return status
+
+    def create_summarizer(self):
+        if self.connect_model_server('summarizer'):
+            from model_server import RemoteSummarizer
+            return RemoteSummarizer(
+                self.config['model_server'], self.config['summary_model'],
+                self.load_local_summarizer, self.status_callback
+            )
+        return self.load_local_summarizer()
+
+    def apply_hardware_profile(self):
+        """Use the ASR setup saved for this machine and target; False if there is none yet"""
+        profile = load_profile(
+            self.config['hardware_profile'], self.config['asr_backend'], self.config['target_rtf']
+        )
+        if profile is None:
+            return False
+        self.use_profile(profile)
+        return True
+
+    def use_profile(self, profile):
+        self.config.update(profile_settings(profile))
+        # The calibrated worker count stays; its threads come from the ASR core budget
+        self.apply_core_budget()
+        self.tuned = True
+        choice = profile['choice']
+        layout = f", {choice['workers']} x {choice['threads']} threads" if choice['threads'] else ""
+        self.update_status(
+            f"ASR setup for this machine: {choice['whisper_model']} {choice['compute_type']}{layout} "
+            f"(RTF {choice['rtf']:.2f})"
+        )
+        if not choice['meets_target']:
+            self.update_status(f"Warning: No setup reached the target RTF of {self.config['target_rtf']}")
+
+    def ensure_tuned(self):
+        """With auto_tune, calibrate once per machine before any transcriber is loaded"""
+        if not self.config['auto_tune']:
+            return
+        with self.tune_lock:
+            if self.tuned or self.apply_hardware_profile():
+                return
+            self.calibrating = True
+            try:
+                self.update_status("Calibrating speech recognition for this machine (first launch only)...")
+                profile = calibrate(self.config, self.config['target_rtf'],
+                                    status_callback=self.update_status)
+            finally:
+                self.calibrating = False
+            # Whatever the outcome, do not calibrate again on every model load
+            self.tuned = True
+            if not profile['choice']:
+                self.update_status("Warning: Calibration failed, keeping the configured ASR settings")
+                return
+            save_profile(self.config['hardware_profile'], profile)
+            self.use_profile(profile)
+
+    def apply_core_budget(self):
+        """With cpu_partition, size each stage's thread pools from its share of the cores"""
+        if self.resources is None:
+            return
+        self.config.update(self.resources.thread_settings(self.config))
+        self.resources.configure_tokenizers()
+
+    def stage_cpus(self, stage):
+        """Context that keeps the calling thread on the stage's CPU set when cpu_pinning is on"""
+        if self.resources is None:
+            return nullcontext()
+        return self.resources.pinned(stage)
+
+    def create_transcriber(self):
+        self.ensure_tuned()
+        if self.connect_model_server('transcriber'):
+            from model_server import RemoteTranscriber
+            return RemoteTranscriber(
+                self.config['model_server'], self.load_local_transcriber, self.status_callback
+            )
+        return self.load_local_transcriber()
+
+    def load_local_summarizer(self):
+        self.update_status("Loading summarization model (this may take a moment)...")
+        # Thread pools started while loading inherit the stage's CPU set
+        with self.stage_cpus('summary'):
+            summarizer = load_summarizer(self.config, self.status_callback)
+        self.update_status(f"Summarization model loaded ({runtime_label(self.config)})")
+        return summarizer
+
+    def load_local_transcriber(self):
+        self.update_status("Loading transcription model (this may take a moment)...")
+        with self.stage_cpus('asr'):
+            transcriber = self.asr.load(self.config)
+        self.update_status("Transcription model loaded")
+        return transcriber
+
+    def ensure_nltk_data(self):
+        import nltk
+        # Download required NLTK data
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            nltk.download('punkt')
+
+    def load_models(self, summarizer=True):
+        """Load the NLTK data, transcriber and summarizer now instead of on first use.
+
+        summarizer=False leaves the summarization model to be loaded on first use,
+        e.g. when every job uses the extractive engine and never needs it.
+        """
+        self.ensure_tuned()
+        self.ensure_nltk_data()
+        if summarizer:
+            self.summarizer_model.get()
+        self.transcriber_model.get()
+        self.update_status("Models loaded successfully!")
+
+    def warm_up(self, on_ready=None):
+        """Load the models on a background thread; on_ready(error) is called when done"""
+        def run():
+            error = None
+            try:
+                self.load_models()
+            except Exception as e:
+                error = e
+                self.update_status(f"Warning: Could not preload models: {str(e)}")
+            if on_ready:
+                on_ready(error)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def model_status(self):
+        """'ready' when every model is loaded, 'loading' while one loads, else 'idle'.
+
+        'calibrating' while auto_tune measures this machine.
+        """
+        if self.calibrating:
+            return 'calibrating'
+        models = (self.transcriber_model, self.summarizer_model)
+        if all(model.is_loaded for model in models):
+            return 'ready'
+        if any(model.loading for model in models):
+            return 'loading'
+        return 'idle'
+
+    def check_duration(self, duration, job):
+        max_duration = job.config['max_duration']
+        if duration > max_duration:
+            minutes = max_duration / 60
+            video_minutes = duration / 60
+            raise Exception(
+                f"Video is {video_minutes:.1f} minutes long. "
+                f"Please use a video shorter than {minutes:.1f} minutes or "
+                f"increase the duration limit in the 'Max Duration' field."
+            )
+
+    def ydl_format(self, job):
+        """The 'format' option for yt-dlp"""
+        if job.config['audio_format'] == ASR_FORMAT:
+            return asr_format_selector(job.config['min_audio_sample_rate'], job.config['min_audio_bitrate'])
+        return job.config['audio_format']
+
+    def audio_cache_format(self, job):
+        """Describe the format choice for the audio cache key"""
+        if job.config['audio_format'] == ASR_FORMAT:
+            return f"{ASR_FORMAT}:{job.config['min_audio_sample_rate']}:{job.config['min_audio_bitrate']}"
+        return job.config['audio_format']
+
+    def get_cached_audio(self, job):
+        if self.audio_cache is None or not job.video_id:
+            return None
+        return self.audio_cache.get(job.video_id, self.audio_cache_format(job))
+
+    def download_youtube_audio(self, job):
+        """Return the path of the video's audio, from the audio cache when possible"""
+        cached_file = self.get_cached_audio(job)
+        if cached_file:
+            job.update_status("Using cached audio, skipping download")
+            job.metrics.record('download', 0, cached=True)
+            return cached_file
+
+        output_path = job.audio_dir
+        if not os.path.exists(output_path):
+            os.makedirs(output_path)
+
+        output_template = os.path.join(output_path, 'audio.%(ext)s')
+
+        # No postprocessing: the compressed stream is decoded straight to PCM later
+        ydl_opts = {
+            'format': self.ydl_format(job),
+            'concurrent_fragment_downloads': job.config['concurrent_fragments'],
+            'outtmpl': output_template,
+            'progress_hooks': [lambda d: self.my_hook(job, d)],
+            'quiet': True,
+            'no_warnings': True
+        }
+
+        import yt_dlp
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            job.update_status("Extracting video information...")
+            info = ydl.extract_info(job.url, download=False)
+            job.video_id = info.get('id') or job.video_id
+
+            self.check_duration(info.get('duration') or 0, job)
+
+            job.update_status(f"Downloading: {info.get('title', 'Video')}")
+            with job.metrics.stage('download', cached=False):
+                ydl.download([job.url])
+
+        audio_file = self.find_downloaded_audio(output_path)
+        if not audio_file:
+            raise Exception("Failed to download audio")
+
+        if self.audio_cache is not None and job.video_id:
+            audio_file = self.audio_cache.put(job.video_id, self.audio_cache_format(job), audio_file)
+
+        return audio_file
+
+    def find_downloaded_audio(self, output_path):
+        for name in os.listdir(output_path):
+            if name.startswith('audio.') and not name.endswith(('.part', '.pcm', '.ytdl')):
+                return os.path.join(output_path, name)
+        return None
+
+    def my_hook(self, job, d):
+        if d['status'] == 'downloading':
+            # Fragmented (DASH/HLS) downloads only have an estimate
+            total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate')
+            if total_bytes and 'downloaded_bytes' in d:
+                progress = (d['downloaded_bytes'] / total_bytes) * 100
+                job.update_status(f"Downloading: {progress:.1f}% complete")
+        elif d['status'] == 'finished':
+            job.update_status("Download completed, processing file...")
+
+    def process_audio_chunk(self, samples, start_time, duration, job=None):
+        """Transcribe a window of the decoded audio buffer"""
+        # A view into the memory-mapped samples, no copy or temp file
+        return self.transcribe_window(slice_audio(samples, start_time, duration), start_time, job)
+
+    def transcribe_window(self, audio, start_time, job=None):
+        """Transcribe one window of 16 kHz samples that starts at start_time"""
+        job = self._job(job)
+        with job.metrics.stage('asr_chunk', start_time=round(job.original_time(start_time), 2),
+                               audio_seconds=round(audio_duration(audio), 2)) as fields:
+            try:
+                # Transcribe chunk
+                with self.stage_cpus('asr'):
+                    text = self.asr.transcribe(self.transcriber, audio, job.config)
+                if job.checkpoint is not None:
+                    job.checkpoint.add_chunk(start_time, text)
+                return text
+
+            except Exception as e:
+                fields['error'] = str(e)
+                job.failed_windows.append(start_time)
+                job.update_status(f"Warning: Error processing chunk at {job.original_time(start_time):.1f}s: {str(e)}")
+                return ""
+
+    def transcribe_audio(self, file_path, job=None):
+        job = self._job(job)
+        if not os.path.exists(file_path):
+            raise Exception(f"Audio file not found at {file_path}")
+
+        job.update_status("Transcribing audio file...")
+
+        samples, windows, total_duration = self.prepare_audio(file_path, job)
+        try:
+            chunks = self.iter_transcribed_chunks(samples, windows, total_duration, job)
+            return " ".join(chunk for chunk in chunks if chunk)
+        finally:
+            # Like prepare_audio: a traceback through this frame must not keep the audio mapped
+            samples = chunks = None
+
+    def plan_ingest(self, job):
+        """Decide once per job whether the download is decoded as it arrives.
+
+        Streamed audio is never available whole, so the speech prepass and the
+        silence segmenter cannot run on it. They are turned off for the job,
+        which also keeps them out of its transcript key.
+        """
+        job.streams_audio = bool(job.config['stream_ingest']) and not self.get_cached_audio(job)
+        if not job.streams_audio:
+            return
+        skipped = []
+        if job.config['speech_prepass']:
+            skipped.append("the speech prepass")
+        if job.config['segmenter'] == 'silence':
+            skipped.append("silence segmentation")
+        if skipped:
+            job.update_status(f"Warning: Streamed audio is transcribed without {' and '.join(skipped)}")
+            job.config.update(speech_prepass=None, segmenter='fixed')
+
+    def asr_window_size(self, job):
+        """Seconds of audio per transcription window"""
+        if job.config['stream_ingest']:
+            # Small windows so text starts flowing while the download runs
+            return job.config['stream_window']
+        chunk_size = job.config['chunk_size']
+        if chunk_size <= 0:
+            chunk_size = 600  # Default 10 minutes if invalid
+        return chunk_size
+
+    def segmentation_key(self, job):
+        """How the audio is cut into windows, beyond the window size"""
+        key = []
+        if job.config['segmenter'] == 'silence':
+            key += ['silence', job.config['chunk_overlap']]
+        if job.config['speech_prepass']:
+            key += ['speech', job.config['speech_prepass']]
+        return key or None
+
+    def keep_speech(self, samples, job):
+        """Cut the decoded audio down to its speech regions with one VAD pass.
+
+        Music, silence and other non-speech stretches are never windowed or
+        transcribed. job.speech_index maps times in the returned audio back
+        to the source.
+        """
+        method = job.config['speech_prepass']
+        try:
+            with job.metrics.stage('vad', method=method) as fields:
+                try:
+                    index = speech_regions(samples, method)
+                except ImportError:
+                    job.update_status("Warning: Silero VAD needs faster-whisper, using the energy detector")
+                    index = speech_regions(samples, 'energy')
+                    fields['method'] = 'energy'
+                if not index.regions:
+                    raise Exception("No speech found in the audio")
+                speech = index.compact(samples, os.path.join(job.audio_dir, 'speech.pcm'))
+                fields['regions'] = len(index.regions)
+                fields['speech_seconds'] = round(index.speech_seconds, 2)
+        except BaseException:
+            # The traceback keeps this frame alive; it must not keep the audio mapped
+            samples = None
+            raise
+        job.speech_index = index
+        job.update_status(
+            f"Speech found in {index.speech_seconds/60:.1f} of {audio_duration(samples)/60:.1f} minutes "
+            f"({len(index.regions)} regions)"
+        )
+        return speech
+
+    def prepare_audio(self, file_path, job):
+        """Decode the audio once and split it into (start, duration) windows"""
+        chunk_size = self.asr_window_size(job)
+
+        # Decode once to 16 kHz mono PCM; the duration falls out of the sample count
+        os.makedirs(job.audio_dir, exist_ok=True)
+        with job.metrics.stage('decode') as fields:
+            samples = decode_audio(file_path, os.path.join(job.audio_dir, 'audio.pcm'))
+            total_duration = audio_duration(samples)
+            fields['audio_seconds'] = round(total_duration, 2)
+        try:
+            # Cached audio skips the duration check done before downloading
+            self.check_duration(total_duration, job)
+
+            if job.config['speech_prepass']:
+                samples = self.keep_speech(samples, job)
+                total_duration = audio_duration(samples)
+
+            if job.config['segmenter'] == 'silence':
+                # One VAD pass over the decoded audio; cuts land in pauses, not inside words
+                with job.metrics.stage('segment', audio_seconds=round(total_duration, 2)) as fields:
+                    windows = plan_windows(samples, chunk_size, job.config['chunk_overlap'])
+                    fields['chunks'] = len(windows)
+                return samples, windows, total_duration
+        except BaseException:
+            # The traceback keeps this frame alive; it must not keep the audio mapped
+            # while the job removes its files (a mapped file cannot be removed on Windows)
+            samples = None
+            raise
+
+        # Split the audio into fixed windows
+        windows = []
+        current_time = 0
+        while current_time < total_duration:
+            chunk_duration = min(chunk_size, total_duration - current_time)
+            windows.append((current_time, chunk_duration))
+            current_time += chunk_duration
+
+        return samples, windows, total_duration
+
+    def iter_transcribed_chunks(self, samples, windows, total_duration, job):
+        """Yield the text of each (start, duration) window of samples in order"""
+        audio_windows = (
+            (start_time, duration, slice_audio(samples, start_time, duration))
+            for start_time, duration in windows
+        )
+        return self.iter_transcribed_windows(audio_windows, total_duration, job)
+
+    def iter_transcribed_windows(self, audio_windows, total_duration, job):
+        """Yield the text of each (start, duration, samples) window in order.
+
+        Up to asr_workers windows are transcribed at the same time on a worker
+        pool. No more than that run ahead of the consumer, so a slow consumer
+        (such as the streaming summarizer) throttles transcription. Windows
+        may come from a live download, so only total_duration (0 if unknown)
+        is known up front. Windows already in the job's checkpoint are not
+        transcribed again. When a window overlaps the one before it, the
+        words both of them transcribed are dropped from the later one.
+        """
+        workers = max(1, job.config['asr_workers'])
+        if workers > 1:
+            job.update_status(f"Transcribing with {workers} workers...")
+
+        done_seconds = 0
+        previous_text = ""
+        pending = deque()
+
+        def finish_oldest():
+            nonlocal done_seconds, previous_text
+            future, start_time, chunk_duration = pending.popleft()
+            text = future.result()
+            if start_time < done_seconds and text:
+                text = dedupe_overlap(previous_text, text)
+            previous_text = text or previous_text
+            done_seconds = start_time + chunk_duration
+            if total_duration:
+                progress = min(100, (done_seconds / total_duration) * 100)
+                job.update_progress(f"Transcribing: {progress:.1f}% complete", progress)
+            else:
+                job.update_status(f"Transcribed {done_seconds/60:.1f} minutes...")
+            return text
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for start_time, chunk_duration, audio in audio_windows:
+                    text = job.checkpoint.get_chunk(start_time) if job.checkpoint is not None else None
+                    if text is not None:
+                        # Finished by an earlier attempt
+                        future = Future()
+                        future.set_result(text)
+                    else:
+                        if workers == 1:
+                            job.update_status(f"Processing chunk at {job.original_time(start_time)/60:.1f} minutes...")
+                        future = executor.submit(self.transcribe_window, audio, start_time, job)
+                    pending.append((future, start_time, chunk_duration))
+                    if len(pending) >= workers:
+                        yield finish_oldest()
+
+                while pending:
+                    yield finish_oldest()
+        finally:
+            # Like prepare_audio: a traceback through this frame must not keep the audio mapped
+            audio = audio_windows = None
+
+        if job.failed_windows:
+            job.update_status(
+                f"Warning: Could not transcribe {len(job.failed_windows)} chunk(s); "
+                f"they are retried when this video is converted again"
+            )
+
+    def open_audio_windows(self, job):
+        """Return (audio_windows, total_duration) for the job's video.
+
+        audio_windows yields (start_time, duration, samples). With stream_ingest
+        and no cached copy, the samples come straight out of the download as it
+        runs; otherwise the audio is downloaded (or taken from the audio cache)
+        and decoded first.
+        """
+        if job.streams_audio is None:
+            self.plan_ingest(job)
+        if job.streams_audio:
+            return self.open_ingest_stream(job)
+
+        audio_file = self.download_youtube_audio(job)
+        samples, windows, total_duration = self.prepare_audio(audio_file, job)
+        audio_windows = (
+            (start_time, duration, slice_audio(samples, start_time, duration))
+            for start_time, duration in windows
+        )
+        return audio_windows, total_duration
+
+    def open_ingest_stream(self, job):
+        """Stream the download through one decoder instead of saving a WAV first"""
+        import yt_dlp
+        ydl_opts = {'format': self.ydl_format(job), 'quiet': True, 'no_warnings': True}
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            job.update_status("Extracting video information...")
+            info = ydl.extract_info(job.url, download=False)
+        job.video_id = info.get('id') or job.video_id
+
+        total_duration = info.get('duration') or 0
+        self.check_duration(total_duration, job)
+
+        os.makedirs(job.audio_dir, exist_ok=True)
+        copy_path = os.path.join(job.audio_dir, f"audio.{info.get('ext') or 'audio'}")
+        # Download exactly the format chosen above
+        stream = AudioStream(
+            job.url, info['format_id'], self.asr_window_size(job),
+            copy_path, ['--concurrent-fragments', str(job.config['concurrent_fragments'])]
+        )
+
+        def audio_windows():
+            job.update_status(f"Streaming: {info.get('title', 'Video')}")
+            # Download and decode overlap transcription, so this is their combined wall time
+            with job.metrics.stage('download', cached=False, streamed=True):
+                yield from stream.windows()
+            # The compressed copy is complete now, keep it for the next run
+            if stream.complete and self.audio_cache is not None and job.video_id:
+                self.audio_cache.put(job.video_id, self.audio_cache_format(job), copy_path)
+
+        return audio_windows(), total_duration
+
+    def transcript_cache_key(self, job):
+        """Key a transcript by video and every setting that changes the ASR output"""
+        if not job.video_id:
+            return None
+        return make_cache_key(
+            'transcript',
+            job.video_id,
+            self.config['asr_backend'],
+            self.config['whisper_model'],
+            self.config['compute_type'],
+            self.asr_window_size(job),
+            self.segmentation_key(job),
+            self.asr.cache_key(job.config),
+        )
+
+    def open_checkpoint(self, job):
+        """Load the results of earlier, failed attempts at this job"""
+        key = self.transcript_cache_key(job)
+        if not (self.config['cache_dir'] and job.config['checkpoints']) or key is None:
+            return None
+        checkpoint = JobCheckpoint(os.path.join(self.config['cache_dir'], 'checkpoints', f"{key}.jsonl"))
+        if checkpoint.chunks or checkpoint.summaries:
+            job.update_status(
+                f"Resuming from checkpoint: {len(checkpoint.chunks)} chunks transcribed, "
+                f"{len(checkpoint.summaries)} parts summarized"
+            )
+        return checkpoint
+
+    def get_cached_transcript(self, job):
+        key = self.transcript_cache_key(job)
+        if self.transcript_cache is None or key is None:
+            return None
+        return self.transcript_cache.get(key)
+
+    def cache_transcript(self, job, transcript):
+        if job.failed_windows:
+            # A transcript with holes would be reused for good; the checkpoint keeps the rest
+            return
+        key = self.transcript_cache_key(job)
+        if self.transcript_cache is not None and key is not None:
+            self.transcript_cache.put(key, transcript)
+
+    def summarize_text(self, text, job=None):
+        job = self._job(job)
+
+        if not text or len(text.strip()) < 50:
+            job.update_status("Text is too short to summarize.")
+            return "# Video Summary\n\n" + text
+
+        job.update_status("Generating summary...")
+
+        # Clean the text
+        text = text.replace('\n', ' ').strip()
+
+        # Split text into sentences
+        from nltk.tokenize import sent_tokenize
+        sentences = sent_tokenize(text)
+
+        if job.config['summary_engine'] == 'extractive':
+            # Seconds instead of minutes; the summarization model is never loaded
+            return self.format_summary(self.summarize_extractive(sentences, job))
+        if job.config['summary_engine'] == 'hybrid':
+            sentences = self.prefilter_sentences(sentences, job)
+
+        chunks = self.chunk_sentences(sentences, job)
+
+        # Handle case where no valid chunks were created
+        if not chunks:
+            return "# Video Summary\n\n" + text
+
+        if job.config['summary_strategy'] == 'hierarchical':
+            return self.format_summary(self.summarize_hierarchical(chunks, job))
+        return self.format_summary(self.summarize_chunks(chunks, job))
+
+    def summarize_extractive(self, sentences, job):
+        """The most central sentences, in transcript order, grouped into parts of summary_chunk_chars"""
+        job.update_status(f"Ranking {len(sentences)} sentences...")
+        with job.metrics.stage('extractive', sentences=len(sentences)) as fields:
+            selected = extract_sentences(sentences, job.config['extractive_ratio'])
+            fields['selected'] = len(selected)
+
+        parts = []
+        current, size = [], 0
+        for sentence in selected:
+            if current and size + len(sentence) > job.config['summary_chunk_chars']:
+                parts.append(' '.join(current))
+                current, size = [], 0
+            current.append(sentence)
+            size += len(sentence) + 1
+        if current:
+            parts.append(' '.join(current))
+        return parts
+
+    def prefilter_sentences(self, sentences, job):
+        """Drop the least central sentences before the summarization model sees them"""
+        with job.metrics.stage('prefilter', sentences=len(sentences)) as fields:
+            selected = extract_sentences(sentences, job.config['prefilter_ratio'])
+            fields['selected'] = len(selected)
+        job.update_status(f"Pre-filter kept {len(selected)} of {len(sentences)} sentences")
+        return selected
+
+    def count_tokens(self, text):
+        return len(self.summarizer.tokenizer(text, add_special_tokens=False)['input_ids'])
+
+    def summarize_hierarchical(self, chunks, job):
+        """Map-reduce summarization for long transcripts.
+
+        Chunks are summarized in batches, the partial summaries are grouped to
+        fill the model window and summarized again, until the result fits
+        summary_target_tokens or summary_depth levels have run. Every level is
+        cached by its input, so rendering at another depth or target only
+        computes the levels that are new.
+        """
+        job.update_status(f"Summary level 1: {len(chunks)} parts...")
+        return self.reduce_summaries(self.summarize_level(chunks, job), job)
+
+    def reduce_summaries(self, summaries, job, level=1):
+        """Run the reduce levels above `level` over already computed summaries"""
+        target = job.config['summary_target_tokens']
+        max_depth = job.config['summary_depth']
+
+        while True:
+            if len(summaries) == 1 or (max_depth and level >= max_depth):
+                return summaries
+            if self.count_tokens(' '.join(summaries)) <= target:
+                return summaries
+
+            # Group the partial summaries for the next level
+            groups = self.chunk_sentences(summaries, job)
+            if len(groups) >= len(summaries):
+                # Every summary already fills the window, nothing left to merge
+                return summaries
+
+            level += 1
+            job.update_status(f"Summary level {level}: {len(groups)} parts...")
+            summaries = self.summarize_level(groups, job)
+
+    def summarize_level(self, chunks, job):
+        """summarize_chunks with the result cached by input text and summarizer settings"""
+        key = None
+        if self.summary_cache is not None:
+            key = make_cache_key(
+                'summary-level',
+                chunks,
+                self.config['summary_model'],
+                runtime_label(self.config),
+                job.config['summary_max_length'],
+                job.config['summary_min_length'],
+            )
+            cached = self.summary_cache.get(key)
+            if cached is not None:
+                job.update_status("Using cached summaries for this level")
+                return json.loads(cached)
+
+        summaries = self.summarize_chunks(chunks, job)
+
+        # Parts that fell back to their original text are not worth keeping
+        if key is not None and all(summary != chunk for summary, chunk in zip(summaries, chunks)):
+            self.summary_cache.put(key, json.dumps(summaries))
+        return summaries
+
+    def chunk_sentences(self, sentences, job):
+        """Group sentences into summarizer inputs using the job's chunking mode"""
+        chunks, pending = self.pack_sentences(sentences, job)
+        return chunks + self.finish_packing(pending, job)
+
+    def packs_by_tokens(self, job):
+        return job.config['summary_strategy'] == 'hierarchical' or job.config['summary_mode'] == 'tokens'
+
+    def pack_sentences(self, sentences, job, pending=None):
+        """Greedily pack sentences into chunks that fit the job's chunk limit.
+
+        The limit is summary_chunk_chars characters, or the summarizer's token
+        window in token mode. pending is the unfinished chunk of an earlier
+        call as (sentences, size), so a stream of sentences can be packed a
+        piece at a time. Returns (finished chunks, new pending).
+        """
+        by_tokens = self.packs_by_tokens(job)
+        if by_tokens:
+            limit = self.summary_token_limit(job)
+            sizes = [
+                len(ids) for ids in
+                self.summarizer.tokenizer(sentences, add_special_tokens=False)['input_ids']
+            ] if sentences else []
+        else:
+            limit = job.config['summary_chunk_chars']
+            sizes = [len(sentence) for sentence in sentences]
+
+        current_chunk, current_size = pending or ([], 0)
+        chunks = []
+        for sentence, size in zip(sentences, sizes):
+            if current_chunk and current_size + size > limit:
+                chunks.append(' '.join(current_chunk))
+                current_chunk = []
+                current_size = 0
+            # A single sentence longer than the token window is truncated by the pipeline
+            current_chunk.append(sentence)
+            current_size += size
+
+        if not by_tokens:
+            # Minimum length to attempt summarization
+            chunks = [chunk for chunk in chunks if len(chunk) >= job.config['min_chunk_chars']]
+        return chunks, (current_chunk, current_size)
+
+    def finish_packing(self, pending, job):
+        """Close the unfinished chunk left by pack_sentences"""
+        last_chunk = ' '.join(pending[0]) if pending else ''
+        if not last_chunk:
+            return []
+        # Add the last chunk if it meets the minimum length
+        if not self.packs_by_tokens(job) and len(last_chunk) < job.config['min_chunk_chars']:
+            return []
+        return [last_chunk]
+
+    def summary_token_limit(self, job):
+        """Tokens available for one chunk in the summarizer's input window"""
+        tokenizer = self.summarizer.tokenizer
+        limit = job.config['summary_max_tokens'] or tokenizer.model_max_length
+        # Some tokenizers report a huge sentinel when no limit is configured
+        limit = min(limit, 1024)
+        return limit - tokenizer.num_special_tokens_to_add() - 8  # margin for joining spaces
+
+    def chunk_summary_key(self, chunk, job):
+        return make_cache_key(
+            'chunk-summary',
+            chunk,
+            self.config['summary_model'],
+            runtime_label(self.config),
+            job.config['summary_max_length'],
+            job.config['summary_min_length'],
+        )
+
+    def summarize_chunks(self, chunks, job):
+        """Summarize chunks in pipeline batches, falling back to the original text on errors.
+
+        Summaries found in the job's checkpoint are reused; new ones are
+        added to it as each batch finishes.
+        """
+        config = job.config
+        batch_size = max(1, config['summary_batch_size'])
+        summaries = [None] * len(chunks)
+
+        if job.checkpoint is not None:
+            for i, chunk in enumerate(chunks):
+                summaries[i] = job.checkpoint.get_summary(self.chunk_summary_key(chunk, job))
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        if len(missing) < len(chunks):
+            job.update_status(f"Reusing {len(chunks) - len(missing)} summarized parts from the checkpoint")
+
+        for start in range(0, len(missing), batch_size):
+            indices = missing[start:start + batch_size]
+            batch = [chunks[i] for i in indices]
+            first, last = indices[0] + 1, indices[-1] + 1
+            if len(batch) == 1:
+                job.update_status(f"Summarizing part {first} of {len(chunks)}...")
+            else:
+                job.update_status(f"Summarizing parts {first}-{last} of {len(chunks)}...")
+
+            try:
+                with job.metrics.stage('summary_batch', chunks=len(batch),
+                                       chars=sum(len(chunk) for chunk in batch)):
+                    with self.stage_cpus('summary'):
+                        results = self.summarizer(
+                            batch,
+                            batch_size=len(batch),
+                            max_length=config['summary_max_length'],
+                            min_length=config['summary_min_length'],
+                            do_sample=False,
+                            truncation=True
+                        )
+            except Exception:
+                parts = f"part {first}" if len(batch) == 1 else f"parts {first}-{last}"
+                job.update_status(f"Warning: Could not summarize {parts}, using original text")
+                for i in indices:
+                    summaries[i] = chunks[i]  # Fallback to original text
+                continue
+
+            for i, result in zip(indices, results):
+                # The pipeline returns one dict per input, or a one-item list of them
+                if isinstance(result, list):
+                    result = result[0] if result else None
+                if result and result.get('summary_text'):
+                    summaries[i] = result['summary_text']
+                    if job.checkpoint is not None:
+                        job.checkpoint.add_summary(self.chunk_summary_key(chunks[i], job), summaries[i])
+                else:
+                    summaries[i] = chunks[i]  # Use original text if summarization fails
+
+        return summaries
+
+    def format_summary(self, summaries):
+        """Combine chunk summaries with markdown-style headings"""
+        formatted_summary = "# Video Summary\n\n"
+
+        if len(summaries) == 1:
+            formatted_summary += summaries[0]
+        else:
+            for i, summary in enumerate(summaries, 1):
+                formatted_summary += f"## Part {i}\n\n"
+                formatted_summary += f"{summary}\n\n"
+
+        return formatted_summary
+
+    def download_font(self, job=None):
+        """Download the DejaVu font if not present"""
+        job = self._job(job)
+        if not os.path.exists(FONT_PATH):
+            try:
+                urllib.request.urlretrieve(FONT_URL, FONT_PATH)
+                job.update_status("Downloaded required font file")
+                return True
+            except Exception as e:
+                job.update_status(f"Warning: Could not download font: {str(e)}")
+                return False
+        return True
+
+    def save_to_pdf(self, text, filename="notes.pdf", job=None):
+        job = self._job(job)
+        with job.metrics.stage('pdf', chars=len(text)):
+            pdf = self.create_pdf(job)
+            self.add_pdf_text(pdf, text)
+            self.write_pdf(pdf, filename)
+        return True
+
+    def create_pdf(self, job):
+        """Start a document with the title page header"""
+        font_path = None
+        if job.config['pdf_font']:
+            # Download font if needed
+            self.download_font(job)
+            # Use basic ASCII font if DejaVu is not available
+            font_path = FONT_PATH
+        # Font metrics and the embedded font program are parsed once per process;
+        # Helvetica has a bold face for headings, a font file is used as it is
+        pdf = StreamingPdf(load_font(job.config['pdf_font'], font_path),
+                           load_font(job.config['pdf_font'], font_path, bold=True))
+        pdf.info.update(self.pdf_info(job))
+
+        # Add title
+        pdf.set_font(16, bold=True)
+        pdf.cell_centered(10, job.config['pdf_title'])
+        pdf.ln(10)
+
+        # Reset font for content
+        pdf.set_font(12)
+        return pdf
+
+    def pdf_info(self, job):
+        """Document information entries: the title and how the summary was made"""
+        info = {
+            'Title': job.config['pdf_title'].strip(),
+            'Creator': 'YouTube to PDF Notes',
+            'SummaryEngine': job.config['summary_engine'],
+        }
+        if job.config['summary_engine'] != 'extractive':
+            info['SummaryModel'] = self.config['summary_model']
+            info['SummaryRuntime'] = runtime_label(self.config)
+        return info
+
+    def add_pdf_text(self, pdf, text):
+        """Append markdown-style text (# headings and paragraphs) to the document"""
+        # Finished pages go to disk as they fill, so long transcripts stay out of memory
+        for para in text.split('\n'):
+            if para.strip().startswith('#'):  # Heading
+                pdf.set_font(14, bold=True)
+                pdf.multi_cell(10, para.strip('# '))
+                pdf.set_font(12)
+            else:
+                pdf.multi_cell(10, para)
+
+    def write_pdf(self, pdf, filename):
+        # First, ensure any existing PDF is not locked
+        if os.path.exists(filename):
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+        # Try multiple save methods
+        try:
+            try:
+                pdf.output(filename)  # Try direct file output
+            except Exception:
+                # Try writing to temporary file first
+                temp_file = filename + '.tmp'
+                pdf.output(temp_file)
+                shutil.move(temp_file, filename)
+        finally:
+            pdf.close()
+
+    def retry_remove(self, path, max_attempts=5):
+        """Helper function to retry removal with delays"""
+        for attempt in range(max_attempts):
+            try:
+                if os.path.isfile(path):
+                    os.chmod(path, 0o777)  # Give full permissions
+                    os.remove(path)
+                elif os.path.isdir(path):
+                    os.chmod(path, 0o777)  # Give full permissions
+                    if not os.listdir(path):  # Only if directory is empty
+                        os.rmdir(path)
+                return True
+            except Exception:
+                if attempt < max_attempts - 1:
+                    time.sleep(1)  # Wait before retry
+                    continue
+                return False
+        return False
+
+    def cleanup_files(self, job=None):
+        """Clean up temporary files with proper error handling"""
+        job = self._job(job)
+        try:
+            # Clean up audio directory
+            if os.path.exists(job.audio_dir):
+                # First, try to remove files in the directory
+                for file in os.listdir(job.audio_dir):
+                    file_path = os.path.join(job.audio_dir, file)
+                    if not self.retry_remove(file_path):
+                        job.update_status(f"Warning: Could not remove file {file}")
+
+                # Then try to remove the directory itself
+                if not self.retry_remove(job.audio_dir):
+                    job.update_status("Warning: Could not remove audio directory")
+
+        except Exception as e:
+            job.update_status(f"Warning: Cleanup error: {str(e)}")
+
+    def convert(self, job):
+        """Run every stage for one job and return the path of the saved PDF"""
+        error = None
+        audio_windows = chunks = None
+        try:
+            # Inside the try, so a failure here still stops the sampler and logs the job
+            job.metrics.start()
+            # Calibration may pick another Whisper model, which is part of the transcript key
+            self.ensure_tuned()
+            # Models load on first use; only the tokenizer data is needed up front
+            self.ensure_nltk_data()
+            # Ensure cleanup from any previous runs
+            self.cleanup_files(job)
+            # Settles how the audio is segmented, which is part of the transcript key
+            self.plan_ingest(job)
+            # Chunks finished by an earlier attempt are not computed again
+            job.checkpoint = self.open_checkpoint(job)
+
+            transcript = self.get_cached_transcript(job)
+            # Ranking needs every sentence, so only abstractive summaries stream
+            if not transcript and job.config['streaming'] and job.config['summary_engine'] == 'abstractive':
+                return self.convert_streaming(job)
+
+            if transcript:
+                # Same video and ASR settings as an earlier run, go straight to summarization
+                job.update_status("Using cached transcript, skipping download and transcription")
+            else:
+                # Download audio
+                job.update_progress("Downloading audio...", 20)
+                job.update_status("Downloading video audio...")
+                audio_windows, total_duration = self.open_audio_windows(job)
+
+                # Transcribe; every ASR backend goes through the same window scheduler
+                job.update_progress("Transcribing audio...", 40)
+                job.update_status("Transcribing audio to text...")
+                chunks = self.iter_transcribed_windows(audio_windows, total_duration, job)
+                transcript = " ".join(chunk for chunk in chunks if chunk)
+                if not transcript:
+                    raise Exception("Failed to transcribe audio")
+
+                # Basic transcript validation
+                if len(transcript.strip()) < 10:
+                    raise Exception("Transcription produced empty or very short text")
+
+                self.cache_transcript(job, transcript)
+
+            # Summarize
+            job.update_progress("Summarizing text...", 60)
+            job.update_status("Generating summary...")
+            try:
+                summary = self.summarize_text(transcript, job)
+            except Exception as e:
+                job.update_status(f"Summarization error: {str(e)}")
+                summary = None
+            if not summary:
+                job.update_status("Warning: Summarization failed, using original transcript")
+                summary = "# Video Transcript\n\n" + transcript
+
+            # Save PDF
+            job.update_progress("Creating PDF...", 80)
+            job.update_status("Creating PDF document...")
+            try:
+                self.save_to_pdf(summary, job.output_file, job)
+            except Exception as e:
+                job.update_status(f"PDF creation error: {str(e)}")
+                raise Exception("Failed to save PDF")
+
+            return self.finish_job(job)
+
+        except Exception as e:
+            error = str(e)
+            raise
+
+        finally:
+            # Unmap the decoded audio first; a mapped file cannot be removed on Windows
+            self.close_windows(audio_windows, chunks)
+            audio_windows = chunks = None
+            # Cleanup temporary files with retries
+            self.cleanup_files(job)
+            self.finish_metrics(job, error)
+
+    def close_windows(self, *generators):
+        """Stop window generators so they drop their references to the audio buffers"""
+        for generator in generators:
+            if generator is not None:
+                try:
+                    generator.close()
+                except Exception as e:
+                    self.update_status(f"Warning: Could not close the audio stream: {str(e)}")
+
+    def convert_streaming(self, job):
+        """Transcribe, summarize and lay out the PDF concurrently"""
+        # Download audio (or, with stream_ingest, start the download stream)
+        job.update_progress("Downloading audio...", 20)
+        job.update_status("Downloading video audio...")
+        audio_windows, total_duration = self.open_audio_windows(job)
+
+        job.update_progress("Transcribing and summarizing...", 40)
+        job.update_status("Streaming transcription into summarization...")
+        try:
+            transcript, pdf = StreamingPipeline(self, job).run(audio_windows, total_duration)
+        finally:
+            # As in convert, unmap the decoded audio before the job's files are removed
+            self.close_windows(audio_windows)
+            audio_windows = None
+
+        # Basic transcript validation
+        if len(transcript.strip()) < 10:
+            raise Exception("Transcription produced empty or very short text")
+        self.cache_transcript(job, transcript)
+
+        # Save PDF
+        job.update_status("Writing PDF document...")
+        try:
+            # Layout ran alongside the other stages; this is the final write
+            with job.metrics.stage('pdf', streamed=True):
+                self.write_pdf(pdf, job.output_file)
+        except Exception as e:
+            job.update_status(f"PDF creation error: {str(e)}")
+            raise Exception("Failed to save PDF")
+
+        return self.finish_job(job)
+
+    def finish_metrics(self, job, error=None):
+        """Close the job's metrics, log them and report where the time went"""
+        job.metrics.video_id = job.video_id
+        summary = job.metrics.finish('error' if error else 'ok', error)
+        if self.metrics_log is not None:
+            self.metrics_log.job_finished(summary)
+
+        stages = ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in summary['stage_seconds'].items())
+        if stages:
+            rtf = f", ASR RTF {summary['asr_rtf']:.2f}" if summary['asr_rtf'] is not None else ""
+            job.update_status(f"Timings: {stages}{rtf} (total {summary['seconds']:.1f}s)")
+        return summary
+
+    def finish_job(self, job):
+        if job.checkpoint is not None and not job.failed_windows:
+            # The transcript is cached and the PDF written, nothing left to resume
+            job.checkpoint.discard()
+        name = os.path.basename(job.output_file)
+        job.update_progress(f"✅ Notes saved as {name}", 100)
+        job.update_status(f"Success! Notes saved as {name}")
+        return job.output_file
@@ -0,0 +1,97 @@
+import re
+
+import numpy as np
+
+WORD = re.compile(r"[a-z0-9']+")
+
+# Words too common to say anything about what a sentence is about
+STOP_WORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could did do does
+for from had has have he her his how i if in into is it its just like me more my no not of
+on one or our out she so some than that the their them then there these they this those to
+up us was we were what when which who will with would you your
+""".split())
+
+
+def term_matrix(sentences, max_terms=4096):
+    """L2-normalized TF-IDF rows, one per sentence.
+
+    Terms that occur in only one sentence cannot make two sentences similar,
+    so they are left out; of the rest, the max_terms found in the most
+    sentences are kept. The matrix is dense, sentences x kept terms.
+    """
+    vocabulary = {}
+    rows, columns = [], []
+    for row, sentence in enumerate(sentences):
+        for word in WORD.findall(sentence.lower()):
+            if word not in STOP_WORDS:
+                rows.append(row)
+                columns.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    count = len(sentences)
+    if not vocabulary:
+        return np.zeros((count, 0), dtype=np.float32)
+    rows = np.array(rows, dtype=np.int64)
+    columns = np.array(columns, dtype=np.int64)
+    size = len(vocabulary)
+
+    # Document frequency: in how many sentences each term occurs
+    document_frequency = np.bincount(np.unique(rows * size + columns) % size, minlength=size)
+    keep = np.flatnonzero(document_frequency > 1)
+    if len(keep) > max_terms:
+        keep = keep[np.argsort(-document_frequency[keep], kind='stable')[:max_terms]]
+    position = np.full(size, -1)
+    position[keep] = np.arange(len(keep))
+
+    kept = position[columns] >= 0
+    counts = np.zeros((count, len(keep)), dtype=np.float32)
+    np.add.at(counts, (rows[kept], position[columns[kept]]), 1)
+
+    idf = np.log((1 + count) / (1 + document_frequency[keep])) + 1
+    matrix = np.log1p(counts) * idf.astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1)
+
+
+def textrank(matrix, damping=0.85, iterations=100, tolerance=1e-6):
+    """Centrality of each row in the cosine-similarity graph of the rows.
+
+    PageRank by power iteration. The similarity matrix is never built:
+    S @ v is computed as matrix @ (matrix.T @ v) minus the self-similarity,
+    so memory and time stay linear in the number of sentences.
+    """
+    count = len(matrix)
+    if not count:
+        return np.zeros(0)
+    matrix = matrix.astype(np.float64)
+    self_similarity = np.einsum('ij,ij->i', matrix, matrix)
+
+    def similarity_times(vector):
+        return matrix @ (matrix.T @ vector) - self_similarity * vector
+
+    degree = similarity_times(np.ones(count))
+    # Sentences similar to no other spread their score evenly
+    isolated = degree <= 1e-12
+    degree[isolated] = 1
+
+    scores = np.full(count, 1 / count)
+    for _ in range(iterations):
+        spread = np.where(isolated, 0, scores / degree)
+        updated = (1 - damping) / count + damping * (similarity_times(spread) + scores[isolated].sum() / count)
+        converged = np.abs(updated - scores).sum() < tolerance
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def extract_sentences(sentences, ratio, min_sentences=1):
+    """The most central ratio of the sentences, in their original order"""
+    if not sentences:
+        return []
+    keep = max(min_sentences, int(round(len(sentences) * ratio)))
+    if keep >= len(sentences):
+        return list(sentences)
+    scores = textrank(term_matrix(sentences))
+    top = np.sort(np.argsort(-scores, kind='stable')[:keep])
+    return [sentences[i] for i in top]
@@ -0,0 +1,68 @@
+from audio_decoder import SAMPLE_RATE
+
+# audio_format value that selects with select_asr_format instead of a yt-dlp format string
+ASR_FORMAT = 'asr'
+
+
+def has_audio(fmt):
+    return fmt.get('acodec') != 'none'
+
+
+def is_audio_only(fmt):
+    return has_audio(fmt) and fmt.get('vcodec') == 'none'
+
+
+def bitrate(fmt):
+    """Audio bitrate in kbit/s, or None when yt-dlp does not know it"""
+    return fmt.get('abr') or (fmt.get('tbr') if is_audio_only(fmt) else None)
+
+
+def download_rate(fmt, duration=None):
+    """kbit/s the download costs; every format of a video has the same duration"""
+    rate = fmt.get('tbr') or bitrate(fmt)
+    size = fmt.get('filesize') or fmt.get('filesize_approx')
+    if not rate and size and duration:
+        rate = size * 8 / 1000 / duration
+    return rate
+
+
+def good_enough_for_asr(fmt, min_sample_rate, min_bitrate):
+    # Unknown values are given the benefit of the doubt
+    sample_rate = fmt.get('asr')
+    if sample_rate and sample_rate < min_sample_rate:
+        return False
+    kbps = bitrate(fmt)
+    return not (kbps and kbps < min_bitrate)
+
+
+def select_asr_format(formats, duration=None, min_sample_rate=SAMPLE_RATE, min_bitrate=32):
+    """Return the smallest format that still carries enough audio for 16 kHz ASR.
+
+    Audio-only streams are preferred over muxed ones, and streams below
+    min_sample_rate Hz or min_bitrate kbit/s are skipped unless nothing else is
+    available. Among the rest the one with the lowest download bitrate wins.
+    Returns None if no format has audio.
+    """
+    candidates = [fmt for fmt in formats if is_audio_only(fmt)]
+    if not candidates:
+        candidates = [fmt for fmt in formats if has_audio(fmt)]
+    if not candidates:
+        return None
+
+    good = [fmt for fmt in candidates if good_enough_for_asr(fmt, min_sample_rate, min_bitrate)]
+
+    def cost(fmt):
+        rate = download_rate(fmt, duration)
+        # Formats of unknown size go last
+        return (rate is None, rate or 0)
+
+    return min(good or candidates, key=cost)
+
+
+def asr_format_selector(min_sample_rate=SAMPLE_RATE, min_bitrate=32):
+    """Build a yt-dlp 'format' callable that applies select_asr_format"""
+    def selector(ctx):
+        fmt = select_asr_format(ctx['formats'], None, min_sample_rate, min_bitrate)
+        if fmt:
+            yield fmt
+    return selector
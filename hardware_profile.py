@@ -0,0 +1,232 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asr_backends import create_backend
+from audio_decoder import SAMPLE_RATE
+from synthetic_speech import speech_like_audio
+
+# Bump when the measurements change meaning; older profiles are recalibrated
+PROFILE_VERSION = 1
+
+# Model sizes and compute types per ASR backend, from least to most accurate
+MODEL_SIZES = {
+    'faster-whisper': ['tiny', 'base', 'small', 'medium'],
+    'transformers': ['openai/whisper-tiny', 'openai/whisper-base', 'openai/whisper-small',
+                     'openai/whisper-medium'],
+}
+COMPUTE_TYPES = {
+    'faster-whisper': ['int8', 'float32'],
+    'transformers': ['float32'],
+}
+
+
+def host_fingerprint():
+    """What a profile was measured on; a profile from other hardware is not reused"""
+    return {
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'system': platform.system(),
+        'cpu_count': os.cpu_count() or 1,
+    }
+
+
+def worker_layouts(backend, cores):
+    """(parallel workers, threads per worker) splits of the cores to try"""
+    if backend != 'faster-whisper':
+        # torch has one thread pool per process, shared by every window the pipeline runs
+        return [(1, 0)]
+    layouts = []
+    for workers in (1, 2, 4):
+        if workers <= cores:
+            layouts.append((workers, max(1, cores // workers)))
+    return layouts
+
+
+def measure(config, model, compute_type, workers, threads, audio):
+    """Real-time factor of one setup with `workers` transcriptions running at once"""
+    result = dict(whisper_model=model, compute_type=compute_type, workers=workers, threads=threads)
+    asr = create_backend(config['asr_backend'])
+    config = dict(config, whisper_model=model, compute_type=compute_type, num_workers=workers,
+                  asr_workers=workers, asr_threads_per_worker=threads)
+
+    def transcribe_once(samples):
+        # No VAD, so every window is decoded whatever the test audio sounds like
+        return asr.transcribe(transcriber, samples, config, vad_filter=False)
+
+    try:
+        start = time.perf_counter()
+        transcriber = asr.load(config)
+        result['load_seconds'] = round(time.perf_counter() - start, 3)
+
+        # The first call pays for one-off setup, keep it out of the timing
+        transcribe_once(audio[:SAMPLE_RATE * 2])
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda _: transcribe_once(audio), range(workers)))
+        elapsed = time.perf_counter() - start
+        result['rtf'] = round(elapsed / (workers * len(audio) / SAMPLE_RATE), 4)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def choose(results, models, compute_types, target_rtf):
+    """The most accurate measured setup that meets target_rtf, else the fastest one.
+
+    models and compute_types list the candidates from least to most accurate.
+    """
+    measured = [result for result in results if result.get('rtf') is not None]
+    if not measured:
+        return None
+
+    def accuracy(result):
+        return (models.index(result['whisper_model']), compute_types.index(result['compute_type']))
+
+    fast_enough = [result for result in measured if result['rtf'] <= target_rtf]
+    if fast_enough:
+        # Most accurate first; among equals the layout with the best throughput
+        best = max(fast_enough, key=lambda result: (accuracy(result), -result['rtf']))
+    else:
+        best = min(measured, key=lambda result: result['rtf'])
+    return dict(best, meets_target=best['rtf'] <= target_rtf)
+
+
+def profile_settings(profile):
+    """Engine config values for the setup a profile chose"""
+    choice = profile['choice']
+    settings = {'whisper_model': choice['whisper_model']}
+    if profile['backend'] == 'faster-whisper':
+        settings.update(
+            compute_type=choice['compute_type'],
+            asr_workers=choice['workers'],
+            num_workers=choice['workers'],
+            asr_threads_per_worker=choice['threads'],
+        )
+    return settings
+
+
+def calibrate(config, target_rtf, models=None, audio_seconds=20, audio=None, status_callback=None):
+    """Measure the candidate ASR setups of config's asr_backend on this host and pick one for target_rtf.
+
+    Models are tried from the smallest up. Once every compute type of a
+    model misses the target even with its best layout, larger models are
+    skipped, since they can only be slower; a compute type that misses it
+    is not tried on larger models either. Returns the profile to save.
+    """
+    def update_status(message):
+        if status_callback:
+            status_callback(message)
+
+    backend = config['asr_backend']
+    if audio is None:
+        # Speech-like test audio, so calibration needs no recording or network
+        audio = speech_like_audio(audio_seconds)
+    cores = os.cpu_count() or 1
+    models = models or MODEL_SIZES[backend]
+    compute_types = list(COMPUTE_TYPES[backend])
+    results = []
+
+    for model in models:
+        for compute_type in list(compute_types):
+            best_rtf = None
+            for workers, threads in worker_layouts(backend, cores):
+                update_status(f"Calibrating {model} {compute_type}, {workers} x {threads or 'default'} threads...")
+                result = measure(config, model, compute_type, workers, threads, audio)
+                results.append(result)
+                if 'error' in result:
+                    update_status(f"Warning: Calibration run failed: {result['error']}")
+                    break
+                if best_rtf is None or result['rtf'] < best_rtf:
+                    best_rtf = result['rtf']
+            if best_rtf is None or best_rtf > target_rtf:
+                compute_types.remove(compute_type)
+        if not compute_types:
+            break
+
+    return {
+        'version': PROFILE_VERSION,
+        'host': host_fingerprint(),
+        'backend': backend,
+        'target_rtf': target_rtf,
+        'audio_seconds': round(len(audio) / SAMPLE_RATE, 2),
+        'created': time.time(),
+        'results': results,
+        'choice': choose(results, models, COMPUTE_TYPES[backend], target_rtf),
+    }
+
+
+def load_profile(path, backend, target_rtf):
+    """A saved profile for this host, backend and target, or None"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            profiles = json.load(f)
+    except (OSError, ValueError):
+        return None
+    profile = profiles.get(backend)
+    if (not profile or profile.get('version') != PROFILE_VERSION or profile.get('host') != host_fingerprint()
+            or profile.get('target_rtf') != target_rtf or not profile.get('choice')):
+        return None
+    return profile
+
+
+def save_profile(path, profile):
+    """Store a profile next to the ones for the other backend"""
+    profiles = {}
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                profiles = json.load(f)
+        except (OSError, ValueError):
+            profiles = {}
+    profiles[profile['backend']] = profile
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Measure ASR speed on this machine and save the setup the converters should use."
+    )
+    parser.add_argument('--mode', choices=['offline', 'online'], default='offline',
+                        help="offline calibrates faster-whisper, online the transformers pipeline")
+    parser.add_argument('--target-rtf', type=float, default=None,
+                        help="seconds of ASR per second of audio the setup must reach (default: from the config)")
+    parser.add_argument('--models', nargs='+',
+                        help="model sizes to try, smallest first (default: all sizes up to medium)")
+    parser.add_argument('--seconds', type=float, default=20,
+                        help="length of the test audio (default: 20)")
+    parser.add_argument('--profile', default=None,
+                        help="profile file to write (default: from the config)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from converter_engine import DEFAULT_CONFIG, ONLINE_CONFIG
+    args = parse_args(argv)
+    config = ONLINE_CONFIG if args.mode == 'online' else DEFAULT_CONFIG
+    target_rtf = args.target_rtf if args.target_rtf is not None else config['target_rtf']
+    path = args.profile or config['hardware_profile']
+
+    profile = calibrate(config, target_rtf, args.models, args.seconds,
+                        status_callback=lambda message: print(message, file=sys.stderr, flush=True))
+    save_profile(path, profile)
+    json.dump(profile_settings(profile) if profile['choice'] else None, sys.stdout, indent=2)
+    print()
+    return 0 if profile['choice'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
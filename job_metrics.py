@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+
+def current_rss():
+    """Resident set size of this process in bytes, or None if it cannot be read"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+
+def ensure_parent(path):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+
+def cpu_seconds():
+    times = os.times()
+    return times.user + times.system
+
+
+class JobMetrics:
+    """Stage timings and resource use for one conversion.
+
+    Every stage event (download, decode, each ASR chunk, each summarization
+    batch, the PDF render) is kept for the job summary and passed to
+    on_event as it happens. While the job runs, a sampler thread tracks the
+    peak RSS. CPU time is process-wide, so jobs running side by side in one
+    process share it.
+    """
+
+    def __init__(self, url, video_id=None, on_event=None, sample_interval=0.5):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.url = url
+        self.video_id = video_id
+        self.on_event = on_event
+        self.sample_interval = sample_interval
+        self.events = []
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.start_wall = time.perf_counter()
+        self.start_cpu = cpu_seconds()
+        self.peak_rss = None
+        self.stop_sampling = threading.Event()
+
+    def start(self):
+        """Reset the clocks and start sampling memory use"""
+        self.started = time.time()
+        self.start_wall = time.perf_counter()
+        self.start_cpu = cpu_seconds()
+        self.peak_rss = current_rss()
+        sampler = threading.Thread(target=self.sample_rss, daemon=True)
+        sampler.start()
+
+    def sample_rss(self):
+        while not self.stop_sampling.wait(self.sample_interval):
+            rss = current_rss()
+            if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+                self.peak_rss = rss
+
+    def record(self, stage, seconds, started=None, **fields):
+        event = dict(stage=stage, seconds=round(seconds, 4), **fields)
+        if started is not None:
+            event['offset'] = round(started - self.start_wall, 4)
+        with self.lock:
+            self.events.append(event)
+        if self.on_event:
+            self.on_event(self, event)
+
+    @contextmanager
+    def stage(self, name, **fields):
+        """Time the body of a with block as one stage event"""
+        started = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.record(name, time.perf_counter() - started, started, **fields)
+
+    def finish(self, status, error=None):
+        """Stop sampling and return the job summary"""
+        self.stop_sampling.set()
+        rss = current_rss()
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+        wall = time.perf_counter() - self.start_wall
+        cpu = cpu_seconds() - self.start_cpu
+
+        with self.lock:
+            events = list(self.events)
+        stage_seconds = {}
+        for event in events:
+            stage_seconds[event['stage']] = round(stage_seconds.get(event['stage'], 0) + event['seconds'], 4)
+
+        # ASR wall time runs from the first chunk starting to the last one ending,
+        # so parallel workers are not counted twice
+        asr_events = [event for event in events if event['stage'] == 'asr_chunk' and 'offset' in event]
+        audio_seconds = sum(event.get('audio_seconds', 0) for event in asr_events)
+        asr_rtf = None
+        if asr_events and audio_seconds:
+            asr_wall = (max(event['offset'] + event['seconds'] for event in asr_events)
+                        - min(event['offset'] for event in asr_events))
+            asr_rtf = round(asr_wall / audio_seconds, 4)
+
+        return {
+            'job_id': self.job_id,
+            'url': self.url,
+            'video_id': self.video_id,
+            'status': status,
+            'error': error,
+            'started': self.started,
+            'seconds': round(wall, 4),
+            'stage_seconds': stage_seconds,
+            'asr_chunks': len(asr_events),
+            'audio_seconds': round(audio_seconds, 2),
+            'asr_rtf': asr_rtf,
+            'peak_rss_bytes': self.peak_rss,
+            'cpu_seconds': round(cpu, 4),
+            'cpu_utilization': round(cpu / wall / (os.cpu_count() or 1), 4) if wall else None,
+        }
+
+
+class MetricsLog:
+    """Append job metrics to a JSON-lines file and, optionally, a Prometheus text file.
+
+    Each stage event is written as a {"type": "stage"} line as soon as it is
+    recorded, and the job summary as a {"type": "job"} line at the end. The
+    Prometheus file (for node_exporter's textfile collector) is rewritten
+    after every job with per-stage totals for this process and the last
+    job's RTF, peak RSS and CPU use.
+    """
+
+    def __init__(self, path=None, prometheus_path=None):
+        self.path = path
+        self.prometheus_path = prometheus_path
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.stage_totals = {}
+        self.last_job = None
+
+    def write_line(self, record):
+        if not self.path:
+            return
+        line = json.dumps(record, ensure_ascii=False)
+        with self.lock:
+            ensure_parent(self.path)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def stage_event(self, metrics, event):
+        self.write_line(dict(type='stage', job_id=metrics.job_id, video_id=metrics.video_id,
+                             time=time.time(), **event))
+
+    def job_finished(self, summary):
+        self.write_line(dict(type='job', **summary))
+        with self.lock:
+            self.jobs[summary['status']] = self.jobs.get(summary['status'], 0) + 1
+            for stage, seconds in summary['stage_seconds'].items():
+                self.stage_totals[stage] = self.stage_totals.get(stage, 0) + seconds
+            self.last_job = summary
+            if self.prometheus_path:
+                self.write_prometheus()
+
+    def write_prometheus(self):
+        lines = [
+            "# HELP video_notes_jobs_total Conversions finished by this process, by status",
+            "# TYPE video_notes_jobs_total counter",
+        ]
+        lines += [f'video_notes_jobs_total{{status="{status}"}} {count}' for status, count in sorted(self.jobs.items())]
+        lines += [
+            "# HELP video_notes_stage_seconds_total Time spent in each stage by this process",
+            "# TYPE video_notes_stage_seconds_total counter",
+        ]
+        lines += [f'video_notes_stage_seconds_total{{stage="{stage}"}} {seconds:.4f}'
+                  for stage, seconds in sorted(self.stage_totals.items())]
+
+        gauges = [
+            ('seconds', "Wall time of the last job"),
+            ('asr_rtf', "ASR real-time factor of the last job"),
+            ('peak_rss_bytes', "Peak resident memory during the last job"),
+            ('cpu_utilization', "CPU use of the last job as a fraction of all cores"),
+        ]
+        for key, description in gauges:
+            value = self.last_job.get(key)
+            if value is None:
+                continue
+            lines += [
+                f"# HELP video_notes_last_job_{key} {description}",
+                f"# TYPE video_notes_last_job_{key} gauge",
+                f"video_notes_last_job_{key} {value}",
+            ]
+
+        # Write and rename so the collector never reads a half-written file
+        ensure_parent(self.prometheus_path)
+        temp_path = self.prometheus_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temp_path, self.prometheus_path)
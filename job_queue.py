@@ -0,0 +1,179 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from converter_engine import extract_video_id
+
+# Entry states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobQueue:
+    """Conversions waiting, running and finished, kept on disk between runs.
+
+    Up to max_running jobs run at once on the shared engine, each in its own
+    work directory under work_root and with its own output file, so they
+    never touch each other's files. Every state change is written to path;
+    jobs that were running when the program stopped are queued again on the
+    next start. Callbacks run on the job threads.
+    """
+
+    def __init__(self, engine, path, work_root, output_dir=".", max_running=1,
+                 status_callback=None, on_change=None):
+        self.engine = engine
+        self.path = path
+        self.work_root = work_root
+        self.output_dir = output_dir
+        self.max_running = max_running
+        self.status_callback = status_callback
+        self.on_change = on_change
+        self.lock = threading.RLock()
+        self.entries = []
+        self.progress = {}  # entry id -> (message, percent), not persisted
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            self.log('queue', f"Warning: Could not read the job queue: {str(e)}")
+            return
+        self.max_running = state.get('max_running', self.max_running)
+        self.entries = state.get('entries', [])
+        for entry in self.entries:
+            if entry['status'] == RUNNING:
+                # Interrupted by the last shutdown
+                entry['status'] = QUEUED
+
+    def save(self):
+        with self.lock:
+            state = {'max_running': self.max_running, 'entries': self.entries}
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2)
+            os.replace(temp_path, self.path)
+
+    def log(self, prefix, message):
+        if self.status_callback:
+            self.status_callback(f"[{prefix}] {message}")
+
+    def changed(self):
+        self.save()
+        if self.on_change:
+            self.on_change()
+
+    def snapshot(self):
+        """Copies of the entries with their live progress, for display"""
+        with self.lock:
+            return [dict(entry, progress=self.progress.get(entry['id'])) for entry in self.entries]
+
+    def add(self, url, options=None):
+        """Queue a URL; returns the new entry, or None if the video is already queued or running"""
+        video_id = extract_video_id(url)
+        with self.lock:
+            for entry in self.entries:
+                if entry['video_id'] == video_id and entry['status'] in (QUEUED, RUNNING):
+                    return None
+            entry = {
+                'id': uuid.uuid4().hex[:8],
+                'url': url,
+                'video_id': video_id,
+                'options': options or {},
+                'status': QUEUED,
+                'output_file': os.path.join(self.output_dir, f"notes_{video_id}.pdf"),
+                'error': None,
+                'added': time.time(),
+                'finished': None,
+            }
+            self.entries.append(entry)
+            self.changed()
+        self.dispatch()
+        return entry
+
+    def retry(self, entry_id):
+        with self.lock:
+            for entry in self.entries:
+                if entry['id'] == entry_id and entry['status'] == FAILED:
+                    entry.update(status=QUEUED, error=None, finished=None)
+            self.changed()
+        self.dispatch()
+
+    def remove(self, entry_id):
+        """Drop an entry that is not running"""
+        with self.lock:
+            self.entries = [
+                entry for entry in self.entries
+                if entry['id'] != entry_id or entry['status'] == RUNNING
+            ]
+            self.changed()
+
+    def clear_finished(self):
+        with self.lock:
+            self.entries = [entry for entry in self.entries if entry['status'] in (QUEUED, RUNNING)]
+            self.changed()
+
+    def set_max_running(self, max_running):
+        with self.lock:
+            self.max_running = max(1, max_running)
+            self.changed()
+        self.dispatch()
+
+    def dispatch(self):
+        """Start queued jobs, oldest first, until max_running are running"""
+        with self.lock:
+            running = sum(1 for entry in self.entries if entry['status'] == RUNNING)
+            started = []
+            for entry in self.entries:
+                if running + len(started) >= self.max_running:
+                    break
+                if entry['status'] == QUEUED:
+                    entry['status'] = RUNNING
+                    started.append(entry)
+            if not started:
+                return
+            self.changed()
+        for entry in started:
+            thread = threading.Thread(target=self.run, args=(entry,), daemon=True)
+            thread.start()
+
+    def run(self, entry):
+        prefix = entry['video_id'] or entry['id']
+        work_dir = os.path.join(self.work_root, entry['id'])
+        os.makedirs(work_dir, exist_ok=True)
+
+        def update_progress(message, value):
+            self.progress[entry['id']] = (message, value)
+
+        job = self.engine.create_job(
+            entry['url'],
+            output_file=entry['output_file'],
+            work_dir=work_dir,
+            options=entry['options'],
+            status_callback=lambda message: self.log(prefix, message),
+            progress_callback=update_progress,
+        )
+        try:
+            self.engine.convert(job)
+            status, error = DONE, None
+        except Exception as e:
+            status, error = FAILED, str(e)
+            self.log(prefix, f"Error: {error}")
+
+        # Nothing in the work directory is needed once the job has finished
+        shutil.rmtree(work_dir, ignore_errors=True)
+        with self.lock:
+            entry.update(status=status, error=error, finished=time.time())
+            self.progress.pop(entry['id'], None)
+            self.changed()
+        self.dispatch()
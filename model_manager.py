@@ -0,0 +1,82 @@
+import gc
+import threading
+import time
+
+
+class LazyModel:
+    """Load a model on first use and release it after it has been idle for a while.
+
+    get() loads the model with `loader` the first time it is needed and
+    refreshes its last-used time on every call. When idle_timeout seconds pass
+    without a get(), the reference is dropped so the memory can be reclaimed;
+    the next get() loads it again. Callers that are still running inference
+    keep their own reference, so releasing never interrupts work in progress.
+    """
+
+    def __init__(self, name, loader, idle_timeout=None, status_callback=None):
+        self.name = name
+        self.loader = loader
+        self.idle_timeout = idle_timeout
+        self.status_callback = status_callback
+        self.model = None
+        self.loading = False
+        self.last_used = 0
+        self.lock = threading.Lock()
+        self.timer = None
+
+    @property
+    def is_loaded(self):
+        return self.model is not None
+
+    def get(self):
+        with self.lock:
+            if self.model is None:
+                self.loading = True
+                try:
+                    self.model = self.loader()
+                finally:
+                    self.loading = False
+                self._schedule_release(self.idle_timeout)
+            self.last_used = time.monotonic()
+            return self.model
+
+    def set(self, model):
+        """Install an already loaded model"""
+        with self.lock:
+            self.model = model
+            self.last_used = time.monotonic()
+            if model is not None:
+                self._schedule_release(self.idle_timeout)
+
+    def release(self):
+        with self.lock:
+            self._release()
+
+    def _release(self):
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        if self.model is not None:
+            self.model = None
+            gc.collect()
+            if self.status_callback:
+                self.status_callback(f"Released idle {self.name} model")
+
+    def _schedule_release(self, delay):
+        if not self.idle_timeout:
+            return
+        if self.timer:
+            self.timer.cancel()
+        self.timer = threading.Timer(delay, self._check_idle)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def _check_idle(self):
+        with self.lock:
+            if self.model is None:
+                return
+            idle = time.monotonic() - self.last_used
+            if idle >= self.idle_timeout:
+                self._release()
+            else:
+                self._schedule_release(self.idle_timeout - idle)
@@ -0,0 +1,374 @@
+import argparse
+import http.client
+import json
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+import numpy as np
+
+from converter_engine import ConverterEngine, DEFAULT_CONFIG, ONLINE_CONFIG
+
+DEFAULT_PORT = 8765
+
+# Settings a client's model must share with the server to use the server's copy.
+# Each model is matched on its own, so a client with a calibrated Whisper
+# setup can still share the summarizer.
+TRANSCRIBER_KEYS = ('asr_backend', 'whisper_model', 'compute_type')
+SUMMARIZER_KEYS = ('summary_model', 'summary_runtime', 'summary_compute_type')
+MODEL_KEYS = TRANSCRIBER_KEYS + SUMMARIZER_KEYS
+
+# Summarizer keyword arguments a client may pass through
+SUMMARY_PARAMS = ('max_length', 'min_length', 'do_sample', 'truncation')
+
+# Seconds without an answer before a client gives up on the server; a long
+# window on a busy server can take minutes
+REQUEST_TIMEOUT = 1800
+
+# The server went away or stopped answering; the client falls back to its own model
+SERVER_ERRORS = (OSError, http.client.HTTPException)
+
+
+# ---------------------------------------------------------------------------
+# Client side
+# ---------------------------------------------------------------------------
+
+def fetch_server_status(url, timeout=0.5):
+    """Return the server's /status payload, or None when no server is running"""
+    try:
+        with urllib.request.urlopen(url.rstrip('/') + '/status', timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def server_matches(status, config, keys=MODEL_KEYS):
+    """True when the server's models agree with config on keys"""
+    # Some other service may answer on the port
+    models = status.get('models') if isinstance(status, dict) else None
+    return isinstance(models, dict) and all(models.get(key) == config[key] for key in keys)
+
+
+def post(url, path, body, headers):
+    request = urllib.request.Request(url.rstrip('/') + path, data=body, method='POST', headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        # The server is up but the request failed; not a reason to fall back
+        raise Exception(f"Model server error: {e.read().decode('utf-8', 'replace')}")
+
+
+class RemoteModel:
+    """Base for clients that forward calls to the model server.
+
+    If the server stops answering, the client loads the in-process model with
+    `fallback` once and uses it from then on.
+    """
+
+    def __init__(self, url, fallback, status_callback=None):
+        self.url = url
+        self.fallback = fallback
+        self.status_callback = status_callback
+        self.local_model = None
+        self.lock = threading.Lock()
+
+    def local(self, error):
+        # URLError wraps the underlying socket error
+        error = getattr(error, 'reason', error)
+        with self.lock:
+            if self.local_model is None:
+                if self.status_callback:
+                    self.status_callback(f"Model server unavailable ({error}), loading local model...")
+                self.local_model = self.fallback()
+        return self.local_model
+
+
+class RemoteTranscriber(RemoteModel):
+    """Stands in for the transcriber on 16 kHz float32 samples.
+
+    Both local APIs are covered: faster_whisper.WhisperModel.transcribe and
+    a call to the transformers speech recognition pipeline.
+    """
+
+    def request(self, audio, options):
+        result = post(
+            self.url, '/transcribe',
+            np.ascontiguousarray(audio, dtype=np.float32).tobytes(),
+            {
+                'Content-Type': 'application/octet-stream',
+                'X-Transcribe-Options': json.dumps(options),
+            }
+        )
+        return [SimpleNamespace(**segment) for segment in result['segments']]
+
+    def transcribe(self, audio, **options):
+        if self.local_model is None:
+            try:
+                return self.request(audio, options), None
+            except SERVER_ERRORS as e:
+                self.local(e)
+        return self.local_model.transcribe(audio, **options)
+
+    def __call__(self, inputs, **params):
+        if self.local_model is None:
+            try:
+                segments = self.request(inputs['raw'], params)
+                return {'text': "".join(segment.text for segment in segments)}
+            except SERVER_ERRORS as e:
+                self.local(e)
+        return self.local_model(inputs, **params)
+
+
+class RemoteSummarizer(RemoteModel):
+    """Stands in for the transformers summarization pipeline"""
+
+    def __init__(self, url, model_name, fallback, status_callback=None):
+        super().__init__(url, fallback, status_callback)
+        self.model_name = model_name
+        self._tokenizer = None
+
+    @property
+    def tokenizer(self):
+        # Token counting stays local; the tokenizer is small next to the model
+        if self.local_model is not None:
+            return self.local_model.tokenizer
+        if self._tokenizer is None:
+            from transformers import AutoTokenizer
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        return self._tokenizer
+
+    def __call__(self, inputs, batch_size=None, **params):
+        if self.local_model is None:
+            chunks = [inputs] if isinstance(inputs, str) else list(inputs)
+            body = {'chunks': chunks, 'params': {k: v for k, v in params.items() if k in SUMMARY_PARAMS}}
+            try:
+                result = post(
+                    self.url, '/summarize', json.dumps(body).encode('utf-8'),
+                    {'Content-Type': 'application/json'}
+                )
+                return [{'summary_text': text} for text in result['summaries']]
+            except SERVER_ERRORS as e:
+                self.local(e)
+        return self.local_model(inputs, batch_size=batch_size, **params)
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+class SummaryBatcher:
+    """Collect summarize requests from many clients into shared pipeline batches.
+
+    Requests that arrive within batch_wait seconds of each other and use the
+    same generation parameters are run as one batch of up to batch_size chunks.
+    """
+
+    def __init__(self, engine, batch_size, batch_wait):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.requests = queue.Queue()
+        self.running = 0
+        thread = threading.Thread(target=self.run, daemon=True)
+        thread.start()
+
+    @property
+    def depth(self):
+        return self.requests.qsize() + self.running
+
+    def submit(self, chunks, params):
+        request = SimpleNamespace(
+            chunks=chunks, params=params, done=threading.Event(), result=None, error=None
+        )
+        self.requests.put(request)
+        request.done.wait()
+        if request.error:
+            raise request.error
+        return request.result
+
+    def run(self):
+        while True:
+            batch = [self.requests.get()]
+            size = len(batch[0].chunks)
+            deadline = time.monotonic() + self.batch_wait
+            while size < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request.chunks)
+
+            self.running = len(batch)
+            groups = {}
+            for request in batch:
+                groups.setdefault(json.dumps(request.params, sort_keys=True), []).append(request)
+            for requests in groups.values():
+                self.run_group(requests)
+            self.running = 0
+
+    def run_group(self, requests):
+        chunks = [chunk for request in requests for chunk in request.chunks]
+        try:
+            with self.engine.stage_cpus('summary'):
+                results = self.engine.summarizer(
+                    chunks, batch_size=min(len(chunks), self.batch_size), **requests[0].params
+                )
+            summaries = [
+                (result[0] if isinstance(result, list) else result)['summary_text'] for result in results
+            ]
+        except Exception as e:
+            for request in requests:
+                request.error = e
+                request.done.set()
+            return
+
+        start = 0
+        for request in requests:
+            request.result = summaries[start:start + len(request.chunks)]
+            start += len(request.chunks)
+            request.done.set()
+
+
+class ModelServer:
+    """Holds one transcriber and one summarizer for every converter on this machine"""
+
+    def __init__(self, config, batch_size=8, batch_wait=0.05):
+        # The server keeps its models for as long as it runs, and never proxies to another server
+        self.engine = ConverterEngine(dict(config, model_idle_timeout=None, model_server=None),
+                                      status_callback=print)
+        self.batcher = SummaryBatcher(self.engine, batch_size, batch_wait)
+        self.transcribe_slots = threading.Semaphore(max(1, self.engine.config['num_workers']))
+        self.transcribe_waiting = 0
+        self.lock = threading.Lock()
+
+    def status(self):
+        return {
+            'models': {key: self.engine.config[key] for key in MODEL_KEYS},
+            'model_status': self.engine.model_status(),
+            'queue_depth': {
+                'transcribe': self.transcribe_waiting,
+                'summarize': self.batcher.depth,
+            },
+        }
+
+    def transcribe(self, audio, options):
+        with self.lock:
+            self.transcribe_waiting += 1
+        try:
+            with self.transcribe_slots, self.engine.stage_cpus('asr'):
+                return self.engine.asr.serve(self.engine.transcriber, audio, options)
+        finally:
+            with self.lock:
+                self.transcribe_waiting -= 1
+
+    def summarize(self, chunks, params):
+        return self.batcher.submit(chunks, params)
+
+
+class ModelRequestHandler(BaseHTTPRequestHandler):
+    server_version = "VideoNotesModelServer/1.0"
+
+    def log_message(self, format, *args):
+        pass  # Keep the console for model status messages
+
+    def send_json(self, payload, code=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/status':
+            self.send_json(self.server.model_server.status())
+        else:
+            self.send_json({'error': 'not found'}, 404)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        model_server = self.server.model_server
+        try:
+            if path == '/transcribe':
+                audio = np.frombuffer(self.read_body(), dtype=np.float32)
+                options = self.headers.get('X-Transcribe-Options')
+                options = json.loads(options) if options else {}
+                self.send_json({'segments': model_server.transcribe(audio, options)})
+            elif path == '/summarize':
+                request = json.loads(self.read_body().decode('utf-8'))
+                params = {k: v for k, v in request.get('params', {}).items() if k in SUMMARY_PARAMS}
+                self.send_json({'summaries': model_server.summarize(request['chunks'], params)})
+            else:
+                self.send_json({'error': 'not found'}, 404)
+        except Exception as e:
+            self.send_json({'error': str(e)}, 500)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Share one set of transcription and summarization models between converters."
+    )
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f"localhost port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--mode', choices=['offline', 'online'], default='offline',
+                        help="serve the models of the offline or the online converter")
+    parser.add_argument('--summary-model', default=None,
+                        help="summarization model to serve (default: from the config)")
+    parser.add_argument('--summary-runtime', choices=['torch', 'int8', 'ctranslate2'], default='torch',
+                        help="run the summarizer in float32, dynamic int8 or as a CTranslate2 export (default: torch)")
+    parser.add_argument('--cpu-partition', action='store_true',
+                        help="split the cores between transcription and summarization and size "
+                             "their thread pools to match")
+    parser.add_argument('--cpu-cores', type=int, default=None,
+                        help="--cpu-partition: cores to split (default: all available)")
+    parser.add_argument('--asr-core-share', type=float, default=0.75,
+                        help="--cpu-partition: share of the cores given to transcription (default: 0.75)")
+    parser.add_argument('--pin-cpus', action='store_true',
+                        help="--cpu-partition: also keep each stage on its own cores (Linux)")
+    parser.add_argument('--batch-size', type=int, default=8,
+                        help="chunks summarized per model call across clients (default: 8)")
+    parser.add_argument('--batch-wait-ms', type=float, default=50,
+                        help="how long to wait for more requests to fill a batch (default: 50)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = dict(ONLINE_CONFIG if args.mode == 'online' else DEFAULT_CONFIG,
+                  summary_runtime=args.summary_runtime,
+                  cpu_partition=args.cpu_partition,
+                  cpu_cores=args.cpu_cores,
+                  asr_core_share=args.asr_core_share,
+                  cpu_pinning=args.pin_cpus)
+    if args.summary_model:
+        config['summary_model'] = args.summary_model
+    model_server = ModelServer(config, args.batch_size, args.batch_wait_ms / 1000)
+    model_server.engine.load_models()
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', args.port), ModelRequestHandler)
+    httpd.daemon_threads = True
+    httpd.model_server = model_server
+    print(f"Model server listening on http://127.0.0.1:{args.port}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+import os
+import struct
+import tempfile
+import threading
+import zlib
+
+# Page geometry in mm, matching FPDF's A4 defaults
+PAGE_WIDTH = 210.0
+PAGE_HEIGHT = 297.0
+MARGIN = 10.0
+BOTTOM_MARGIN = 15.0
+CELL_MARGIN = MARGIN / 10
+POINTS_PER_MM = 72 / 25.4
+
+# Sanitizes text for the latin-1 fonts in one str.translate/encode pass:
+# typographic punctuation becomes its closest ASCII equivalent, control
+# characters become spaces, and anything else outside latin-1 becomes '?'
+# in the encode step.
+TEXT_TABLE = {code: ' ' for code in range(32) if code != ord('\n')}
+TEXT_TABLE.update({code: '?' for code in range(0x7F, 0xA0)})
+TEXT_TABLE.update({
+    ord('\r'): None,
+    ord('\u2018'): "'", ord('\u2019'): "'", ord('\u201a'): "'",
+    ord('\u201c'): '"', ord('\u201d'): '"', ord('\u201e'): '"',
+    ord('\u2013'): '-', ord('\u2014'): '-', ord('\u2212'): '-',
+    ord('\u2026'): '...', ord('\u2022'): '-',
+    ord('\u00ad'): None, ord('\u200b'): None, ord('\ufeff'): None,
+})
+
+
+def sanitize_text(text):
+    """Return text as latin-1 bytes the PDF fonts can show"""
+    return text.translate(TEXT_TABLE).encode('latin-1', 'replace')
+
+
+# Helvetica advance widths (1/1000 em) for latin-1; 0x7F-0x9F are never drawn
+HELVETICA_WIDTHS = (
+    [0] * 32
+    + [278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278]
+    + [556] * 10
+    + [278, 278, 584, 584, 584, 556, 1015]
+    + [667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778, 667,
+       778, 722, 667, 611, 722, 667, 944, 667, 667, 611]
+    + [278, 278, 278, 469, 556, 333]
+    + [556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556, 556,
+       556, 333, 500, 278, 556, 500, 722, 500, 500, 500]
+    + [334, 260, 334, 584]
+    + [556] * 33
+    + [278, 333, 556, 556, 556, 556, 260, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+       400, 584, 333, 333, 333, 556, 537, 278, 333, 333, 365, 556, 834, 834, 834, 611]
+    + [667] * 6 + [1000, 722] + [667] * 4 + [278] * 4
+    + [722, 722] + [778] * 5 + [584, 778] + [722] * 4 + [667, 667, 611]
+    + [556] * 6 + [889, 500] + [556] * 4 + [278] * 4
+    + [556, 556] + [556] * 5 + [584, 611] + [556] * 4 + [500, 556, 500]
+)
+
+# Helvetica-Bold advance widths, laid out the same way
+HELVETICA_BOLD_WIDTHS = (
+    [0] * 32
+    + [278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278]
+    + [556] * 10
+    + [333, 333, 584, 584, 584, 611, 975]
+    + [722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778, 667,
+       778, 722, 667, 611, 722, 667, 944, 667, 667, 611]
+    + [333, 278, 333, 584, 556, 333]
+    + [556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611, 611,
+       611, 389, 556, 333, 611, 556, 778, 556, 556, 500]
+    + [389, 280, 389, 584]
+    + [556] * 33
+    + [278, 333, 556, 556, 556, 556, 280, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+       400, 584, 333, 333, 333, 611, 556, 278, 333, 333, 365, 556, 834, 834, 834, 611]
+    + [722] * 6 + [1000, 722] + [667] * 4 + [278] * 4
+    + [722, 722] + [778] * 5 + [584, 778] + [722] * 4 + [667, 667, 611]
+    + [556] * 6 + [889, 556] + [556] * 4 + [278] * 4
+    + [611, 611] + [611] * 5 + [584, 611] + [611] * 4 + [556, 611, 556]
+)
+
+
+class CoreFont:
+    """The built-in Helvetica (FPDF's 'Arial'); nothing to embed"""
+
+    def __init__(self, bold=False):
+        self.base_font = 'Helvetica-Bold' if bold else 'Helvetica'
+        self.widths = HELVETICA_BOLD_WIDTHS if bold else HELVETICA_WIDTHS
+
+    def write(self, pdf):
+        return pdf.add_object(
+            f"<</Type /Font /Subtype /Type1 /BaseFont /{self.base_font} /Encoding /WinAnsiEncoding>>".encode()
+        )
+
+
+class TrueTypeFont:
+    """A TrueType font embedded as a latin-1 simple font.
+
+    Only the glyphs for character codes 32-255 are kept in the embedded
+    program. Parsing and subsetting happen once per font file; the result is
+    shared by every document that uses the font (see load_font).
+    """
+
+    # Tables a PDF viewer needs to render an embedded TrueType font
+    KEEP_TABLES = ('OS/2', 'cmap', 'cvt ', 'fpgm', 'glyf', 'head', 'hhea', 'hmtx', 'loca', 'maxp', 'prep')
+
+    def __init__(self, name, path):
+        self.name = name
+        with open(path, 'rb') as f:
+            data = f.read()
+        tables = self.read_tables(data)
+
+        units_per_em = struct.unpack('>H', tables['head'][18:20])[0]
+        x_min, y_min, x_max, y_max = struct.unpack('>4h', tables['head'][36:44])
+        long_loca = struct.unpack('>h', tables['head'][50:52])[0] == 1
+        ascent, descent = struct.unpack('>hh', tables['hhea'][4:8])
+        metric_count = struct.unpack('>H', tables['hhea'][34:36])[0]
+        glyph_count = struct.unpack('>H', tables['maxp'][4:6])[0]
+
+        # hmtx holds (advance width, left side bearing) pairs
+        advances = struct.unpack(f'>{2 * metric_count}H', tables['hmtx'][:4 * metric_count])[::2]
+        glyphs = self.map_characters(tables['cmap'], range(32, 256))
+
+        def scale(value):
+            return int(round(value * 1000 / units_per_em))
+
+        def advance(glyph):
+            return advances[min(glyph, metric_count - 1)]
+
+        self.widths = [0] * 32 + [scale(advance(glyphs[code])) for code in range(32, 256)]
+        self.missing_width = scale(advance(0))
+        self.bbox = [scale(v) for v in (x_min, y_min, x_max, y_max)]
+        self.ascent = scale(ascent)
+        self.descent = scale(descent)
+        self.cap_height = self.ascent
+        os2 = tables.get('OS/2')
+        if os2 and len(os2) >= 90 and struct.unpack('>H', os2[:2])[0] >= 2:
+            self.cap_height = scale(struct.unpack('>h', os2[88:90])[0])
+
+        if long_loca:
+            offsets = struct.unpack(f'>{glyph_count + 1}I', tables['loca'][:4 * (glyph_count + 1)])
+        else:
+            offsets = [2 * v for v in struct.unpack(f'>{glyph_count + 1}H', tables['loca'][:2 * (glyph_count + 1)])]
+        program = self.subset(tables, offsets, glyph_count, {0, *glyphs.values()})
+        self.length1 = len(program)
+        self.program = zlib.compress(program)
+
+    @staticmethod
+    def read_tables(data):
+        table_count = struct.unpack('>H', data[4:6])[0]
+        tables = {}
+        for i in range(table_count):
+            tag, _, offset, length = struct.unpack('>4sIII', data[12 + 16 * i:28 + 16 * i])
+            tables[tag.decode('latin-1')] = data[offset:offset + length]
+        return tables
+
+    @staticmethod
+    def map_characters(cmap, codes):
+        """Map character codes to glyph ids with the font's Unicode (format 4) cmap"""
+        subtable = None
+        for i in range(struct.unpack('>H', cmap[2:4])[0]):
+            platform, encoding, offset = struct.unpack('>HHI', cmap[4 + 8 * i:12 + 8 * i])
+            if (platform == 3 and encoding == 1) or platform == 0:
+                if struct.unpack('>H', cmap[offset:offset + 2])[0] == 4:
+                    subtable = offset
+                    break
+        if subtable is None:
+            raise Exception("Font has no Unicode character map")
+
+        segments = struct.unpack('>H', cmap[subtable + 6:subtable + 8])[0] // 2
+        position = subtable + 14
+
+        def read_array(fmt):
+            nonlocal position
+            values = struct.unpack(f'>{segments}{fmt}', cmap[position:position + 2 * segments])
+            position += 2 * segments
+            return values
+
+        ends = read_array('H')
+        position += 2  # reservedPad
+        starts = read_array('H')
+        deltas = read_array('h')
+        range_offsets_at = position
+        range_offsets = read_array('H')
+
+        glyphs = {}
+        for code in codes:
+            glyph = 0
+            segment = next((i for i, end in enumerate(ends) if end >= code), None)
+            if segment is not None and starts[segment] <= code:
+                if range_offsets[segment] == 0:
+                    glyph = (code + deltas[segment]) & 0xFFFF
+                else:
+                    at = (range_offsets_at + 2 * segment + range_offsets[segment]
+                          + 2 * (code - starts[segment]))
+                    glyph = struct.unpack('>H', cmap[at:at + 2])[0]
+                    if glyph:
+                        glyph = (glyph + deltas[segment]) & 0xFFFF
+            glyphs[code] = glyph
+        return glyphs
+
+    def subset(self, tables, offsets, glyph_count, keep):
+        """Empty every glyph outside keep (and their components); glyph ids stay the same"""
+        glyf = tables['glyf']
+        pending = list(keep)
+        while pending:
+            glyph = pending.pop()
+            data = glyf[offsets[glyph]:offsets[glyph + 1]]
+            if len(data) < 10 or struct.unpack('>h', data[:2])[0] >= 0:
+                continue
+            # Composite glyph: walk its components
+            at = 10
+            while True:
+                flags, component = struct.unpack('>HH', data[at:at + 4])
+                if component not in keep:
+                    keep.add(component)
+                    pending.append(component)
+                at += 4 + (4 if flags & 0x0001 else 2)
+                if flags & 0x0008:
+                    at += 2
+                elif flags & 0x0040:
+                    at += 4
+                elif flags & 0x0080:
+                    at += 8
+                if not flags & 0x0020:
+                    break
+
+        new_glyf = []
+        new_offsets = [0]
+        for glyph in range(glyph_count):
+            if glyph in keep:
+                data = glyf[offsets[glyph]:offsets[glyph + 1]]
+                data += b'\0' * (-len(data) % 4)
+                new_glyf.append(data)
+                new_offsets.append(new_offsets[-1] + len(data))
+            else:
+                new_offsets.append(new_offsets[-1])
+
+        tables = {tag: data for tag, data in tables.items() if tag in self.KEEP_TABLES}
+        tables['glyf'] = b''.join(new_glyf)
+        tables['loca'] = struct.pack(f'>{len(new_offsets)}I', *new_offsets)
+        # Long loca offsets, checkSumAdjustment filled in below
+        head = bytearray(tables['head'])
+        head[8:12] = b'\0\0\0\0'
+        head[50:52] = struct.pack('>h', 1)
+        tables['head'] = bytes(head)
+        return self.build_font(tables)
+
+    @staticmethod
+    def checksum(data):
+        data += b'\0' * (-len(data) % 4)
+        return sum(struct.unpack(f'>{len(data) // 4}I', data)) & 0xFFFFFFFF
+
+    def build_font(self, tables):
+        tags = sorted(tables)
+        selector = max(i for i in range(16) if 2 ** i <= len(tags))
+        search_range = 2 ** selector * 16
+        header = struct.pack('>IHHHH', 0x00010000, len(tags), search_range, selector,
+                             len(tags) * 16 - search_range)
+
+        directory = []
+        body = []
+        offset = len(header) + 16 * len(tags)
+        for tag in tags:
+            data = tables[tag]
+            directory.append(struct.pack('>4sIII', tag.encode('latin-1'), self.checksum(data), offset, len(data)))
+            data += b'\0' * (-len(data) % 4)
+            body.append(data)
+            offset += len(data)
+
+        font = bytearray(header + b''.join(directory) + b''.join(body))
+        head_at = len(header) + 16 * len(tags) + sum(len(data) for data in body[:tags.index('head')])
+        adjustment = (0xB1B0AFBA - self.checksum(bytes(font))) & 0xFFFFFFFF
+        font[head_at + 8:head_at + 12] = struct.pack('>I', adjustment)
+        return bytes(font)
+
+    def write(self, pdf):
+        program_id = pdf.add_stream(self.program, f"/Filter /FlateDecode /Length1 {self.length1}".encode())
+        base_font = f"/AAAAAA+{self.name}"
+        descriptor_id = pdf.add_object(
+            f"<</Type /FontDescriptor /FontName {base_font} /Flags 32"
+            f" /FontBBox [{' '.join(map(str, self.bbox))}] /ItalicAngle 0"
+            f" /Ascent {self.ascent} /Descent {self.descent} /CapHeight {self.cap_height}"
+            f" /StemV 80 /MissingWidth {self.missing_width} /FontFile2 {program_id} 0 R>>".encode()
+        )
+        return pdf.add_object(
+            f"<</Type /Font /Subtype /TrueType /BaseFont {base_font} /FirstChar 32 /LastChar 255"
+            f" /Widths [{' '.join(map(str, self.widths[32:]))}]"
+            f" /FontDescriptor {descriptor_id} 0 R /Encoding /WinAnsiEncoding>>".encode()
+        )
+
+
+_fonts = {}
+_fonts_lock = threading.Lock()
+
+
+def load_font(name, path, bold=False):
+    """Return the parsed font for path, parsing it only the first time.
+
+    Without a font file this is the built-in Helvetica, or Helvetica-Bold
+    when bold is set; a font file is used as it is.
+    """
+    if not name or not path or not os.path.exists(path):
+        name, path = None, None
+    stat = os.stat(path) if path else None
+    key = (name, path, stat and stat.st_mtime, stat and stat.st_size, not path and bold)
+    with _fonts_lock:
+        font = _fonts.get(key)
+        if font is None:
+            font = TrueTypeFont(name, path) if path else CoreFont(bold)
+            _fonts[key] = font
+        return font
+
+
+def escape(data):
+    return data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+class StreamingPdf:
+    """A text-only PDF written to disk one page at a time.
+
+    Laid out like FPDF's cell/multi_cell with the default margins and
+    automatic page breaks. Each finished page is compressed and written to a
+    temporary file straight away, so memory use stays at one page no matter
+    how long the document gets. output() copies the finished file into place.
+    Headings use bold_font when one is given and the regular font otherwise.
+    """
+
+    def __init__(self, font, bold_font=None):
+        self.fonts = {b'/F1': font, b'/F2': bold_font or font}
+        self.font = font
+        self.font_name = b'/F1'
+        self.file = tempfile.TemporaryFile()
+        self.offsets = {}
+        self.next_id = 3  # 1 and 2 are the catalog and page tree, written last
+        self.page_ids = []
+        self.ops = []
+        self.font_size = 12
+        self.y = MARGIN
+        self.finished = False
+        self.info = {}  # document information entries, e.g. {'Title': ...}
+
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        font_id = font.write(self)
+        bold_id = bold_font.write(self) if bold_font and bold_font is not font else font_id
+        self.font_resources = f"/F1 {font_id} 0 R /F2 {bold_id} 0 R"
+        self.add_page()
+
+    def add_object(self, body, object_id=None):
+        if object_id is None:
+            object_id = self.next_id
+            self.next_id += 1
+        self.offsets[object_id] = self.file.tell()
+        self.file.write(f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n")
+        return object_id
+
+    def add_stream(self, data, params=b""):
+        return self.add_object(
+            b"<<" + params + f" /Length {len(data)}>>\nstream\n".encode() + data + b"\nendstream"
+        )
+
+    def add_page(self):
+        self.flush_page()
+        self.page_ids.append(None)
+        self.y = MARGIN
+
+    def flush_page(self):
+        """Write the current page to the file and forget its content"""
+        if not self.page_ids:
+            return
+        content_id = self.add_stream(zlib.compress(b"\n".join(self.ops)), b"/Filter /FlateDecode")
+        self.ops = []
+        self.page_ids[-1] = self.add_object(
+            f"<</Type /Page /Parent 2 0 R"
+            f" /MediaBox [0 0 {PAGE_WIDTH * POINTS_PER_MM:.2f} {PAGE_HEIGHT * POINTS_PER_MM:.2f}]"
+            f" /Resources <</Font <<{self.font_resources}>>>> /Contents {content_id} 0 R>>".encode()
+        )
+
+    def set_font(self, size, bold=False):
+        self.font_name = b'/F2' if bold else b'/F1'
+        self.font = self.fonts[self.font_name]
+        self.font_size = size
+
+    def text_width(self, data):
+        """Width in mm of latin-1 bytes at the current font size"""
+        widths = self.font.widths
+        return sum(widths[code] for code in data) * self.font_size / 1000 / POINTS_PER_MM
+
+    def draw_line(self, x, height, data):
+        if self.y + height > PAGE_HEIGHT - BOTTOM_MARGIN:
+            self.add_page()
+        if data:
+            baseline = self.y + 0.5 * height + 0.3 * self.font_size / POINTS_PER_MM
+            self.ops.append(
+                b"BT " + self.font_name + f" {self.font_size:.2f} Tf {x * POINTS_PER_MM:.2f}"
+                f" {(PAGE_HEIGHT - baseline) * POINTS_PER_MM:.2f} Td (".encode()
+                + escape(data) + b") Tj ET"
+            )
+        self.y += height
+
+    def cell_centered(self, height, text):
+        """One centered line across the page, like cell(0, h, text, ln=True, align='C')"""
+        data = sanitize_text(text)
+        x = MARGIN + (PAGE_WIDTH - 2 * MARGIN - self.text_width(data)) / 2
+        self.draw_line(x, height, data)
+
+    def ln(self, height):
+        self.y += height
+
+    def multi_cell(self, height, text):
+        """Word-wrapped lines across the page, like multi_cell(0, h, text)"""
+        data = sanitize_text(text)
+        x = MARGIN + CELL_MARGIN
+        max_width = (PAGE_WIDTH - 2 * MARGIN - 2 * CELL_MARGIN) * POINTS_PER_MM * 1000 / self.font_size
+        widths = self.font.widths
+        space = widths[32]
+
+        word_widths = {}  # transcripts repeat the same words over and over
+
+        line = []
+        line_width = 0
+        for word in data.split(b' '):
+            word_width = word_widths.get(word)
+            if word_width is None:
+                word_width = word_widths[word] = sum(map(widths.__getitem__, word))
+            if line and line_width + space + word_width > max_width:
+                self.draw_line(x, height, b' '.join(line))
+                line, line_width = [], 0
+            while word_width > max_width:
+                # A word wider than the page is broken wherever it overflows
+                cut, cut_width = 0, 0
+                while cut < len(word) and cut_width + widths[word[cut]] <= max_width:
+                    cut_width += widths[word[cut]]
+                    cut += 1
+                cut = max(cut, 1)
+                self.draw_line(x, height, word[:cut])
+                word = word[cut:]
+                word_width = sum(widths[code] for code in word)
+            if line:
+                line_width += space
+            line.append(word)
+            line_width += word_width
+        self.draw_line(x, height, b' '.join(line))
+
+    def finish(self):
+        if self.finished:
+            return
+        self.flush_page()
+        kids = ' '.join(f"{page_id} 0 R" for page_id in self.page_ids)
+        self.add_object(f"<</Type /Pages /Kids [{kids}] /Count {len(self.page_ids)}>>".encode(), 2)
+        self.add_object(b"<</Type /Catalog /Pages 2 0 R>>", 1)
+        info = b""
+        if self.info:
+            entries = b"".join(
+                f"/{key} (".encode() + escape(sanitize_text(str(value))) + b")" for key, value in self.info.items()
+            )
+            info = f" /Info {self.add_object(b'<<' + entries + b'>>')} 0 R".encode()
+
+        xref_at = self.file.tell()
+        entries = [b"0000000000 65535 f \n"]
+        entries.extend(f"{self.offsets[i]:010d} 00000 n \n".encode() for i in range(1, self.next_id))
+        self.file.write(f"xref\n0 {self.next_id}\n".encode() + b"".join(entries))
+        self.file.write(f"trailer\n<</Size {self.next_id} /Root 1 0 R".encode() + info
+                        + f">>\nstartxref\n{xref_at}\n%%EOF\n".encode())
+        self.finished = True
+
+    def output(self, filename):
+        """Finish the document and copy it to filename"""
+        self.finish()
+        self.file.seek(0)
+        with open(filename, 'wb') as f:
+            while True:
+                block = self.file.read(1024 * 1024)
+                if not block:
+                    break
+                f.write(block)
+
+    def close(self):
+        self.file.close()
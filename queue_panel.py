@@ -0,0 +1,118 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from converter_engine import validate_youtube_url
+from job_queue import RUNNING, DONE, FAILED
+
+
+class QueuePanel(ttk.LabelFrame):
+    """Job list and controls for a JobQueue.
+
+    Everything here runs on the Tk thread: the list is redrawn from a
+    snapshot of the queue twice a second instead of being pushed to from
+    the job threads.
+    """
+
+    def __init__(self, parent, job_queue, options_callback=None, progress_callback=None):
+        super().__init__(parent, text="Job Queue", padding=5)
+        self.job_queue = job_queue
+        self.options_callback = options_callback    # options for newly added jobs
+        self.progress_callback = progress_callback  # overall progress of the queue
+
+        columns = (('video', "Video", 110), ('status', "Status", 300), ('output', "Output", 150))
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in columns], show='headings', height=6)
+        for column, heading, width in columns:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor=tk.W)
+        self.tree.grid(row=0, column=0, columnspan=6, sticky=(tk.W, tk.E))
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        scrollbar.grid(row=0, column=6, sticky=(tk.N, tk.S))
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        ttk.Button(self, text="Add from file...", command=self.add_from_file).grid(row=1, column=0, pady=5)
+        ttk.Button(self, text="Retry", command=self.retry_selected).grid(row=1, column=1, pady=5)
+        ttk.Button(self, text="Remove", command=self.remove_selected).grid(row=1, column=2, pady=5)
+        ttk.Button(self, text="Clear finished", command=self.job_queue.clear_finished).grid(row=1, column=3, pady=5)
+
+        ttk.Label(self, text="Parallel jobs:").grid(row=1, column=4, sticky=tk.E)
+        self.parallel_var = tk.StringVar(value=str(job_queue.max_running))
+        parallel = ttk.Spinbox(self, from_=1, to=8, width=4, textvariable=self.parallel_var,
+                               command=self.set_parallel)
+        parallel.grid(row=1, column=5, sticky=tk.W)
+        parallel.bind('<Return>', lambda event: self.set_parallel())
+        parallel.bind('<FocusOut>', lambda event: self.set_parallel())
+
+        self.last_progress = None
+        self.after(500, self.refresh)
+
+    def add_urls(self, urls):
+        """Queue every valid URL; returns the URLs that were rejected as invalid"""
+        options = self.options_callback() if self.options_callback else {}
+        invalid = [url for url in urls if not validate_youtube_url(url)]
+        for url in urls:
+            if url not in invalid:
+                self.job_queue.add(url, dict(options))
+        return invalid
+
+    def add_from_file(self):
+        path = filedialog.askopenfilename(
+            title="Add URLs from file",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        with open(path, encoding='utf-8') as f:
+            urls = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+        invalid = self.add_urls(urls)
+        if invalid:
+            messagebox.showwarning("Invalid URLs", "Skipped invalid YouTube URLs:\n" + "\n".join(invalid[:20]))
+
+    def retry_selected(self):
+        for entry_id in self.tree.selection():
+            self.job_queue.retry(entry_id)
+
+    def remove_selected(self):
+        for entry_id in self.tree.selection():
+            self.job_queue.remove(entry_id)
+
+    def set_parallel(self):
+        try:
+            max_running = int(self.parallel_var.get())
+        except ValueError:
+            max_running = self.job_queue.max_running
+        self.parallel_var.set(str(max(1, max_running)))
+        if max_running != self.job_queue.max_running:
+            self.job_queue.set_max_running(max_running)
+
+    def describe(self, entry):
+        if entry['status'] == RUNNING and entry['progress']:
+            return entry['progress'][0]
+        if entry['status'] == FAILED:
+            return f"failed: {entry['error']}"
+        return entry['status']
+
+    def refresh(self):
+        entries = self.job_queue.snapshot()
+        ids = set()
+        for entry in entries:
+            ids.add(entry['id'])
+            values = (entry['video_id'], self.describe(entry), entry['output_file'])
+            if self.tree.exists(entry['id']):
+                self.tree.item(entry['id'], values=values)
+            else:
+                self.tree.insert('', tk.END, iid=entry['id'], values=values)
+        for entry_id in self.tree.get_children():
+            if entry_id not in ids:
+                self.tree.delete(entry_id)
+
+        # Overall progress: finished jobs plus the running ones' share
+        if self.progress_callback and entries:
+            finished = sum(1 for entry in entries if entry['status'] in (DONE, FAILED))
+            running = sum(entry['progress'][1] / 100 for entry in entries
+                          if entry['status'] == RUNNING and entry['progress'])
+            progress = (f"{finished} of {len(entries)} jobs finished", (finished + running) / len(entries) * 100)
+            if progress != self.last_progress:
+                self.progress_callback(*progress)
+                self.last_progress = progress
+
+        self.after(500, self.refresh)
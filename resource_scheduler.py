@@ -0,0 +1,93 @@
+import os
+from contextlib import contextmanager, nullcontext
+
+# Stages that get a share of the cores
+STAGES = ('asr', 'summary')
+
+
+def available_cpus():
+    """CPU ids this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def can_pin():
+    return hasattr(os, 'sched_setaffinity')
+
+
+class ResourceScheduler:
+    """Splits the CPU cores between the transcription and summarization stages.
+
+    Each stage gets its own core budget: asr_core_share of the cores go to
+    ASR and the rest to the summarizer (each stage gets at least one). The
+    thread pools of CTranslate2, torch and the tokenizers are sized from
+    those budgets instead of each taking every core, so the two stages of
+    one job, and the stages of several jobs running at once, stop competing
+    for the same cores. The models are shared by every job on the engine,
+    so the total stays within the budget however many jobs are running.
+
+    With pin=True each stage also runs on a CPU set of its own: the thread
+    that loads or calls a stage's model is moved to the stage's cores for
+    the duration, and thread pools started from it inherit them. Pinning
+    needs os.sched_setaffinity (Linux); elsewhere it is skipped.
+    """
+
+    def __init__(self, cores=None, asr_share=0.75, pin=False):
+        cpus = available_cpus()
+        if cores:
+            cpus = cpus[:cores]
+        self.cpus = cpus
+        self.pin = pin and can_pin()
+
+        asr_cores = min(len(cpus), max(1, int(round(len(cpus) * asr_share))))
+        # With a single core both stages share it
+        self.cpu_sets = {
+            'asr': cpus[:asr_cores],
+            'summary': cpus[asr_cores:] or cpus[-1:],
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config['cpu_cores'], config['asr_core_share'], config['cpu_pinning'])
+
+    def cores(self, stage):
+        return len(self.cpu_sets[stage])
+
+    def describe(self):
+        layout = ", ".join(f"{stage} {self.cores(stage)}" for stage in STAGES)
+        pinned = " (pinned)" if self.pin else ""
+        return f"CPU cores: {layout} of {len(self.cpus)}{pinned}"
+
+    def thread_settings(self, config):
+        """Engine config values for the thread pools of each stage"""
+        workers = max(config['num_workers'], config['asr_workers'])
+        summary_threads = self.cores('summary')
+        if config['asr_backend'] == 'transformers' and config['summary_runtime'] != 'ctranslate2':
+            # torch keeps one thread count per process, so both stages share their cores
+            summary_threads += self.cores('asr')
+        return {
+            # faster-whisper runs one model replica per worker, each with its own threads
+            'asr_threads_per_worker': max(1, self.cores('asr') // workers),
+            'summary_threads': summary_threads,
+        }
+
+    def configure_tokenizers(self):
+        """Size the tokenizers' thread pool; read once, before the first tokenizer loads"""
+        os.environ.setdefault('RAYON_NUM_THREADS', str(self.cores('summary')))
+
+    def pinned(self, stage):
+        """Context that keeps the calling thread on the stage's CPU set"""
+        if not self.pin:
+            return nullcontext()
+        return self.run_on(self.cpu_sets[stage])
+
+    @contextmanager
+    def run_on(self, cpus):
+        # pid 0 is the calling thread, not the whole process
+        previous = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, cpus)
+        try:
+            yield
+        finally:
+            os.sched_setaffinity(0, previous)
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+def make_cache_key(*parts):
+    """Hash any JSON-serializable parts into a stable cache key"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Small SQLite key -> text store with a byte budget and LRU eviction.
+
+    Used for results that are expensive to recompute, such as transcripts.
+    Every read refreshes the entry's last-used time, and every write evicts
+    the least recently used entries until the stored text fits in max_bytes.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as db:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                'size INTEGER NOT NULL, last_used REAL NOT NULL)'
+            )
+            db.execute('CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)')
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call keeps the cache usable from any thread
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def get(self, key):
+        with self.lock, self._connect() as db:
+            row = db.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            db.execute('UPDATE entries SET last_used = ? WHERE key = ?', (time.time(), key))
+            return row[0]
+
+    def put(self, key, value):
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        with self.lock, self._connect() as db:
+            db.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, last_used) VALUES (?, ?, ?, ?)',
+                (key, value, size, time.time())
+            )
+            self._evict(db)
+
+    def _evict(self, db):
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in db.execute('SELECT key, size FROM entries ORDER BY last_used').fetchall():
+            db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def total_bytes(self):
+        with self.lock, self._connect() as db:
+            return db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
@@ -0,0 +1,133 @@
+import subprocess
+import sys
+import threading
+from collections import deque
+
+import numpy as np
+
+from audio_decoder import SAMPLE_RATE
+
+READ_SIZE = 64 * 1024
+
+# Last lines of a process's stderr kept for the error message
+STDERR_LINES = 20
+
+
+class AudioStream:
+    """Pipe a yt-dlp download straight into one ffmpeg decoder.
+
+    yt-dlp writes the selected audio stream to stdout; a pump thread copies
+    those bytes into ffmpeg's stdin (and into copy_path, so the compressed
+    audio can be cached once complete). ffmpeg emits 16 kHz mono float32 PCM,
+    which windows() hands out window_size seconds at a time while the rest is
+    still downloading.
+    """
+
+    def __init__(self, url, audio_format, window_size, copy_path=None, download_args=None):
+        self.url = url
+        self.audio_format = audio_format
+        self.window_size = window_size
+        self.copy_path = copy_path
+        self.download_args = download_args or []
+        self.complete = False
+        self.pump_error = None
+
+    def windows(self):
+        """Yield (start_time, duration, samples) as the audio arrives"""
+        downloader = subprocess.Popen(
+            [sys.executable, '-m', 'yt_dlp', '--quiet', '--no-warnings', '--no-part',
+             '-f', self.audio_format, *self.download_args, '-o', '-', self.url],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        decoder = subprocess.Popen(
+            ['ffmpeg', '-loglevel', 'error', '-i', 'pipe:0',
+             '-f', 'f32le', '-acodec', 'pcm_f32le', '-ar', str(SAMPLE_RATE), '-ac', '1', 'pipe:1'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        pump = threading.Thread(target=self.pump, args=(downloader, decoder), daemon=True)
+        pump.start()
+        # A damaged stream makes ffmpeg log an error per packet, long before stdout ends
+        downloader_drain, downloader_log = self.drain_stderr(downloader)
+        decoder_drain, decoder_log = self.drain_stderr(decoder)
+
+        window_bytes = int(self.window_size * SAMPLE_RATE) * 4  # float32
+        start_time = 0.0
+        try:
+            while True:
+                data = self.read_exactly(decoder.stdout, window_bytes)
+                if not data:
+                    break
+                samples = np.frombuffer(data[:len(data) - len(data) % 4], dtype=np.float32)
+                duration = len(samples) / SAMPLE_RATE
+                yield start_time, duration, samples
+                start_time += duration
+                if len(data) < window_bytes:
+                    break
+
+            pump.join()
+            downloader.wait()
+            decoder.wait()
+            downloader_drain.join()
+            decoder_drain.join()
+            if downloader.returncode != 0 or self.pump_error:
+                error = '\n'.join(downloader_log).strip()
+                raise Exception(f"Failed to download audio: {error or self.pump_error}")
+            if decoder.returncode != 0:
+                error = '\n'.join(decoder_log).strip()
+                raise Exception(f"Failed to decode audio: {error}")
+            if start_time == 0:
+                raise Exception("No audio could be decoded from the download")
+            self.complete = True
+
+        finally:
+            # Stop both processes if the consumer gave up early
+            for process in (downloader, decoder):
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+
+    def drain_stderr(self, process):
+        """Read a process's stderr on a thread so the process never blocks on a full pipe.
+
+        Returns the thread and a deque that keeps the last lines for error messages.
+        """
+        lines = deque(maxlen=STDERR_LINES)
+
+        def run():
+            for line in iter(process.stderr.readline, b''):
+                lines.append(line.decode('utf-8', 'replace').rstrip())
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread, lines
+
+    def pump(self, downloader, decoder):
+        copy = open(self.copy_path, 'wb') if self.copy_path else None
+        try:
+            while True:
+                block = downloader.stdout.read(READ_SIZE)
+                if not block:
+                    break
+                decoder.stdin.write(block)
+                if copy:
+                    copy.write(block)
+        except Exception as e:
+            self.pump_error = e
+        finally:
+            if copy:
+                copy.close()
+            try:
+                decoder.stdin.close()
+            except OSError:
+                pass
+
+    def read_exactly(self, stream, size):
+        parts = []
+        remaining = size
+        while remaining > 0:
+            block = stream.read(remaining)
+            if not block:
+                break
+            parts.append(block)
+            remaining -= len(block)
+        return b''.join(parts)
@@ -0,0 +1,182 @@
+import queue
+import threading
+
+# Marks the end of a stage's output
+DONE = object()
+
+
+class StageCancelled(Exception):
+    """Raised inside a stage when another stage of the pipeline has failed"""
+
+
+class StreamingPipeline:
+    """Overlap transcription, summarization and PDF layout for one job.
+
+    Each stage runs on its own thread, connected by bounded queues:
+
+        audio windows -> ASR -> text queue -> summarizer -> summary queue -> PDF layout
+
+    Finished ASR chunks are summarized while later audio is still being
+    transcribed, and summaries are laid out as they arrive. A full queue
+    blocks its producer, so the slowest stage sets the pace without the
+    faster ones buffering the whole video.
+    """
+
+    def __init__(self, engine, job):
+        self.engine = engine
+        self.job = job
+        queue_size = max(1, job.config['stream_queue_size'])
+        self.text_queue = queue.Queue(maxsize=queue_size)
+        self.summary_queue = queue.Queue(maxsize=queue_size)
+        self.failed = threading.Event()
+        self.errors = []
+        self.transcript_parts = []
+
+    def run(self, audio_windows, total_duration):
+        """Transcribe (start, duration, samples) windows, summarize and lay out the job.
+
+        Returns (transcript, pdf); the caller validates the transcript and
+        writes the PDF.
+        """
+        threads = [
+            threading.Thread(
+                target=self.run_stage,
+                args=(self.transcribe_stage, self.text_queue, audio_windows, total_duration),
+                daemon=True
+            ),
+            threading.Thread(
+                target=self.run_stage,
+                args=(self.summarize_stage, self.summary_queue),
+                daemon=True
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+
+        pdf = None
+        try:
+            pdf = self.layout_stage()
+        except Exception as e:
+            self.fail(e)
+
+        for thread in threads:
+            thread.join()
+
+        if self.errors:
+            raise self.errors[0]
+        return " ".join(part for part in self.transcript_parts if part), pdf
+
+    def run_stage(self, stage, output_queue, *args):
+        try:
+            stage(*args)
+        except StageCancelled:
+            pass
+        except Exception as e:
+            self.fail(e)
+        finally:
+            # Let the next stage finish even if this one failed
+            self.put(output_queue, DONE, force=True)
+
+    def fail(self, error):
+        if not isinstance(error, StageCancelled):
+            self.errors.append(error)
+        self.failed.set()
+
+    def put(self, target_queue, item, force=False):
+        while True:
+            if self.failed.is_set() and not force:
+                raise StageCancelled()
+            try:
+                target_queue.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                if force and self.failed.is_set():
+                    return  # Nobody is left to read it
+
+    def get(self, source_queue):
+        while True:
+            try:
+                return source_queue.get(timeout=0.2)
+            except queue.Empty:
+                if self.failed.is_set():
+                    raise StageCancelled()
+
+    def transcribe_stage(self, audio_windows, total_duration):
+        for text in self.engine.iter_transcribed_windows(audio_windows, total_duration, self.job):
+            self.put(self.text_queue, text)
+
+    def summarize_stage(self):
+        from nltk.tokenize import sent_tokenize
+        engine, job = self.engine, self.job
+        batch_size = max(1, job.config['summary_batch_size'])
+        tail = ""           # text after the last complete sentence
+        pending = None      # unfinished chunk from pack_sentences
+        chunks = []         # packed chunks waiting for a full batch
+
+        while True:
+            text = self.get(self.text_queue)
+            if text is DONE:
+                break
+            self.transcript_parts.append(text)
+            if not text:
+                continue
+
+            sentences = sent_tokenize(f"{tail} {text}".strip())
+            # The last sentence may continue in the next ASR chunk
+            tail = sentences.pop() if sentences else ""
+
+            new_chunks, pending = engine.pack_sentences(sentences, job, pending)
+            chunks.extend(new_chunks)
+            while len(chunks) >= batch_size:
+                self.emit_summaries(chunks[:batch_size])
+                chunks = chunks[batch_size:]
+
+        if self.failed.is_set():
+            return
+
+        new_chunks, pending = engine.pack_sentences(sent_tokenize(tail) if tail else [], job, pending)
+        chunks.extend(new_chunks)
+        chunks.extend(engine.finish_packing(pending, job))
+        for start in range(0, len(chunks), batch_size):
+            self.emit_summaries(chunks[start:start + batch_size])
+
+    def emit_summaries(self, chunks):
+        for summary in self.engine.summarize_level(chunks, self.job):
+            self.put(self.summary_queue, summary)
+
+    def layout_stage(self):
+        """Add summaries to the PDF as they arrive; the caller writes the file"""
+        engine, job = self.engine, self.job
+        hierarchical = job.config['summary_strategy'] == 'hierarchical'
+        pdf = engine.create_pdf(job)
+        summaries = []
+
+        while True:
+            summary = self.get(self.summary_queue)
+            if summary is DONE:
+                break
+            summaries.append(summary)
+
+            # Flat summaries get one "## Part" section each, as in format_summary.
+            # A lone summary has no heading, so the first one waits for a second.
+            if hierarchical or len(summaries) == 1:
+                continue
+            # Each piece ends one newline short so the pieces lay out like one string
+            if len(summaries) == 2:
+                engine.add_pdf_text(pdf, "# Video Summary\n")
+                engine.add_pdf_text(pdf, f"## Part 1\n\n{summaries[0]}\n")
+            engine.add_pdf_text(pdf, f"## Part {len(summaries)}\n\n{summary}\n")
+
+        if self.failed.is_set():
+            pdf.close()
+            return None
+
+        if not summaries:
+            # Too little text to chunk; summarize_text handles the short cases
+            transcript = " ".join(part for part in self.transcript_parts if part)
+            engine.add_pdf_text(pdf, engine.summarize_text(transcript, job))
+        elif hierarchical:
+            engine.add_pdf_text(pdf, engine.format_summary(engine.reduce_summaries(summaries, job)))
+        elif len(summaries) == 1:
+            engine.add_pdf_text(pdf, engine.format_summary(summaries))
+        return pdf
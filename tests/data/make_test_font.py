@@ -0,0 +1,56 @@
+"""Regenerate Test.ttf, the small font the TrueType tests embed.
+
+Needs fontTools (pip install fonttools); the tests themselves only read the
+checked-in file. Run from this directory: python make_test_font.py
+"""
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib.tables._g_l_y_f import Glyph, GlyphComponent
+
+# 'unused' is in no cmap entry, 'ring' is only reachable through 'Aring'
+GLYPH_ORDER = ['.notdef', 'space', 'A', 'B', 'ring', 'Aring', 'unused']
+ADVANCES = {'.notdef': 1024, 'space': 512, 'A': 1400, 'B': 1200, 'ring': 600, 'Aring': 1400, 'unused': 900}
+
+
+def box(width):
+    pen = TTGlyphPen(None)
+    pen.moveTo((50, 0))
+    pen.lineTo((50, 700))
+    pen.lineTo((width - 50, 700))
+    pen.lineTo((width - 50, 0))
+    pen.closePath()
+    return pen.glyph()
+
+
+def composite(*names):
+    glyph = Glyph()
+    glyph.numberOfContours = -1
+    glyph.components = []
+    for x, name in enumerate(names):
+        component = GlyphComponent()
+        component.glyphName = name
+        component.x, component.y = 300 * x, 0
+        component.flags = 0x0001 | 0x0002  # word arguments, xy values
+        glyph.components.append(component)
+    return glyph
+
+
+def main(path='Test.ttf'):
+    builder = FontBuilder(2048, isTTF=True)
+    builder.setupGlyphOrder(GLYPH_ORDER)
+    builder.setupCharacterMap({32: 'space', 65: 'A', 66: 'B', 0xC5: 'Aring'})
+    glyphs = {name: box(1000) for name in GLYPH_ORDER}
+    glyphs['space'] = TTGlyphPen(None).glyph()
+    glyphs['Aring'] = composite('A', 'ring')
+    builder.setupGlyf(glyphs)
+    builder.setupHorizontalMetrics({name: (ADVANCES[name], 50) for name in GLYPH_ORDER})
+    builder.setupHorizontalHeader(ascent=1800, descent=-400)
+    builder.setupNameTable({'familyName': 'Test', 'styleName': 'Regular'})
+    builder.setupOS2(sTypoAscender=1800, sTypoDescender=-400, usWinAscent=1800, usWinDescent=400,
+                     sCapHeight=1400)
+    builder.setupPost()
+    builder.save(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import os
+
+from audio_cache import AudioCache
+
+
+def download(tmp_path, name, size, mtime=None):
+    path = tmp_path / 'downloads' / name
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(b'x' * size)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def age(path, mtime):
+    os.utime(path, (mtime, mtime))
+
+
+def test_put_and_get(tmp_path):
+    cache = AudioCache(str(tmp_path / 'audio'), max_bytes=100)
+    source = download(tmp_path, 'abc.webm', 10)
+    path = cache.put('abc', 'bestaudio', source)
+
+    assert not os.path.exists(source)
+    assert path.endswith('.webm')
+    assert cache.get('abc', 'bestaudio') == path
+    assert cache.get('abc', 'worstaudio') is None
+    assert cache.get('other', 'bestaudio') is None
+
+
+def test_oldest_entries_are_evicted(tmp_path):
+    cache = AudioCache(str(tmp_path / 'audio'), max_bytes=25)
+    first = cache.put('one', 'f', download(tmp_path, 'one.m4a', 10))
+    second = cache.put('two', 'f', download(tmp_path, 'two.m4a', 10))
+    age(first, 1000)
+    age(second, 2000)
+    cache.get('one', 'f')  # Now the most recently used
+
+    cache.put('three', 'f', download(tmp_path, 'three.m4a', 10))
+    assert cache.get('two', 'f') is None
+    assert cache.get('one', 'f') == first
+    assert cache.get('three', 'f') is not None
+
+
+def test_new_entry_is_not_dated_by_the_download(tmp_path):
+    cache = AudioCache(str(tmp_path / 'audio'), max_bytes=35)
+    existing = cache.put('one', 'f', download(tmp_path, 'one.m4a', 10))
+    age(existing, 2000)
+    # yt-dlp dates downloads from the server's Last-Modified header
+    fresh = cache.put('two', 'f', download(tmp_path, 'two.m4a', 10, mtime=1000))
+    cache.put('three', 'f', download(tmp_path, 'three.m4a', 10))
+    cache.put('four', 'f', download(tmp_path, 'four.m4a', 10))
+
+    assert cache.get('two', 'f') == fresh
+    assert cache.get('one', 'f') is None
+
+
+def test_entry_larger_than_the_cache_is_still_returned(tmp_path):
+    cache = AudioCache(str(tmp_path / 'audio'), max_bytes=5)
+    path = cache.put('big', 'f', download(tmp_path, 'big.opus', 10))
+    assert os.path.exists(path)
+
+
+def test_partial_writes_are_ignored(tmp_path):
+    cache = AudioCache(str(tmp_path / 'audio'), max_bytes=100)
+    prefix = cache._prefix('abc', 'f')
+    (tmp_path / 'audio' / f'{prefix}.webm.1234.part').write_bytes(b'x')
+    assert cache.get('abc', 'f') is None
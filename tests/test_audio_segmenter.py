@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from audio_segmenter import SAMPLE_RATE, dedupe_overlap, plan_windows
+
+
+def tone_with_pauses(speech_seconds, pause_seconds, count):
+    """count bursts of noise separated by silences, ending in speech"""
+    rng = np.random.default_rng(0)
+    parts = []
+    for i in range(count):
+        if i:
+            parts.append(np.zeros(int(pause_seconds * SAMPLE_RATE), dtype=np.float32))
+        parts.append(rng.uniform(-0.5, 0.5, int(speech_seconds * SAMPLE_RATE)).astype(np.float32))
+    return np.concatenate(parts)
+
+
+def test_plan_windows_empty_audio():
+    assert plan_windows(np.zeros(0, dtype=np.float32), 30) == []
+
+
+def test_plan_windows_short_audio_is_one_window():
+    samples = tone_with_pauses(10, 1, 2)
+    assert plan_windows(samples, 30) == [(0.0, len(samples) / SAMPLE_RATE)]
+
+
+def test_plan_windows_cuts_in_silences():
+    # 9 s of speech, then 1 s pauses centered at 9.5, 19.5, 29.5, ...
+    samples = tone_with_pauses(9, 1, 10)
+    total = len(samples) / SAMPLE_RATE
+    windows = plan_windows(samples, 20, overlap=1.0)
+
+    assert windows[0][0] == 0.0
+    ends = [start + duration for start, duration in windows]
+    assert ends[-1] == pytest.approx(total)
+    for end in ends[:-1]:
+        # Every cut lands in a pause, not in the middle of speech
+        assert end % 10 == pytest.approx(9.5, abs=0.1)
+    for (start, _), previous_end in zip(windows[1:], ends):
+        assert start == pytest.approx(previous_end - 1.0)
+
+
+def test_plan_windows_without_silence_uses_quietest_frame():
+    rng = np.random.default_rng(1)
+    samples = rng.uniform(-0.5, 0.5, 60 * SAMPLE_RATE).astype(np.float32)
+    quiet = slice(22 * SAMPLE_RATE, int(22.1 * SAMPLE_RATE))
+    samples[quiet] *= 0.5
+    windows = plan_windows(samples, 20, overlap=0.0, min_silence=1.0)
+    first_end = windows[0][0] + windows[0][1]
+    assert 22 <= first_end <= 22.1
+    assert sum(duration for _, duration in windows) == pytest.approx(60)
+
+
+@pytest.mark.parametrize('previous, text, expected', [
+    ("and that is how it works", "how it works. Next we look at", "Next we look at"),
+    ("The End.", "the end of the story", "of the story"),
+    ("nothing in common", "with this text", "with this text"),
+    ("", "first window", "first window"),
+    ("all of it", "All of it!", ""),
+])
+def test_dedupe_overlap(previous, text, expected):
+    assert dedupe_overlap(previous, text) == expected
+
+
+def test_dedupe_overlap_prefers_the_longest_match():
+    # 'a' alone matches too, but the whole 'a b a' run is the overlap
+    assert dedupe_overlap("x a b a", "a b a c") == "c"
+
+
+def test_dedupe_overlap_max_words():
+    previous = " ".join(f"w{i}" for i in range(30))
+    text = " ".join(f"w{i}" for i in range(5, 30)) + " new"
+    assert dedupe_overlap(previous, text, max_words=10) == text
+    assert dedupe_overlap(previous, text, max_words=25) == "new"
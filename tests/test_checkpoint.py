@@ -0,0 +1,86 @@
+import json
+
+from checkpoint import JobCheckpoint
+from converter_engine import ConverterEngine
+
+
+def test_a_new_attempt_resumes_from_the_file(tmp_path):
+    path = str(tmp_path / 'checkpoints' / 'job.jsonl')
+    checkpoint = JobCheckpoint(path)
+    assert checkpoint.chunks == {} and checkpoint.summaries == {}
+    checkpoint.add_chunk(0.0, "first window")
+    checkpoint.add_chunk(29.5, "second window ünïcode")
+    checkpoint.add_summary('abc', "summary of part 1")
+
+    resumed = JobCheckpoint(path)
+    assert resumed.get_chunk(0) == "first window"
+    assert resumed.get_chunk(29.5) == "second window ünïcode"
+    assert resumed.get_chunk(59.0) is None
+    assert resumed.get_summary('abc') == "summary of part 1"
+    assert resumed.get_summary('def') is None
+
+
+def test_window_starts_match_after_float_drift(tmp_path):
+    checkpoint = JobCheckpoint(str(tmp_path / 'job.jsonl'))
+    start = sum([0.1] * 300)  # 29.999999999999...
+    checkpoint.add_chunk(start, "text")
+    assert JobCheckpoint(checkpoint.path).get_chunk(30.0) == "text"
+
+
+def test_a_line_cut_short_is_skipped(tmp_path):
+    path = tmp_path / 'job.jsonl'
+    checkpoint = JobCheckpoint(str(path))
+    checkpoint.add_chunk(0.0, "kept")
+    checkpoint.add_summary('abc', "kept too")
+    # A crash in the middle of a write
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'type': 'chunk', 'start': 30.0, 'text': "lost"})[:20])
+
+    resumed = JobCheckpoint(str(path))
+    assert resumed.chunks == {0.0: "kept"}
+    assert resumed.summaries == {'abc': "kept too"}
+
+
+def test_later_records_win(tmp_path):
+    checkpoint = JobCheckpoint(str(tmp_path / 'job.jsonl'))
+    checkpoint.add_chunk(0.0, "old")
+    checkpoint.add_chunk(0.0, "new")
+    assert JobCheckpoint(checkpoint.path).get_chunk(0.0) == "new"
+
+
+def test_discard_removes_the_file(tmp_path):
+    path = tmp_path / 'job.jsonl'
+    checkpoint = JobCheckpoint(str(path))
+    checkpoint.discard()  # nothing written yet
+    checkpoint.add_chunk(0.0, "text")
+    assert path.exists()
+    checkpoint.discard()
+    assert not path.exists()
+    assert JobCheckpoint(str(path)).chunks == {}
+
+
+def test_a_retry_only_summarizes_the_missing_parts(tmp_path):
+    engine = ConverterEngine({'cache_dir': None, 'auto_tune': False, 'cpu_partition': False,
+                              'model_server': None, 'summary_batch_size': 2})
+    chunks = [f"Text of part {i}." for i in range(1, 5)]
+    calls = []
+
+    def summarizer(batch, **kwargs):
+        calls.append(list(batch))
+        if failing and chunks[2] in batch:
+            raise RuntimeError("out of memory")
+        return [{'summary_text': f"Summary: {chunk}"} for chunk in batch]
+
+    def attempt():
+        job = engine.create_job("https://www.youtube.com/watch?v=abcdefghijk")
+        job.checkpoint = JobCheckpoint(str(tmp_path / 'job.jsonl'))
+        return engine.summarize_chunks(chunks, job)
+
+    engine.summarizer = summarizer
+    failing = True
+    # Parts 3 and 4 fall back to their text and are not checkpointed
+    assert attempt() == ["Summary: Text of part 1.", "Summary: Text of part 2."] + chunks[2:]
+    failing = False
+    calls.clear()
+    assert attempt() == [f"Summary: {chunk}" for chunk in chunks]
+    assert calls == [chunks[2:]]
@@ -0,0 +1,45 @@
+import numpy as np
+
+from extractive_summary import extract_sentences, term_matrix, textrank
+
+SENTENCES = [
+    "Neural networks learn weights from training data.",
+    "My cat likes to sleep in the sun.",
+    "Training data shapes the weights a neural network learns.",
+    "The weather was nice yesterday afternoon.",
+    "Networks trained on more data learn better weights.",
+    "Lunch was a sandwich.",
+]
+
+
+def test_keeps_the_central_sentences_in_order():
+    assert extract_sentences(SENTENCES, 0.5) == [SENTENCES[0], SENTENCES[2], SENTENCES[4]]
+
+
+def test_sentence_count():
+    assert extract_sentences([], 0.5) == []
+    assert extract_sentences(SENTENCES, 0.0) == [SENTENCES[0]]
+    assert len(extract_sentences(SENTENCES, 0.0, min_sentences=2)) == 2
+    assert extract_sentences(SENTENCES, 1.0) == SENTENCES
+    assert extract_sentences(SENTENCES[:2], 0.1, min_sentences=5) == SENTENCES[:2]
+
+
+def test_unrelated_sentences_keep_their_order():
+    sentences = ["Alpha one.", "Beta two.", "Gamma three.", "Delta four."]
+    # No shared terms: every score is equal and the first sentences win
+    assert extract_sentences(sentences, 0.5) == sentences[:2]
+
+
+def test_term_matrix_drops_single_sentence_terms():
+    matrix = term_matrix(["red apple", "green apple", "the apple is red"])
+    # 'apple' and 'red' occur in more than one sentence; 'green' and stop words do not count
+    assert matrix.shape == (3, 2)
+    assert np.allclose(np.linalg.norm(matrix, axis=1), 1)
+    assert term_matrix(["the", "and"]).shape == (2, 0)
+
+
+def test_textrank_scores_sum_to_one():
+    scores = textrank(term_matrix(SENTENCES))
+    assert abs(scores.sum() - 1) < 1e-6
+    assert scores[[0, 2, 4]].min() > scores[[1, 3, 5]].max()
+    assert len(textrank(np.zeros((0, 0)))) == 0
@@ -0,0 +1,62 @@
+from format_selection import asr_format_selector, select_asr_format
+
+
+def audio(format_id, **fields):
+    return dict(format_id=format_id, vcodec='none', acodec='opus', **fields)
+
+
+def muxed(format_id, **fields):
+    return dict(format_id=format_id, vcodec='avc1', acodec='mp4a', **fields)
+
+
+def pick(formats, **options):
+    fmt = select_asr_format(formats, **options)
+    return fmt and fmt['format_id']
+
+
+def test_smallest_audio_only_format_wins():
+    formats = [
+        audio('251', abr=130, asr=48000),
+        audio('250', abr=64, asr=48000),
+        audio('249', abr=48, asr=48000),
+        muxed('18', tbr=20, asr=44100),
+        dict(format_id='160', vcodec='avc1', acodec='none', tbr=10),
+    ]
+    assert pick(formats) == '249'
+
+
+def test_formats_below_asr_quality_are_skipped():
+    formats = [
+        audio('low-rate', abr=40, asr=8000),
+        audio('low-bitrate', abr=24, asr=48000),
+        audio('ok', abr=50, asr=44100),
+    ]
+    assert pick(formats) == 'ok'
+    # ...unless nothing else is available
+    assert pick(formats[:2]) == 'low-bitrate'
+
+
+def test_unknown_quality_is_accepted_and_unknown_size_goes_last():
+    formats = [audio('unknown'), audio('known', abr=96)]
+    assert pick(formats) == 'known'
+    assert pick([audio('unknown')]) == 'unknown'
+
+
+def test_rate_from_file_size():
+    formats = [
+        audio('big', filesize=2_000_000, asr=48000),
+        audio('small', filesize_approx=600_000, asr=48000),
+    ]
+    # 600 kB over 100 s is 48 kbit/s
+    assert pick(formats, duration=100) == 'small'
+    assert pick([audio('tiny', filesize=200_000)], duration=100) == 'tiny'
+
+
+def test_muxed_formats_are_the_fallback():
+    formats = [muxed('22', tbr=1500), muxed('18', tbr=500), dict(format_id='137', vcodec='avc1', acodec='none')]
+    assert pick(formats) == '18'
+
+
+def test_no_audio():
+    assert pick([dict(format_id='137', vcodec='avc1', acodec='none')]) is None
+    assert list(asr_format_selector()({'formats': []})) == []
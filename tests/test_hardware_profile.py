@@ -0,0 +1,83 @@
+import numpy as np
+
+import hardware_profile
+from hardware_profile import calibrate, choose, load_profile, profile_settings, save_profile, worker_layouts
+
+MODELS = ['tiny', 'base', 'small']
+COMPUTE_TYPES = ['int8', 'float32']
+
+
+def result(model, compute_type, rtf, workers=1):
+    return dict(whisper_model=model, compute_type=compute_type, workers=workers, threads=4, rtf=rtf)
+
+
+def test_worker_layouts():
+    assert worker_layouts('faster-whisper', 1) == [(1, 1)]
+    assert worker_layouts('faster-whisper', 2) == [(1, 2), (2, 1)]
+    assert worker_layouts('faster-whisper', 8) == [(1, 8), (2, 4), (4, 2)]
+    assert worker_layouts('faster-whisper', 6) == [(1, 6), (2, 3), (4, 1)]
+    assert worker_layouts('transformers', 8) == [(1, 0)]
+
+
+def test_choose_the_most_accurate_setup_that_is_fast_enough():
+    results = [
+        result('tiny', 'int8', 0.05),
+        result('tiny', 'float32', 0.08),
+        result('base', 'int8', 0.2, workers=1),
+        result('base', 'int8', 0.15, workers=2),
+        result('base', 'float32', 0.4),
+        result('small', 'int8', 0.6),
+    ]
+    choice = choose(results, MODELS, COMPUTE_TYPES, target_rtf=0.3)
+    # base int8 beats tiny float32; of its layouts the faster one wins
+    assert (choice['whisper_model'], choice['compute_type'], choice['workers']) == ('base', 'int8', 2)
+    assert choice['meets_target']
+
+
+def test_choose_the_fastest_when_nothing_meets_the_target():
+    results = [result('base', 'int8', 0.9), result('tiny', 'float32', 0.7), {'error': "OSError: no model"}]
+    choice = choose(results, MODELS, COMPUTE_TYPES, target_rtf=0.3)
+    assert (choice['whisper_model'], choice['rtf'], choice['meets_target']) == ('tiny', 0.7, False)
+    assert choose([{'error': "OSError: no model"}], MODELS, COMPUTE_TYPES, 0.3) is None
+
+
+def test_calibrate_skips_setups_that_can_only_be_slower(monkeypatch):
+    speeds = {('tiny', 'int8'): 0.1, ('tiny', 'float32'): 0.5, ('base', 'int8'): 0.25, ('small', 'int8'): 0.8}
+    measured = []
+
+    def measure(config, model, compute_type, workers, threads, audio):
+        measured.append((model, compute_type, workers))
+        return dict(whisper_model=model, compute_type=compute_type, workers=workers, threads=threads,
+                    rtf=speeds[model, compute_type] / workers ** 0.5)
+
+    monkeypatch.setattr(hardware_profile, 'measure', measure)
+    monkeypatch.setattr(hardware_profile.os, 'cpu_count', lambda: 2)
+    profile = calibrate({'asr_backend': 'faster-whisper'}, 0.3, MODELS, audio=np.zeros(16000, np.float32))
+
+    # float32 misses the target on tiny, so it is not tried on larger models;
+    # small misses it with int8 as well and nothing larger would be tried
+    assert [(model, compute_type) for model, compute_type, _ in measured[::2]] == [
+        ('tiny', 'int8'), ('tiny', 'float32'), ('base', 'int8'), ('small', 'int8')]
+    choice = profile['choice']
+    assert (choice['whisper_model'], choice['compute_type'], choice['workers']) == ('base', 'int8', 2)
+    assert profile_settings(profile) == {
+        'whisper_model': 'base', 'compute_type': 'int8', 'asr_workers': 2, 'num_workers': 2,
+        'asr_threads_per_worker': 1,
+    }
+
+
+def test_profiles_are_kept_per_backend_and_host(tmp_path, monkeypatch):
+    path = str(tmp_path / 'profiles' / 'hardware.json')
+    choice = dict(result('base', 'int8', 0.2), meets_target=True)
+    profile = {'version': hardware_profile.PROFILE_VERSION, 'host': hardware_profile.host_fingerprint(),
+               'backend': 'faster-whisper', 'target_rtf': 0.3, 'choice': choice}
+    save_profile(path, profile)
+    save_profile(path, dict(profile, backend='transformers', choice=result('openai/whisper-tiny', 'float32', 0.2)))
+
+    assert load_profile(path, 'faster-whisper', 0.3) == profile
+    assert load_profile(path, 'transformers', 0.3)['backend'] == 'transformers'
+    # Another target, or a profile measured on other hardware, means recalibrating
+    assert load_profile(path, 'faster-whisper', 0.5) is None
+    monkeypatch.setattr(hardware_profile, 'host_fingerprint', lambda: {'cpu_count': 1024})
+    assert load_profile(path, 'faster-whisper', 0.3) is None
+    assert load_profile(str(tmp_path / 'missing.json'), 'faster-whisper', 0.3) is None
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+import time
+
+from job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+
+URLS = [f"https://www.youtube.com/watch?v=video{i}abcd" for i in range(4)]
+
+
+class Job:
+    def __init__(self, url, work_dir, options, progress_callback):
+        self.url = url
+        self.work_dir = work_dir
+        self.options = options
+        self.progress_callback = progress_callback
+
+
+class Engine:
+    """Runs each job until it is let go; URLs in `failing` raise"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.gates = {}
+        self.started = []
+        self.failing = set()
+
+    def create_job(self, url, output_file, work_dir, options, status_callback, progress_callback):
+        return Job(url, work_dir, options, progress_callback)
+
+    def gate(self, url):
+        with self.lock:
+            return self.gates.setdefault(url, threading.Event())
+
+    def convert(self, job):
+        self.started.append(job.url)
+        assert os.path.isdir(job.work_dir)
+        job.progress_callback("Working", 50)
+        assert self.gate(job.url).wait(5)
+        if job.url in self.failing:
+            raise Exception("Download failed")
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def statuses(jobs):
+    return [entry['status'] for entry in jobs.snapshot()]
+
+
+def make_queue(tmp_path, engine, **kwargs):
+    return JobQueue(engine, str(tmp_path / 'state' / 'queue.json'), str(tmp_path / 'work'),
+                    output_dir=str(tmp_path), **kwargs)
+
+
+def test_runs_up_to_max_running_oldest_first(tmp_path):
+    engine, messages = Engine(), []
+    jobs = make_queue(tmp_path, engine, max_running=2, status_callback=messages.append)
+    entries = [jobs.add(url, {'summary_engine': 'extractive'}) for url in URLS[:3]]
+    assert entries[0]['output_file'] == str(tmp_path / 'notes_video0abcd.pdf')
+
+    wait_for(lambda: len(engine.started) == 2)
+    assert engine.started == URLS[:2]
+    assert statuses(jobs) == [RUNNING, RUNNING, QUEUED]
+    wait_for(lambda: jobs.snapshot()[0]['progress'] == ("Working", 50))
+
+    engine.failing.add(URLS[0])
+    engine.gate(URLS[0]).set()
+    wait_for(lambda: statuses(jobs) == [FAILED, RUNNING, RUNNING])
+    failed = jobs.snapshot()[0]
+    assert failed['error'] == "Download failed" and failed['progress'] is None
+    assert "[video0abcd] Error: Download failed" in messages
+    # The work directory goes with the job
+    assert not os.path.exists(tmp_path / 'work' / failed['id'])
+
+    for url in URLS[1:3]:
+        engine.gate(url).set()
+    wait_for(lambda: statuses(jobs) == [FAILED, DONE, DONE])
+
+
+def test_retry_queues_a_failed_job_again(tmp_path):
+    engine = Engine()
+    engine.failing.add(URLS[0])
+    engine.gate(URLS[0]).set()
+    jobs = make_queue(tmp_path, engine)
+    entry = jobs.add(URLS[0])
+    wait_for(lambda: statuses(jobs) == [FAILED])
+
+    engine.failing.clear()
+    jobs.retry(entry['id'])
+    wait_for(lambda: statuses(jobs) == [DONE])
+    assert engine.started == [URLS[0], URLS[0]]
+    assert jobs.snapshot()[0]['error'] is None
+
+
+def test_a_video_is_queued_only_once(tmp_path):
+    engine = Engine()
+    jobs = make_queue(tmp_path, engine)
+    assert jobs.add(URLS[0]) is not None
+    assert jobs.add("https://youtu.be/video0abcd") is None
+    engine.gate(URLS[0]).set()
+    wait_for(lambda: statuses(jobs) == [DONE])
+    # A finished video can be converted again
+    assert jobs.add(URLS[0]) is not None
+
+
+def test_state_survives_a_restart(tmp_path):
+    engine = Engine()
+    jobs = make_queue(tmp_path, engine)
+    first = jobs.add(URLS[0], {'summary_engine': 'hybrid'})
+    jobs.add(URLS[1])
+    wait_for(lambda: engine.started == [URLS[0]])
+    jobs.set_max_running(1)
+
+    with open(tmp_path / 'state' / 'queue.json', encoding='utf-8') as f:
+        state = json.load(f)
+    assert [entry['status'] for entry in state['entries']] == [RUNNING, QUEUED]
+
+    # A new queue over the same file picks up where the old one stopped,
+    # starting the job that was running again
+    restarted_engine = Engine()
+    for url in URLS[:2]:
+        restarted_engine.gate(url).set()
+    restarted = make_queue(tmp_path, restarted_engine, max_running=3)
+    assert restarted.max_running == 1
+    assert statuses(restarted) == [QUEUED, QUEUED]
+    restarted.dispatch()
+    wait_for(lambda: statuses(restarted) == [DONE, DONE])
+    assert restarted_engine.started == URLS[:2]
+    assert restarted.snapshot()[0]['options'] == first['options']
+
+    engine.gate(URLS[0]).set()
+
+
+def test_remove_and_clear_finished(tmp_path):
+    engine = Engine()
+    jobs = make_queue(tmp_path, engine)
+    running, queued = jobs.add(URLS[0]), jobs.add(URLS[1])
+    wait_for(lambda: engine.started == [URLS[0]])
+    jobs.remove(running['id'])
+    jobs.remove(queued['id'])
+    assert [entry['id'] for entry in jobs.snapshot()] == [running['id']]
+
+    engine.gate(URLS[0]).set()
+    wait_for(lambda: statuses(jobs) == [DONE])
+    jobs.clear_finished()
+    assert jobs.snapshot() == []
+
+
+def test_unreadable_state_starts_empty(tmp_path):
+    path = tmp_path / 'state' / 'queue.json'
+    path.parent.mkdir()
+    path.write_text("{not json", encoding='utf-8')
+    messages = []
+    jobs = make_queue(tmp_path, Engine(), status_callback=messages.append)
+    assert jobs.snapshot() == []
+    assert messages[0].startswith("[queue] Warning: Could not read the job queue")
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from model_manager import LazyModel
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'model': self.calls}
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_loads_once_on_first_use():
+    loader = Loader()
+    model = LazyModel('test', loader)
+    assert not model.is_loaded and loader.calls == 0
+    first = model.get()
+    assert model.get() is first
+    assert loader.calls == 1 and model.is_loaded
+
+
+def test_idle_model_is_released_and_reloaded():
+    loader, messages = Loader(), []
+    model = LazyModel('test', loader, idle_timeout=0.05, status_callback=messages.append)
+    held = model.get()
+    # The message follows the release
+    assert wait_for(lambda: messages)
+    assert messages == ["Released idle test model"] and not model.is_loaded
+    # A caller that kept its reference still has the model
+    assert held == {'model': 1}
+    assert model.get() == {'model': 2}
+
+
+def test_use_keeps_the_model_loaded():
+    model = LazyModel('test', Loader(), idle_timeout=0.2)
+    model.get()
+    for _ in range(6):
+        time.sleep(0.05)
+        model.get()
+    assert model.is_loaded
+    assert wait_for(lambda: not model.is_loaded)
+
+
+def test_without_a_timeout_the_model_stays():
+    model = LazyModel('test', Loader())
+    model.get()
+    time.sleep(0.1)
+    assert model.is_loaded and model.timer is None
+    model.release()
+    assert not model.is_loaded
+
+
+def test_set_installs_a_loaded_model():
+    loader = Loader()
+    model = LazyModel('test', loader, idle_timeout=0.05)
+    model.set('preloaded')
+    assert model.get() == 'preloaded' and loader.calls == 0
+    assert wait_for(lambda: not model.is_loaded)
+
+
+def test_failed_load_can_be_retried():
+    attempts = []
+
+    def loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("out of memory")
+        return 'model'
+
+    model = LazyModel('test', loader)
+    with pytest.raises(OSError):
+        model.get()
+    assert not model.is_loaded and not model.loading
+    assert model.get() == 'model'
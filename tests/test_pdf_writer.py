@@ -0,0 +1,253 @@
+import os
+import re
+import struct
+import zlib
+
+import pytest
+
+from pdf_writer import HELVETICA_BOLD_WIDTHS, CoreFont, StreamingPdf, TrueTypeFont, load_font
+
+# The converters download this font on first use; the test runs once it is there
+DEJAVU_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'DejaVuSansCondensed.ttf')
+
+OBJECT = re.compile(rb'(\d+) 0 obj\n')
+STREAM = re.compile(rb'<<([^>]*?/Length (\d+))>>\nstream\n', re.S)
+TEXT = re.compile(rb'\(((?:\\.|[^\\)])*)\) Tj')
+
+
+def render(font, paragraphs, info=None, bold_font=None):
+    pdf = StreamingPdf(font, bold_font)
+    pdf.info.update(info or {})
+    pdf.set_font(16, bold=True)
+    pdf.cell_centered(10, "Title")
+    pdf.set_font(12)
+    for paragraph in paragraphs:
+        pdf.multi_cell(10, paragraph)
+    pdf.finish()
+    pdf.file.seek(0)
+    data = pdf.file.read()
+    pdf.close()
+    return data
+
+
+def parse(data):
+    """Check the xref table against the objects and return (objects by id, trailer)"""
+    assert data.startswith(b'%PDF-1.4\n')
+    assert data.endswith(b'%%EOF\n')
+    xref_at = int(re.search(rb'startxref\n(\d+)\n%%EOF\n$', data).group(1))
+    assert data[xref_at:xref_at + 5] == b'xref\n'
+    header, rest = data[xref_at + 5:].split(b'\n', 1)
+    first, count = map(int, header.split())
+    assert first == 0
+    entries = [rest[20 * i:20 * i + 20] for i in range(count)]
+    assert entries[0] == b'0000000000 65535 f \n'
+
+    objects = {}
+    for object_id, entry in enumerate(entries[1:], 1):
+        offset = int(entry[:10])
+        match = OBJECT.match(data, offset)
+        assert match and int(match.group(1)) == object_id
+        end = data.index(b'\nendobj\n', match.end())
+        objects[object_id] = data[match.end():end]
+
+    trailer = data[data.index(b'trailer\n', xref_at):]
+    assert f'/Size {count}'.encode() in trailer
+    return objects, trailer
+
+
+def stream_data(body):
+    match = STREAM.match(body)
+    data = body[match.end():match.end() + int(match.group(2))]
+    if b'/FlateDecode' in match.group(1):
+        data = zlib.decompress(data)
+    return data
+
+
+def page_contents(objects):
+    """Each page's decompressed content stream, in page order"""
+    pages = re.search(rb'/Kids \[([^\]]*)\]', objects[2]).group(1)
+    contents = []
+    for page_id in map(int, re.findall(rb'(\d+) 0 R', pages)):
+        content_id = int(re.search(rb'/Contents (\d+) 0 R', objects[page_id]).group(1))
+        contents.append(stream_data(objects[content_id]))
+    return contents
+
+
+def page_texts(objects):
+    """The text drawn on each page, in page order"""
+    return [[unescape(text) for text in TEXT.findall(content)] for content in page_contents(objects)]
+
+
+def unescape(text):
+    return re.sub(rb'\\(.)', rb'\1', text)
+
+
+def info_entries(objects, trailer):
+    info_id = int(re.search(rb'/Info (\d+) 0 R', trailer).group(1))
+    body = objects[info_id]
+    return {key.decode(): unescape(value) for key, value in re.findall(rb'/(\w+) \(((?:\\.|[^\\)])*)\)', body)}
+
+
+def test_core_font_round_trip():
+    paragraphs = [f"Paragraph {i}: " + "words that wrap across the page " * 12 for i in range(60)]
+    data = render(CoreFont(), paragraphs)
+    objects, trailer = parse(data)
+
+    texts = page_texts(objects)
+    assert len(texts) > 1  # automatic page breaks
+    assert texts[0][0] == b'Title'
+    lines = [line for page in texts for line in page]
+    # Every word comes back, in order, from the wrapped lines
+    assert b' '.join(lines[1:]).split() == ' '.join(paragraphs).encode('latin-1').split()
+    assert b'/BaseFont /Helvetica' in b''.join(objects.values())
+    assert b'/Info' not in trailer
+
+
+def test_bold_title():
+    objects, _ = parse(render(CoreFont(), ["Body"], bold_font=CoreFont(bold=True)))
+    page = next(body for body in objects.values() if body.startswith(b'<</Type /Page '))
+    fonts = dict(re.findall(rb'/(F\d) (\d+) 0 R', page))
+    assert objects[int(fonts[b'F1'])].startswith(b'<</Type /Font /Subtype /Type1 /BaseFont /Helvetica ')
+    assert b'/BaseFont /Helvetica-Bold ' in objects[int(fonts[b'F2'])]
+    content = page_contents(objects)[0]
+    assert re.search(rb'BT /F2 16\.00 Tf [^(]*\(Title\) Tj', content)
+    assert re.search(rb'BT /F1 12\.00 Tf [^(]*\(Body\) Tj', content)
+
+
+def test_bold_widths():
+    regular, bold = CoreFont(), CoreFont(bold=True)
+    assert len(bold.widths) == len(regular.widths) == 256
+    assert bold.widths[ord('a')] == 556 and regular.widths[ord('a')] == 556
+    assert bold.widths[ord('b')] == 611 and regular.widths[ord('b')] == 556
+    assert bold.widths[0xFF] == 556 and regular.widths[0xFF] == 500
+
+
+def test_bold_falls_back_to_the_regular_font(test_font):
+    objects, _ = parse(render(test_font, ["AB"], bold_font=test_font))
+    page = next(body for body in objects.values() if body.startswith(b'<</Type /Page '))
+    fonts = dict(re.findall(rb'/(F\d) (\d+) 0 R', page))
+    assert fonts[b'F1'] == fonts[b'F2']
+    assert sum(b'/FontFile2' in body for body in objects.values()) == 1
+
+
+def test_escaping_and_text_sanitizing():
+    data = render(CoreFont(), ["a (b) c\\d “quoted” — café 中"])
+    objects, _ = parse(data)
+    content = b''.join(page_texts(objects)[0])
+    assert b'a (b) c\\d "quoted" - caf\xe9 ?' in content
+
+
+def test_long_word_is_broken_across_lines():
+    data = render(CoreFont(), ["x" * 1000])
+    objects, _ = parse(data)
+    lines = page_texts(objects)[0][1:]
+    assert len(lines) > 1
+    assert b''.join(lines) == b'x' * 1000
+
+
+def test_info_entries():
+    info = {'Title': 'Notes (draft) \\ 1', 'SummaryModel': 'facebook/bart-large-cnn', 'SummaryRuntime': 'torch float32'}
+    objects, trailer = parse(render(CoreFont(), ["Body"], info))
+    assert info_entries(objects, trailer) == {key: value.encode('latin-1') for key, value in info.items()}
+
+
+def test_finish_is_idempotent():
+    pdf = StreamingPdf(CoreFont())
+    pdf.multi_cell(10, "Body")
+    pdf.finish()
+    size = pdf.file.tell()
+    pdf.finish()
+    assert pdf.file.tell() == size
+    pdf.close()
+
+
+# ---------------------------------------------------------------------------
+# Embedded TrueType fonts
+# ---------------------------------------------------------------------------
+
+# Test.ttf: glyphs .notdef, space, A, B, ring, Aring (a composite of A and
+# ring) and unused; 'unused' is in no cmap entry and 'ring' is only reachable
+# through 'Aring'. Regenerate it with data/make_test_font.py.
+TEST_FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'Test.ttf')
+GLYPH_ORDER = ['.notdef', 'space', 'A', 'B', 'ring', 'Aring', 'unused']
+
+
+@pytest.fixture
+def test_font():
+    return TrueTypeFont('Test', TEST_FONT_PATH)
+
+
+def test_truetype_metrics(test_font):
+    font = test_font
+    # Advance widths scaled from 2048 units per em to 1000
+    assert font.widths[32] == 250
+    assert font.widths[65] == 684
+    assert font.widths[66] == 586
+    assert font.widths[0xC5] == 684
+    # Unmapped codes use the .notdef glyph
+    assert font.widths[67] == font.missing_width == 500
+    assert font.ascent == 879 and font.descent == -195
+    assert font.cap_height == 684
+
+
+def test_truetype_subset(test_font):
+    program = zlib.decompress(test_font.program)
+    assert len(program) == test_font.length1
+    # The checksum adjustment makes the whole file sum to the magic number
+    assert TrueTypeFont.checksum(program) == 0xB1B0AFBA
+
+    tables = TrueTypeFont.read_tables(program)
+    assert set(tables) <= set(TrueTypeFont.KEEP_TABLES)
+    assert struct.unpack('>h', tables['head'][50:52])[0] == 1  # long loca offsets
+    # Glyph ids are unchanged
+    assert struct.unpack('>H', tables['maxp'][4:6])[0] == len(GLYPH_ORDER)
+    offsets = struct.unpack(f'>{len(GLYPH_ORDER) + 1}I', tables['loca'])
+
+    def glyph(name):
+        i = GLYPH_ORDER.index(name)
+        return tables['glyf'][offsets[i]:offsets[i + 1]]
+
+    for name in ('.notdef', 'A', 'B', 'ring'):
+        assert struct.unpack('>h', glyph(name)[:2])[0] > 0, name
+    assert struct.unpack('>h', glyph('Aring')[:2])[0] < 0  # composite
+    # Neither mapped nor a component of a mapped glyph
+    assert glyph('unused') == b''
+
+
+def test_truetype_round_trip(test_font):
+    font = test_font
+    data = render(font, ["AB " * 400, "Å B"], {'Title': 'Test'})
+    objects, trailer = parse(data)
+
+    texts = page_texts(objects)
+    assert texts[0][0] == b'Title'
+    assert texts[-1][-1] == b'\xc5 B'
+    body = b''.join(objects.values())
+    assert b'/Subtype /TrueType /BaseFont /AAAAAA+Test' in body
+    descriptor = next(obj for obj in objects.values() if b'/FontFile2' in obj)
+    program_id = int(re.search(rb'/FontFile2 (\d+) 0 R', descriptor).group(1))
+    assert stream_data(objects[program_id]) == zlib.decompress(font.program)
+    assert info_entries(objects, trailer) == {'Title': b'Test'}
+
+
+@pytest.mark.skipif(not os.path.exists(DEJAVU_PATH), reason="DejaVu font not downloaded")
+def test_dejavu_round_trip():
+    font = TrueTypeFont('DejaVu', DEJAVU_PATH)
+    assert TrueTypeFont.checksum(zlib.decompress(font.program)) == 0xB1B0AFBA
+    objects, _ = parse(render(font, ["Ünïcödé “text” " * 200]))
+    lines = [line for page in page_texts(objects) for line in page]
+    assert b' '.join(lines[1:]).split() == ('\xdcn\xefc\xf6d\xe9 "text" ' * 200).encode('latin-1').split()
+
+
+def test_load_font_falls_back_and_caches(tmp_path):
+    assert isinstance(load_font('DejaVu', str(tmp_path / 'missing.ttf')), CoreFont)
+    assert load_font(None, None) is load_font(None, None)
+    assert load_font(None, None, bold=True).widths is HELVETICA_BOLD_WIDTHS
+    # A font file has one face; bold asks for the same font
+    assert load_font('Test', TEST_FONT_PATH, bold=True) is load_font('Test', TEST_FONT_PATH)
+
+
+def test_checksum_pads_to_whole_words():
+    assert TrueTypeFont.checksum(b'\x00\x00\x00\x01\x02') == 1 + (2 << 24)
+    assert TrueTypeFont.checksum(struct.pack('>II', 0xFFFFFFFF, 2)) == 1
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+import resource_scheduler
+from resource_scheduler import ResourceScheduler
+
+CONFIG = {
+    'asr_backend': 'faster-whisper',
+    'summary_runtime': 'torch',
+    'num_workers': 2,
+    'asr_workers': 2,
+}
+
+
+@pytest.fixture(autouse=True)
+def eight_cpus(monkeypatch):
+    monkeypatch.setattr(resource_scheduler, 'available_cpus', lambda: list(range(8)))
+
+
+def test_cores_are_split_between_the_stages():
+    scheduler = ResourceScheduler(asr_share=0.75)
+    assert scheduler.cpu_sets == {'asr': [0, 1, 2, 3, 4, 5], 'summary': [6, 7]}
+    assert scheduler.describe() == "CPU cores: asr 6, summary 2 of 8"
+    # Limited to the first cores, and each stage keeps at least one
+    scheduler = ResourceScheduler(cores=4, asr_share=1.0)
+    assert scheduler.cpu_sets == {'asr': [0, 1, 2, 3], 'summary': [3]}
+    scheduler = ResourceScheduler(cores=1)
+    assert scheduler.cpu_sets == {'asr': [0], 'summary': [0]}
+
+
+def test_faster_whisper_threads_are_divided_among_the_workers():
+    scheduler = ResourceScheduler(asr_share=0.75)
+    assert scheduler.thread_settings(CONFIG) == {'asr_threads_per_worker': 3, 'summary_threads': 2}
+    assert scheduler.thread_settings(dict(CONFIG, asr_workers=4)) == {
+        'asr_threads_per_worker': 1, 'summary_threads': 2}
+    assert scheduler.thread_settings(dict(CONFIG, num_workers=16, asr_workers=1)) == {
+        'asr_threads_per_worker': 1, 'summary_threads': 2}
+
+
+def test_torch_stages_share_one_thread_count():
+    scheduler = ResourceScheduler(asr_share=0.75)
+    config = dict(CONFIG, asr_backend='transformers')
+    assert scheduler.thread_settings(config)['summary_threads'] == 8
+    # CTranslate2 has thread pools of its own
+    assert scheduler.thread_settings(dict(config, summary_runtime='ctranslate2'))['summary_threads'] == 2
+
+
+def test_tokenizer_threads_are_not_overridden(monkeypatch):
+    monkeypatch.delenv('RAYON_NUM_THREADS', raising=False)
+    ResourceScheduler(asr_share=0.75).configure_tokenizers()
+    assert os.environ['RAYON_NUM_THREADS'] == '2'
+    monkeypatch.setenv('RAYON_NUM_THREADS', '5')
+    ResourceScheduler(asr_share=0.75).configure_tokenizers()
+    assert os.environ['RAYON_NUM_THREADS'] == '5'
+
+
+@pytest.mark.skipif(not resource_scheduler.can_pin(), reason="needs os.sched_setaffinity")
+def test_pinning_restores_the_thread_affinity(monkeypatch):
+    cpus = sorted(os.sched_getaffinity(0))
+    monkeypatch.setattr(resource_scheduler, 'available_cpus', lambda: cpus)
+    scheduler = ResourceScheduler(asr_share=0.5, pin=True)
+    with scheduler.pinned('asr'):
+        assert sorted(os.sched_getaffinity(0)) == scheduler.cpu_sets['asr']
+    assert sorted(os.sched_getaffinity(0)) == cpus
+
+
+def test_without_pinning_nothing_moves():
+    scheduler = ResourceScheduler(pin=False)
+    assert not scheduler.pin
+    with scheduler.pinned('summary'):
+        pass
@@ -0,0 +1,61 @@
+import pytest
+
+import result_cache
+from result_cache import ResultCache, make_cache_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # Every call gets a later time, so the LRU order does not depend on clock resolution
+    monkeypatch.setattr(result_cache, 'time', Clock())
+    return ResultCache(str(tmp_path / 'cache' / 'results.db'), max_bytes=30)
+
+
+def test_round_trip(cache):
+    assert cache.get('missing') is None
+    cache.put('a', 'héllo')
+    assert cache.get('a') == 'héllo'
+    assert cache.total_bytes() == 6
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.put('a', 'a' * 10)
+    cache.put('b', 'b' * 10)
+    cache.put('c', 'c' * 10)
+    cache.get('a')  # 'b' is now the oldest
+    cache.put('d', 'd' * 10)
+
+    assert cache.get('b') is None
+    assert [cache.get(key) is not None for key in 'acd'] == [True, True, True]
+    assert cache.total_bytes() == 30
+
+
+def test_replacing_an_entry_counts_its_new_size(cache):
+    cache.put('a', 'a' * 10)
+    cache.put('b', 'b' * 10)
+    cache.put('a', 'a' * 20)
+    assert cache.total_bytes() == 30
+    cache.put('c', 'c' * 5)
+    assert cache.get('b') is None
+    assert cache.total_bytes() == 25
+
+
+def test_entries_larger_than_the_cache_are_not_stored(cache):
+    cache.put('a', 'a' * 10)
+    cache.put('huge', 'x' * 31)
+    assert cache.get('huge') is None
+    assert cache.get('a') == 'a' * 10
+
+
+def test_cache_key():
+    assert make_cache_key('id', {'model': 'base', 'beam': 5}) == make_cache_key('id', {'beam': 5, 'model': 'base'})
+    assert make_cache_key('id', 'base') != make_cache_key('id', 'small')
@@ -0,0 +1,142 @@
+import re
+import threading
+
+import pytest
+
+from streaming_pipeline import StreamingPipeline
+
+
+class Job:
+    def __init__(self, **config):
+        self.config = dict(stream_queue_size=1, summary_batch_size=2, summary_strategy='flat')
+        self.config.update(config)
+
+
+class Pdf:
+    def __init__(self):
+        self.lines = []
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Engine:
+    """Stands in for ConverterEngine: one chunk per sentence, summaries tagged with their chunk"""
+
+    def __init__(self, texts, fail_after=None):
+        self.texts = texts
+        self.fail_after = fail_after
+        self.batches = []
+        self.short_texts = []
+
+    def iter_transcribed_windows(self, audio_windows, total_duration, job):
+        for i, text in enumerate(self.texts):
+            if i == self.fail_after:
+                raise ValueError("ASR failed")
+            yield text
+
+    def pack_sentences(self, sentences, job, pending=None):
+        return list(sentences), pending
+
+    def finish_packing(self, pending, job):
+        return []
+
+    def summarize_level(self, chunks, job):
+        self.batches.append(list(chunks))
+        return [f"S({chunk})" for chunk in chunks]
+
+    def reduce_summaries(self, summaries, job):
+        return [" + ".join(summaries)]
+
+    def summarize_text(self, text, job):
+        self.short_texts.append(text)
+        return "# Video Summary\n\n" + text
+
+    def format_summary(self, summaries):
+        formatted_summary = "# Video Summary\n\n"
+        if len(summaries) == 1:
+            formatted_summary += summaries[0]
+        else:
+            for i, summary in enumerate(summaries, 1):
+                formatted_summary += f"## Part {i}\n\n{summary}\n\n"
+        return formatted_summary
+
+    def create_pdf(self, job):
+        self.pdf = Pdf()
+        return self.pdf
+
+    def add_pdf_text(self, pdf, text):
+        pdf.lines.extend(text.split('\n'))
+
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in re.findall(r'[^.]+\.?', text) if sentence.strip()]
+
+
+@pytest.fixture(autouse=True)
+def sentences(monkeypatch):
+    # The summarizer stage splits with nltk; split on full stops instead of needing the punkt data
+    tokenize = pytest.importorskip('nltk.tokenize')
+    monkeypatch.setattr(tokenize, 'sent_tokenize', split_sentences)
+
+
+def run(engine, job):
+    pipeline = StreamingPipeline(engine, job)
+    thread_count = threading.active_count()
+    transcript, pdf = pipeline.run([], 60.0)
+    assert threading.active_count() == thread_count
+    return transcript, pdf
+
+
+def test_flat_summaries_lay_out_like_format_summary():
+    engine = Engine(["One. Two", "continues. Three.", "", "Four. Five."])
+    transcript, pdf = run(engine, Job())
+
+    assert transcript == "One. Two continues. Three. Four. Five."
+    # The sentence cut by the chunk boundary is summarized whole
+    assert engine.batches == [["One.", "Two continues."], ["Three.", "Four."], ["Five."]]
+    summaries = [f"S({chunk})" for batch in engine.batches for chunk in batch]
+    assert pdf.lines == engine.format_summary(summaries).split('\n')[:-1]
+
+
+def test_hierarchical_summaries_are_reduced_at_the_end():
+    engine = Engine(["One. Two. Three."])
+    _, pdf = run(engine, Job(summary_strategy='hierarchical', summary_batch_size=1))
+    assert pdf.lines == ["# Video Summary", "", "S(One.) + S(Two.) + S(Three.)"]
+
+
+def test_text_without_chunks_is_summarized_whole():
+    class ShortTextEngine(Engine):
+        def pack_sentences(self, sentences, job, pending=None):
+            return [], pending  # every chunk is under the minimum length
+
+    engine = ShortTextEngine(["Just a few words.", "Not enough to summarize"])
+    transcript, pdf = run(engine, Job())
+    assert engine.short_texts == ["Just a few words. Not enough to summarize"]
+    assert engine.batches == []
+    assert pdf.lines == ["# Video Summary", "", transcript]
+
+
+def test_a_failing_stage_stops_the_others():
+    # The transcriber keeps producing, so the later stages would block on full queues
+    engine = Engine([f"Sentence {i}." for i in range(100)], fail_after=50)
+    pipeline = StreamingPipeline(engine, Job())
+    with pytest.raises(ValueError, match="ASR failed"):
+        pipeline.run([], 60.0)
+    assert engine.pdf.closed
+
+
+def test_a_failing_layout_stops_the_transcriber():
+    class FailingEngine(Engine):
+        def add_pdf_text(self, pdf, text):
+            raise OSError("disk full")
+
+    def endless():
+        while True:
+            yield "More words."
+
+    engine = FailingEngine([])
+    engine.iter_transcribed_windows = lambda audio_windows, total_duration, job: endless()
+    with pytest.raises(OSError, match="disk full"):
+        StreamingPipeline(engine, Job()).run([], 60.0)
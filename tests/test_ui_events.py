@@ -0,0 +1,125 @@
+import pytest
+
+from ui_events import UIEventBus
+
+
+class Root:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, func):
+        self.scheduled.append((delay, func))
+
+
+class Var:
+    def __init__(self):
+        self.values = []
+
+    def set(self, value):
+        self.values.append(value)
+
+
+class Text:
+    """The few tk.Text indices the bus uses, over a plain string"""
+
+    def __init__(self):
+        self.content = ""
+        self.state = 'disabled'
+
+    def offset(self, index):
+        if index == 'end-1c':
+            return len(self.content)
+        if index == 'end-1c linestart':
+            return self.content.rfind('\n') + 1
+        line = int(index.split('.')[0])
+        offset = 0
+        for _ in range(line - 1):
+            offset = self.content.index('\n', offset) + 1
+        return offset
+
+    def index(self, index):
+        return f"{self.content.count(chr(10)) + 1}.0"
+
+    def insert(self, index, text):
+        assert index == 'end' and self.state == 'normal'
+        self.content += text
+
+    def delete(self, start, end):
+        assert self.state == 'normal'
+        self.content = self.content[:self.offset(start)] + self.content[self.offset(end):]
+
+    def config(self, state):
+        self.state = state
+
+    def see(self, index):
+        pass
+
+    @property
+    def lines(self):
+        # The first line is left blank until the log fills up
+        lines = self.content.split('\n')
+        return lines[1:] if lines[0] == "" else lines
+
+
+@pytest.fixture
+def bus():
+    return UIEventBus(Root(), Text(), Var(), {'value': 0}, fps=20, max_lines=5)
+
+
+def test_only_the_latest_progress_is_shown(bus):
+    for i in range(100):
+        bus.progress(f"Transcribing: {i}%", i)
+    bus.drain()
+    assert bus.progress_var.values == ["Transcribing: 99%"]
+    assert bus.progress_bar['value'] == 99
+
+
+def test_repeated_status_lines_are_replaced(bus):
+    bus.status("Downloading: 1.5% complete")
+    bus.status("Downloading: 50.0% complete")
+    bus.drain()
+    bus.status("Downloading: 100% complete")
+    bus.status("Transcribing...")
+    bus.status("Warning: chunk 3 failed")
+    bus.status("Warning: chunk 4 failed")
+    bus.drain()
+    assert bus.status_text.lines == [
+        "Downloading: 100% complete",
+        "Transcribing...",
+        "Warning: chunk 3 failed",
+        "Warning: chunk 4 failed",
+    ]
+    assert bus.status_text.state == 'disabled'
+
+
+def test_log_keeps_the_newest_lines(bus):
+    for i in range(8):
+        bus.status(f"Step {'x' * i}")
+    bus.drain()
+    assert bus.status_text.lines == [f"Step {'x' * i}" for i in range(3, 8)]
+
+
+def test_calls_run_after_the_updates_queued_before_them(bus):
+    seen = []
+    bus.status("Done")
+    bus.call(lambda: seen.append(bus.status_text.lines[-1]))
+    bus.call(seen.append, "second")
+    assert seen == []
+    bus.drain()
+    assert seen == ["Done", "second"]
+
+
+def test_polling_survives_a_failing_call(bus):
+    bus.start()
+    assert bus.root.scheduled == [(50, bus.poll)]
+
+    def fail():
+        raise RuntimeError("widget destroyed")
+
+    bus.call(fail)
+    with pytest.raises(RuntimeError):
+        bus.poll()
+    assert bus.root.scheduled == [(50, bus.poll)] * 2
+    bus.status("Still running")
+    bus.poll()
+    assert bus.status_text.lines == ["Still running"]
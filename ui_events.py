@@ -0,0 +1,100 @@
+import queue
+import re
+import tkinter as tk
+
+# Digits are ignored when deciding whether a status line repeats the one before it
+NUMBERS = re.compile(r'\b\d+(?:\.\d+)?')
+
+
+class UIEventBus:
+    """Hand status and progress updates from worker threads to the Tk thread.
+
+    Workers only put events on a queue. The Tk thread drains it every
+    1/fps seconds and applies what it found in one go:
+    - only the latest progress value is shown;
+    - a status line that differs from the previous one only in its numbers
+      ("Downloading: 41.2% complete") replaces it instead of adding a line,
+      unless it is a warning or error;
+    - the log keeps at most max_lines lines, dropping the oldest.
+    A flood of updates therefore costs the UI one redraw per frame and never
+    blocks or slows down the pipeline.
+    """
+
+    def __init__(self, root, status_text, progress_var, progress_bar, fps=10, max_lines=500):
+        self.root = root
+        self.status_text = status_text
+        self.progress_var = progress_var
+        self.progress_bar = progress_bar
+        self.interval = max(1, int(1000 / fps))
+        self.max_lines = max_lines
+        self.events = queue.SimpleQueue()
+        self.last_pattern = None
+
+    def start(self):
+        self.root.after(self.interval, self.poll)
+
+    # Thread-safe producers
+
+    def status(self, message):
+        self.events.put(('status', message))
+
+    def progress(self, message, value):
+        self.events.put(('progress', (message, value)))
+
+    def call(self, func, *args, **kwargs):
+        """Run func on the Tk thread, after the updates queued before it"""
+        self.events.put(('call', (func, args, kwargs)))
+
+    # Tk thread
+
+    def poll(self):
+        try:
+            self.drain()
+        finally:
+            # A failing call or widget update must not stop the updates for good
+            self.root.after(self.interval, self.poll)
+
+    def drain(self):
+        lines = []
+        progress = None
+        calls = []
+        # Only what is queued now, so a busy worker cannot keep the loop going
+        for _ in range(self.events.qsize()):
+            try:
+                kind, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'status':
+                lines.append(payload)
+            elif kind == 'progress':
+                progress = payload
+            else:
+                calls.append(payload)
+
+        if progress is not None:
+            self.progress_var.set(progress[0])
+            self.progress_bar['value'] = progress[1]
+        if lines:
+            self.append_lines(lines)
+        for func, args, kwargs in calls:
+            func(*args, **kwargs)
+
+    def append_lines(self, lines):
+        text = self.status_text
+        text.config(state='normal')
+        for line in lines:
+            pattern = NUMBERS.sub('#', line)
+            if pattern == self.last_pattern and 'Warning' not in line and 'Error' not in line:
+                # Same message with new numbers: overwrite the last line
+                text.delete('end-1c linestart', 'end-1c')
+                text.insert(tk.END, line)
+            else:
+                text.insert(tk.END, "\n" + line)
+            self.last_pattern = pattern
+
+        # Keep the log as a ring buffer of the newest lines
+        excess = int(text.index('end-1c').split('.')[0]) - self.max_lines
+        if excess > 0:
+            text.delete('1.0', f'{excess + 1}.0')
+        text.see(tk.END)
+        text.config(state='disabled')
@@ -0,0 +1,223 @@
+import argparse
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from converter_engine import (
+    ConverterEngine,
+    DEFAULT_CONFIG,
+    ONLINE_CONFIG,
+    validate_youtube_url,
+    extract_video_id,
+)
+
+print_lock = threading.Lock()
+
+
+def log(prefix, message):
+    with print_lock:
+        print(f"[{prefix}] {message}", flush=True)
+
+
+def read_urls(path):
+    """Read one URL per line, skipping blank lines and # comments"""
+    urls = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                urls.append(line)
+    return urls
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert a list of YouTube videos to PDF notes without the GUI."
+    )
+    parser.add_argument('urls_file', help="text file with one YouTube URL per line")
+    parser.add_argument('-o', '--output-dir', default='notes',
+                        help="directory for the generated PDFs (default: notes)")
+    parser.add_argument('-w', '--workers', type=int, default=2,
+                        help="number of videos converted at the same time (default: 2)")
+    parser.add_argument('--mode', choices=['offline', 'online'], default='offline',
+                        help="offline uses faster-whisper, online the transformers Whisper pipeline")
+    parser.add_argument('--audio-format', default='asr',
+                        help="yt-dlp format, or 'asr' for the smallest stream good enough for ASR (default: asr)")
+    parser.add_argument('--concurrent-fragments', type=int, default=4,
+                        help="DASH/HLS fragments downloaded at the same time (default: 4)")
+    parser.add_argument('--max-duration', type=float, default=60,
+                        help="maximum video length in minutes (default: 60)")
+    parser.add_argument('--chunk-size', type=float, default=10,
+                        help="transcription chunk size in minutes (default: 10)")
+    parser.add_argument('--segmenter', choices=['fixed', 'silence'], default='fixed',
+                        help="cut chunks at fixed offsets, or in pauses near --chunk-size (default: fixed)")
+    parser.add_argument('--chunk-overlap', type=float, default=1.0,
+                        help="--segmenter silence: seconds of audio shared by neighbouring chunks (default: 1)")
+    parser.add_argument('--speech-prepass', choices=['silero', 'energy'],
+                        help="find the speech once before ASR and transcribe only that (default: all audio)")
+    parser.add_argument('--asr-workers', type=int, default=1,
+                        help="audio chunks transcribed in parallel per video (default: 1)")
+    parser.add_argument('--asr-threads', type=int, default=0,
+                        help="CPU threads per transcription worker, 0 for the library default")
+    parser.add_argument('--asr-chunk-length', type=float, default=30,
+                        help="online: seconds per Whisper pipeline chunk (default: 30)")
+    parser.add_argument('--asr-stride', type=float, default=5,
+                        help="online: seconds of overlap on each side of a pipeline chunk (default: 5)")
+    parser.add_argument('--asr-batch-size', type=int, default=8,
+                        help="online: pipeline chunks per forward pass (default: 8)")
+    parser.add_argument('--summary-engine', choices=['abstractive', 'extractive', 'hybrid'], default='abstractive',
+                        help="summarization model, TextRank sentence extraction (no model), "
+                             "or TextRank pre-filter before the model (default: abstractive)")
+    parser.add_argument('--extractive-ratio', type=float, default=0.2,
+                        help="extractive: share of the transcript sentences kept (default: 0.2)")
+    parser.add_argument('--prefilter-ratio', type=float, default=0.5,
+                        help="hybrid: share of the sentences passed to the model (default: 0.5)")
+    parser.add_argument('--summary-model', default=None,
+                        help="summarization model, e.g. the distilled sshleifer/distilbart-cnn-12-6 "
+                             "(default: facebook/bart-large-cnn)")
+    parser.add_argument('--summary-runtime', choices=['torch', 'int8', 'ctranslate2'], default='torch',
+                        help="run the summarizer in float32, with dynamic int8 quantization, "
+                             "or as an int8 CTranslate2 export (default: torch)")
+    parser.add_argument('--summary-mode', choices=['chars', 'tokens'], default='tokens',
+                        help="chunk the transcript by characters or by summarizer tokens (default: tokens)")
+    parser.add_argument('--summary-batch-size', type=int, default=8,
+                        help="chunks summarized per model call (default: 8)")
+    parser.add_argument('--summary-strategy', choices=['flat', 'hierarchical'], default='flat',
+                        help="one section per chunk, or recursive map-reduce to a target length (default: flat)")
+    parser.add_argument('--summary-target-tokens', type=int, default=600,
+                        help="hierarchical: reduce until the summary fits this many tokens (default: 600)")
+    parser.add_argument('--summary-depth', type=int, default=None,
+                        help="hierarchical: maximum number of summary levels (default: no limit)")
+    parser.add_argument('--streaming', action='store_true',
+                        help="summarize finished transcript chunks while later audio is still transcribed")
+    parser.add_argument('--stream-ingest', action='store_true',
+                        help="decode the audio while it downloads instead of saving it first; "
+                             "audio decoded this way skips --speech-prepass and --segmenter silence")
+    parser.add_argument('--stream-window', type=int, default=30,
+                        help="--stream-ingest: seconds of audio per transcription window (default: 30)")
+    parser.add_argument('--auto-tune', action='store_true',
+                        help="calibrate ASR on this machine once and use the model, compute type, "
+                             "workers and threads it picks (overrides --asr-workers and --asr-threads)")
+    parser.add_argument('--target-rtf', type=float, default=0.5,
+                        help="--auto-tune: seconds of ASR per second of audio to stay under (default: 0.5)")
+    parser.add_argument('--cpu-partition', action='store_true',
+                        help="split the cores between transcription and summarization and size "
+                             "their thread pools to match")
+    parser.add_argument('--cpu-cores', type=int, default=None,
+                        help="--cpu-partition: cores to split (default: all available)")
+    parser.add_argument('--asr-core-share', type=float, default=0.75,
+                        help="--cpu-partition: share of the cores given to transcription (default: 0.75)")
+    parser.add_argument('--pin-cpus', action='store_true',
+                        help="--cpu-partition: also keep each stage on its own cores (Linux)")
+    parser.add_argument('--model-server', default='http://127.0.0.1:8765',
+                        help="shared model server to use when it is running (default: http://127.0.0.1:8765)")
+    parser.add_argument('--local-models', action='store_true',
+                        help="always load the models in this process")
+    parser.add_argument('--cache-dir', default='cache',
+                        help="directory for cached audio and transcripts (default: cache)")
+    parser.add_argument('--metrics-log', default=os.path.join('logs', 'metrics.jsonl'),
+                        help="JSON-lines file for per-stage timings (default: logs/metrics.jsonl)")
+    parser.add_argument('--prometheus-file',
+                        help="also write job metrics in Prometheus text format to this file")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always download and transcribe, ignoring cached results")
+    return parser.parse_args(argv)
+
+
+def run_job(engine, url, args):
+    video_id = extract_video_id(url)
+    work_dir = os.path.join(args.output_dir, '.work', video_id)
+    os.makedirs(work_dir, exist_ok=True)
+
+    job = engine.create_job(
+        url,
+        output_file=os.path.join(args.output_dir, f"{video_id}.pdf"),
+        work_dir=work_dir,
+        options={
+            'audio_format': args.audio_format,
+            'concurrent_fragments': args.concurrent_fragments,
+            'max_duration': args.max_duration * 60,
+            'chunk_size': args.chunk_size * 60,
+            'segmenter': args.segmenter,
+            'chunk_overlap': args.chunk_overlap,
+            'speech_prepass': args.speech_prepass,
+            'asr_chunk_length_s': args.asr_chunk_length,
+            'asr_stride_length_s': args.asr_stride,
+            'asr_batch_size': args.asr_batch_size,
+            'summary_engine': args.summary_engine,
+            'extractive_ratio': args.extractive_ratio,
+            'prefilter_ratio': args.prefilter_ratio,
+            'summary_mode': args.summary_mode,
+            'summary_batch_size': args.summary_batch_size,
+            'summary_strategy': args.summary_strategy,
+            'summary_target_tokens': args.summary_target_tokens,
+            'summary_depth': args.summary_depth,
+            'streaming': args.streaming,
+            'stream_ingest': args.stream_ingest,
+            'stream_window': args.stream_window,
+        },
+        status_callback=lambda message: log(video_id, message),
+    )
+    try:
+        return engine.convert(job)
+    finally:
+        engine.retry_remove(work_dir)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    urls = read_urls(args.urls_file)
+
+    invalid = [url for url in urls if not validate_youtube_url(url)]
+    for url in invalid:
+        log('skip', f"Invalid YouTube URL format: {url}")
+    # One job per video, since the video ID names the output and work files
+    urls = list({extract_video_id(url): url for url in urls if url not in invalid}.values())
+    if not urls:
+        log('batch', "No valid URLs to convert")
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    config = dict(
+        ONLINE_CONFIG if args.mode == 'online' else DEFAULT_CONFIG,
+        asr_workers=args.asr_workers,
+        asr_threads_per_worker=args.asr_threads,
+        auto_tune=args.auto_tune,
+        target_rtf=args.target_rtf,
+        summary_runtime=args.summary_runtime,
+        cpu_partition=args.cpu_partition,
+        cpu_cores=args.cpu_cores,
+        asr_core_share=args.asr_core_share,
+        cpu_pinning=args.pin_cpus,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        # Loaded once for the whole batch, not released while long jobs run
+        model_idle_timeout=None,
+        model_server=None if args.local_models else args.model_server,
+        metrics_log=args.metrics_log,
+        metrics_prometheus=args.prometheus_file,
+    )
+    if args.summary_model:
+        config['summary_model'] = args.summary_model
+    engine = ConverterEngine(config, status_callback=lambda message: log('engine', message))
+    # Load the models once for the whole batch; extractive notes need no summarization model
+    engine.load_models(summarizer=args.summary_engine != 'extractive')
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {executor.submit(run_job, engine, url, args): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                log('done', f"{url} -> {future.result()}")
+            except Exception as e:
+                failures += 1
+                log('failed', f"{url}: {str(e)}")
+
+    log('batch', f"{len(urls) - failures} of {len(urls)} videos converted")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())